@@ -13,7 +13,7 @@ async def analyze_job(payload: JobDescriptionRequest):
     Analyze raw job description text and extract requirements.
     """
     try:
-        return job_analyzer.analyze(payload.description)
+        return await job_analyzer.aanalyze(payload.description)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -1,22 +1,72 @@
 from fastapi import APIRouter, File, UploadFile, HTTPException, Form
-from pydantic import BaseModel
-from typing import Optional
-import os
-import shutil
-import uuid
+from fastapi.responses import StreamingResponse
+from typing import Any, AsyncIterator, Dict, List, Tuple
+import asyncio
+import json
+import zipfile
 
-from app.services.resume_parser import resume_parser
+from app.core.config import settings
+from app.core.concurrency import run_in_compute_pool, run_in_io_pool
+from app.api.uploads import ResumeUpload, parse_upload, read_upload, read_zip_resumes
 from app.services.job_analyzer import job_analyzer
+from app.services.match_queue import QueueFullError, match_queue
 from app.services.matching_engine import matching_engine
 from app.services.tailoring_service import tailoring_service
 
 router = APIRouter()
 
-UPLOAD_DIR = "temp_uploads"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
+ALLOWED_TYPES = [
+    "application/pdf", 
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+]
 
-class MatchRequest(BaseModel):
-    job_description: str
+ZIP_TYPES = ["application/zip", "application/x-zip-compressed"]
+
+def validate_resume_file(resume_file: UploadFile):
+    if resume_file.content_type not in ALLOWED_TYPES:
+        raise HTTPException(status_code=400, detail="Invalid file type. Only PDF and DOCX are supported.")
+
+async def score_resume(upload: ResumeUpload, job_description: str) -> Tuple[Dict[str, Any], Dict[str, Any], List[str]]:
+    """
+    Everything before the LLM call: parse, analyze, score.
+    Returns (resume_data, match_result, missing_skills).
+    """
+    # 1. Parse Resume / 2. Analyze Job (independent, run side by side)
+    resume_data, job_data = await asyncio.gather(
+        parse_upload(upload),
+        job_analyzer.aanalyze(job_description)
+    )
+    
+    # 3. Compute Match Score
+    match_result = await run_in_compute_pool(matching_engine.compute_score, resume_data, job_data)
+    
+    # 4. Identify Missing Skills
+    missing_skills = find_missing_skills(resume_data, job_data)
+    
+    return resume_data, match_result, missing_skills
+
+def find_missing_skills(resume_data: Dict[str, Any], job_data: Dict[str, Any]) -> List[str]:
+    resume_skills_set = set([s.lower() for s in resume_data.get("skills", [])])
+    job_skills_set = set([s.lower() for s in job_data.get("required_skills", [])])
+    return list(job_skills_set - resume_skills_set)
+
+async def run_match(upload: ResumeUpload, job_description: str) -> Dict[str, Any]:
+    """The whole pipeline: score, then generate suggestions. Returns the /match/ response body."""
+    resume_data, match_result, missing_skills = await score_resume(upload, job_description)
+    
+    # 5. Generate Suggestions
+    suggestions, prompt = await tailoring_service.agenerate_suggestions(
+        resume_data.get("raw_text", ""),
+        job_description,
+        missing_skills
+    )
+    
+    return {
+        "match_score": match_result,
+        "missing_skills": missing_skills,
+        "suggestions": suggestions,
+        "resume_text": resume_data.get("raw_text", "")
+    }
 
 @router.post("/")
 async def match_resume_to_job(
@@ -32,56 +82,300 @@ async def match_resume_to_job(
     """
     
     # Validate file type
-    allowed_types = [
-        "application/pdf", 
-        "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-    ]
-    
-    if resume_file.content_type not in allowed_types:
-        raise HTTPException(status_code=400, detail="Invalid file type. Only PDF and DOCX are supported.")
-    
-    # Save file temporarily
-    file_ext = os.path.splitext(resume_file.filename)[1]
-    filename = f"{uuid.uuid4()}{file_ext}"
-    file_path = os.path.join(UPLOAD_DIR, filename)
+    validate_resume_file(resume_file)
     
+    upload = None
     try:
-        # 1. Parse Resume
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(resume_file.file, buffer)
-            
-        resume_data = resume_parser.parse(file_path, resume_file.content_type)
-        
-        # 2. Analyze Job
-        job_data = job_analyzer.analyze(job_description)
+        upload = await read_upload(resume_file)
+        return await run_match(upload, job_description)
         
-        # 3. Compute Match Score
-        match_result = matching_engine.compute_score(resume_data, job_data)
-        
-        # 4. Identify Missing Skills
-        resume_skills_set = set([s.lower() for s in resume_data.get("skills", [])])
-        job_skills_set = set([s.lower() for s in job_data.get("required_skills", [])])
-        missing_skills = list(job_skills_set - resume_skills_set)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
         
-        # 5. Generate Suggestions
-        suggestions, prompt = tailoring_service.generate_suggestions(
-            resume_data.get("raw_text", ""),
-            job_description,
-            missing_skills
+    finally:
+        # Cleanup (only large uploads touch the disk)
+        if upload is not None:
+            upload.cleanup()
+
+def sse_event(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+class EventStreamResponse(StreamingResponse):
+    """
+    Server-Sent Events response that removes the request's uploads however it
+    ends: finished, failed, or the client gone before or during the stream
+    (an event generator that never started never reaches its own finally).
+    """
+    media_type = "text/event-stream"
+
+    def __init__(self, content: AsyncIterator[str], uploads: List[ResumeUpload]):
+        # No proxy buffering: events must reach the browser as they are produced
+        super().__init__(content, headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+        self.uploads = uploads
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            for upload in self.uploads:
+                upload.cleanup()
+
+@router.post("/stream")
+async def stream_match(
+    job_description: str = Form(...),
+    resume_file: UploadFile = File(...)
+):
+    """
+    Same pipeline as POST /match/, as Server-Sent Events:
+      event: match       {match_score, missing_skills, resume_text}, as soon as scoring is done
+      event: suggestion  one per suggestion, as the LLM finishes writing it
+      event: done        {suggestions: count}
+      event: error       {detail}, if the pipeline fails mid-stream
+    """
+    validate_resume_file(resume_file)
+    
+    # Read the upload before responding; the request's file is closed once streaming starts
+    upload = await read_upload(resume_file)
+    
+    async def events() -> AsyncIterator[str]:
+        try:
+            resume_data, match_result, missing_skills = await score_resume(upload, job_description)
+            yield sse_event("match", {
+                "match_score": match_result,
+                "missing_skills": missing_skills,
+                "resume_text": resume_data.get("raw_text", "")
+            })
+            
+            count = 0
+            async for suggestion in tailoring_service.astream_suggestions(
+                resume_data.get("raw_text", ""),
+                job_description,
+                missing_skills
+            ):
+                count += 1
+                yield sse_event("suggestion", suggestion)
+            yield sse_event("done", {"suggestions": count})
+            
+        except Exception as e:
+            yield sse_event("error", {"detail": e.detail if isinstance(e, HTTPException) else str(e)})
+    
+    return EventStreamResponse(events(), [upload])
+
+@router.post("/jobs", status_code=202)
+async def submit_match_job(
+    job_description: str = Form(...),
+    resume_file: UploadFile = File(...)
+):
+    """
+    Queues the POST /match/ pipeline and answers right away with a job id;
+    poll GET /match/jobs/{job_id} for the result. 503 + Retry-After when
+    the queue is full.
+    """
+    validate_resume_file(resume_file)
+    
+    try:
+        # Refuse before reading the upload when there is clearly no room
+        match_queue.check_capacity()
+        upload = await read_upload(resume_file)
+        job = match_queue.submit(lambda: run_match(upload, job_description), cleanup=upload.cleanup)
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+    
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "status_url": f"{settings.API_V1_STR}/match/jobs/{job.id}"
+    }
+
+@router.get("/jobs/{job_id}")
+async def get_match_job(job_id: str):
+    """Job status; includes `result` (the POST /match/ body) once done, `error` if failed."""
+    job = match_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired job id")
+    return job.to_dict()
+
+def parse_job_list(jobs: str) -> List[Dict[str, Any]]:
+    """
+    The `jobs` form field: a JSON list of descriptions, each a string or an
+    object {"description": ..., "id": ..., "title": ...} (id and title optional).
+    """
+    try:
+        items = json.loads(jobs)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="jobs must be a JSON list")
+    if not isinstance(items, list) or not items:
+        raise HTTPException(status_code=400, detail="jobs must be a non-empty JSON list")
+    if len(items) > settings.RANK_MAX_JOBS:
+        raise HTTPException(status_code=400, detail=f"At most {settings.RANK_MAX_JOBS} jobs per request")
+    
+    parsed = []
+    for i, item in enumerate(items):
+        if isinstance(item, str):
+            item = {"description": item}
+        if not isinstance(item, dict) or not isinstance(item.get("description"), str):
+            raise HTTPException(status_code=400, detail=f"jobs[{i}] needs a description")
+        parsed.append({"id": item.get("id", i), "title": item.get("title"), "description": item["description"]})
+    return parsed
+
+@router.post("/rank")
+async def rank_jobs(
+    jobs: str = Form(...),
+    resume_file: UploadFile = File(...),
+    top_k: int = Form(0)
+):
+    """
+    Ranks many job descriptions for one resume, best match first. Each
+    entry: {id, title, match_score, missing_skills}, match_score as in
+    POST /match/. The resume is parsed and encoded once and all jobs are
+    scored together; no suggestions are generated. top_k > 0 keeps only
+    the best top_k.
+    """
+    validate_resume_file(resume_file)
+    job_list = parse_job_list(jobs)
+    
+    upload = None
+    try:
+        upload = await read_upload(resume_file)
+        resume_data, jobs_data = await asyncio.gather(
+            parse_upload(upload),
+            job_analyzer.aanalyze_many([job["description"] for job in job_list])
         )
+        ranked = await run_in_compute_pool(matching_engine.rank_jobs, resume_data, jobs_data)
+        if top_k > 0:
+            ranked = ranked[:top_k]
         
         return {
-            "match_score": match_result,
-            "missing_skills": missing_skills,
-            "suggestions": suggestions,
-            "resume_text": resume_data.get("raw_text", "")
+            "jobs": len(job_list),
+            "results": [
+                {
+                    "id": job_list[r["index"]]["id"],
+                    "title": job_list[r["index"]]["title"],
+                    "match_score": {"overall_match": r["overall_match"], "components": r["components"]},
+                    "missing_skills": find_missing_skills(resume_data, jobs_data[r["index"]])
+                }
+                for r in ranked
+            ]
         }
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
         
     finally:
-        # Cleanup
-        if os.path.exists(file_path):
-            os.remove(file_path)
+        if upload is not None:
+            upload.cleanup()
+
+def is_zip(file: UploadFile) -> bool:
+    return file.content_type in ZIP_TYPES or (file.filename or "").lower().endswith(".zip")
+
+async def collect_resumes(files: List[UploadFile]) -> Tuple[List[Tuple[str, ResumeUpload]], List[Dict[str, str]]]:
+    """
+    Reads every uploaded resume, expanding zip archives. Returns (filename,
+    upload) pairs and {filename, detail} for files that are not resumes.
+    400 beyond RANK_MAX_RESUMES or RANK_MAX_TOTAL_BYTES.
+    """
+    resumes: List[Tuple[str, ResumeUpload]] = []
+    skipped: List[Dict[str, str]] = []
+    total = 0
+    try:
+        for file in files:
+            name = file.filename or "resume"
+            if is_zip(file):
+                members, left_out = await run_in_io_pool(
+                    read_zip_resumes, file.file,
+                    settings.RANK_MAX_RESUMES - len(resumes), settings.RANK_MAX_TOTAL_BYTES - total
+                )
+                resumes.extend((f"{name}/{member}", upload) for member, upload in members)
+                total += sum(len(upload.data) for _, upload in members)
+                skipped.extend({"filename": f"{name}/{member}", "detail": detail} for member, detail in left_out)
+                continue
+            if file.content_type not in ALLOWED_TYPES:
+                skipped.append({"filename": name, "detail": "Invalid file type. Only PDF and DOCX are supported."})
+                continue
+            if len(resumes) >= settings.RANK_MAX_RESUMES:
+                raise ValueError(f"At most {settings.RANK_MAX_RESUMES} resumes per request")
+            total += file.size or 0
+            if total > settings.RANK_MAX_TOTAL_BYTES:
+                raise ValueError(f"Resumes exceed {settings.RANK_MAX_TOTAL_BYTES} bytes in total")
+            resumes.append((name, await read_upload(file)))
+    except (ValueError, zipfile.BadZipFile) as e:
+        for _, upload in resumes:
+            upload.cleanup()
+        raise HTTPException(status_code=400, detail=str(e))
+    return resumes, skipped
 
+@router.post("/candidates")
+async def rank_candidates(
+    job_description: str = Form(...),
+    resume_files: List[UploadFile] = File(...),
+    top_n: int = Form(settings.RANK_SUGGESTIONS_TOP_N)
+):
+    """
+    Ranks a pool of resumes (several files and/or zip archives of PDF / DOCX)
+    against one job, as Server-Sent Events:
+      event: skipped      {filename, detail}, for files that are not resumes or fail to parse
+      event: candidate    {rank, filename, match_score, missing_skills}, best first, once all are scored
+      event: suggestions  {rank, filename, suggestions}, for the top_n candidates only, as each is written
+      event: done         {candidates, skipped, suggested}
+      event: error        {detail}, if the pipeline fails mid-stream
+    The job is analyzed and encoded once, resumes are parsed in parallel and
+    scored together (MatchingEngine.rank_resumes); the LLM is only called
+    for the candidates that make the top_n.
+    """
+    # Read the uploads before responding; the request's files are closed once streaming starts
+    resumes, skipped = await collect_resumes(resume_files)
+    
+    async def events() -> AsyncIterator[str]:
+        suggestion_tasks: List[asyncio.Task] = []
+        try:
+            for item in skipped:
+                yield sse_event("skipped", item)
+            
+            outcomes, job_data = await asyncio.gather(
+                asyncio.gather(*(parse_upload(upload) for _, upload in resumes), return_exceptions=True),
+                job_analyzer.aanalyze(job_description)
+            )
+            names, parsed = [], []
+            for (name, _), outcome in zip(resumes, outcomes):
+                if isinstance(outcome, Exception):
+                    detail = outcome.detail if isinstance(outcome, HTTPException) else str(outcome)
+                    skipped.append({"filename": name, "detail": detail})
+                    yield sse_event("skipped", skipped[-1])
+                else:
+                    names.append(name)
+                    parsed.append(outcome)
+            
+            ranked = await run_in_compute_pool(matching_engine.rank_resumes, parsed, job_data)
+            candidates = []
+            for rank, r in enumerate(ranked, start=1):
+                resume_data = parsed[r["index"]]
+                candidate = {
+                    "rank": rank,
+                    "filename": names[r["index"]],
+                    "match_score": {"overall_match": r["overall_match"], "components": r["components"]},
+                    "missing_skills": find_missing_skills(resume_data, job_data)
+                }
+                candidates.append((candidate, resume_data))
+                yield sse_event("candidate", candidate)
+            
+            async def suggest(candidate: Dict[str, Any], resume_data: Dict[str, Any]) -> Dict[str, Any]:
+                suggestions, _ = await tailoring_service.agenerate_suggestions(
+                    resume_data.get("raw_text", ""), job_description, candidate["missing_skills"]
+                )
+                return {"rank": candidate["rank"], "filename": candidate["filename"], "suggestions": suggestions}
+            
+            suggestion_tasks = [asyncio.ensure_future(suggest(c, d)) for c, d in candidates[:max(0, top_n)]]
+            for next_done in asyncio.as_completed(suggestion_tasks):
+                yield sse_event("suggestions", await next_done)
+            yield sse_event("done", {"candidates": len(ranked), "skipped": len(skipped),
+                                     "suggested": len(suggestion_tasks)})
+            
+        except Exception as e:
+            yield sse_event("error", {"detail": e.detail if isinstance(e, HTTPException) else str(e)})
+            
+        finally:
+            # Client gone or a failure: stop the suggestion calls still running
+            for task in suggestion_tasks:
+                task.cancel()
+    
+    return EventStreamResponse(events(), [upload for _, upload in resumes])
@@ -19,7 +19,7 @@ async def refine_resume(
         if not job_description or not job_description.strip():
             raise ValueError("Job description is required")
             
-        refined_content = tailoring_service.refine_resume(resume_text, job_description)
+        refined_content = await tailoring_service.arefine_resume(resume_text, job_description)
         
         # Ensure response has required fields
         if isinstance(refined_content, dict):
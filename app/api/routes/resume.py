@@ -1,14 +1,8 @@
 from fastapi import APIRouter, File, UploadFile, HTTPException
-import os
-import shutil
-import uuid
-from app.services.resume_parser import resume_parser
+from app.api.uploads import parse_upload, read_upload
 
 router = APIRouter()
 
-UPLOAD_DIR = "temp_uploads"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
-
 @router.post("/upload")
 async def upload_resume(file: UploadFile = File(...)):
     """
@@ -22,18 +16,13 @@ async def upload_resume(file: UploadFile = File(...)):
     if file.content_type not in allowed_types:
         raise HTTPException(status_code=400, detail="Invalid file type. Only PDF and DOCX are supported.")
     
-    # Generate unique filename to avoid collisions
-    file_ext = os.path.splitext(file.filename)[1]
-    filename = f"{uuid.uuid4()}{file_ext}"
-    file_path = os.path.join(UPLOAD_DIR, filename)
-    
+    upload = None
     try:
-        # Save file temporarily
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        # Read from the upload buffer (temp file only for very large uploads)
+        upload = await read_upload(file)
             
-        # Parse resume
-        parsed_data = resume_parser.parse(file_path, file.content_type)
+        # Parse resume (cached by file content hash)
+        parsed_data = await parse_upload(upload)
         
         return parsed_data
         
@@ -41,7 +30,7 @@ async def upload_resume(file: UploadFile = File(...)):
         raise HTTPException(status_code=500, detail=str(e))
         
     finally:
-        # Cleanup: Delete the temp file
-        if os.path.exists(file_path):
-            os.remove(file_path)
+        # Cleanup: Delete the temp file, if one was needed
+        if upload is not None:
+            upload.cleanup()
 
@@ -0,0 +1,104 @@
+import hashlib
+import os
+import uuid
+import zipfile
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple, Union
+from fastapi import UploadFile
+from app.core.config import settings
+from app.core.concurrency import run_in_io_pool, run_in_parse_pool
+from app.core.metrics import stage_timer
+from app.services.parse_cache import parse_cache
+from app.services.resume_parser import resume_parser
+
+UPLOAD_DIR = "temp_uploads"
+RESUME_EXTENSIONS = {
+    ".pdf": "application/pdf",
+    ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+}
+
+class ResumeUpload:
+    """
+    A received resume file. Normally held as bytes and parsed straight from
+    memory; uploads above UPLOAD_IN_MEMORY_MAX_BYTES are spilled to a temp
+    file instead and must be cleaned up.
+    """
+
+    def __init__(self, content_type: str, sha256: str, data: Optional[bytes] = None, path: Optional[str] = None):
+        self.content_type = content_type
+        self.sha256 = sha256
+        self.data = data
+        self.path = path
+
+    @property
+    def source(self) -> Union[bytes, str]:
+        """What ResumeParser.parse accepts: the bytes, or the temp file path."""
+        return self.data if self.data is not None else self.path
+
+    def cleanup(self):
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+def save_upload(source: BinaryIO, file_path: str) -> str:
+    """Copies an upload stream to disk (blocking, run it in the io pool); returns its SHA-256."""
+    digest = hashlib.sha256()
+    with open(file_path, "wb") as buffer:
+        for chunk in iter(lambda: source.read(1024 * 1024), b""):
+            digest.update(chunk)
+            buffer.write(chunk)
+    return digest.hexdigest()
+
+def read_zip_resumes(source: BinaryIO, max_files: int,
+                     max_bytes: int) -> Tuple[List[Tuple[str, ResumeUpload]], List[Tuple[str, str]]]:
+    """
+    The PDF / DOCX members of a zip archive as in-memory uploads (blocking,
+    run it in the io pool). Returns (filename, upload) pairs and (filename,
+    reason) pairs for the members left out. Members larger than
+    MAX_UPLOAD_SIZE are skipped; ValueError beyond max_files resumes or
+    max_bytes in total.
+    """
+    resumes, skipped = [], []
+    total = 0
+    with zipfile.ZipFile(source) as archive:
+        for info in archive.infolist():
+            name = info.filename
+            if info.is_dir() or name.startswith("__MACOSX/") or os.path.basename(name).startswith("."):
+                continue
+            content_type = RESUME_EXTENSIONS.get(os.path.splitext(name)[1].lower())
+            if content_type is None:
+                skipped.append((name, "Invalid file type. Only PDF and DOCX are supported."))
+                continue
+            if len(resumes) >= max_files:
+                raise ValueError(f"At most {max_files} resumes per request")
+            # Read at most one byte past the limit: the sizes in the archive directory are not trusted
+            with archive.open(info) as member:
+                data = member.read(settings.MAX_UPLOAD_SIZE + 1)
+            if len(data) > settings.MAX_UPLOAD_SIZE:
+                skipped.append((name, "File too large"))
+                continue
+            total += len(data)
+            if total > max_bytes:
+                raise ValueError(f"Resumes exceed {max_bytes} bytes in total")
+            resumes.append((name, ResumeUpload(content_type, hashlib.sha256(data).hexdigest(), data=data)))
+    return resumes, skipped
+
+async def read_upload(file: UploadFile) -> ResumeUpload:
+    """Reads an upload from its spooled buffer, falling back to disk for very large files."""
+    with stage_timer("upload_read"):
+        if file.size is not None and file.size > settings.UPLOAD_IN_MEMORY_MAX_BYTES:
+            os.makedirs(UPLOAD_DIR, exist_ok=True)
+            file_ext = os.path.splitext(file.filename or "")[1]
+            file_path = os.path.join(UPLOAD_DIR, f"{uuid.uuid4()}{file_ext}")
+            sha256 = await run_in_io_pool(save_upload, file.file, file_path)
+            return ResumeUpload(file.content_type, sha256, path=file_path)
+
+        data = await file.read()
+        return ResumeUpload(file.content_type, hashlib.sha256(data).hexdigest(), data=data)
+
+async def parse_upload(upload: ResumeUpload) -> Dict[str, Any]:
+    """Parses an upload, reusing the cached result when the same file was seen before."""
+    parsed = parse_cache.get(upload.sha256, upload.content_type)
+    if parsed is not None:
+        return parsed
+    parsed = await run_in_parse_pool(resume_parser.parse, upload.source, upload.content_type)
+    parse_cache.set(upload.sha256, upload.content_type, parsed)
+    return parsed
@@ -0,0 +1,72 @@
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict
+from app.core.config import settings
+from app.core.profiling import traced_call
+
+# Bounded executors, one per kind of blocking work, so a burst of slow
+# parses cannot starve encoding (and vice versa) and the event loop stays free.
+#   parse   -> document parsing / text analysis (threads or processes)
+#   compute -> embedding forward passes and scoring (threads, model is in-process)
+#   io      -> blocking network clients
+_pools: Dict[str, Executor] = {}
+_pools_lock = threading.Lock()
+
+
+def _create_pool(kind: str) -> Executor:
+    if kind == "parse":
+        if settings.PARSE_POOL_KIND == "process":
+            return ProcessPoolExecutor(max_workers=settings.PARSE_WORKERS)
+        return ThreadPoolExecutor(max_workers=settings.PARSE_WORKERS, thread_name_prefix="parse")
+    if kind == "compute":
+        return ThreadPoolExecutor(max_workers=settings.COMPUTE_WORKERS, thread_name_prefix="compute")
+    if kind == "io":
+        return ThreadPoolExecutor(max_workers=settings.IO_WORKERS, thread_name_prefix="io")
+    raise ValueError(f"Unknown pool kind: {kind}")
+
+
+def get_pool(kind: str) -> Executor:
+    pool = _pools.get(kind)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(kind)
+            if pool is None:
+                pool = _pools[kind] = _create_pool(kind)
+    return pool
+
+
+async def _run(kind: str, func: Callable[..., Any], *args, **kwargs) -> Any:
+    loop = asyncio.get_running_loop()
+    pool = get_pool(kind)
+    call = partial(func, *args, **kwargs)
+    if isinstance(pool, ProcessPoolExecutor):
+        return await loop.run_in_executor(pool, call)  # a context cannot cross the process boundary
+    # Run in a copy of the request's context so its Server-Timing stages and profile follow the work
+    return await loop.run_in_executor(pool, contextvars.copy_context().run, traced_call, call)
+
+
+async def run_in_parse_pool(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """Runs CPU-bound parsing work. `func` must be picklable in process mode."""
+    return await _run("parse", func, *args, **kwargs)
+
+
+async def run_in_compute_pool(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """Runs embedding / scoring work next to the in-process model."""
+    return await _run("compute", func, *args, **kwargs)
+
+
+async def run_in_io_pool(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """Runs blocking I/O (sync clients, file copies)."""
+    return await _run("io", func, *args, **kwargs)
+
+
+def shutdown_pools(wait: bool = True) -> None:
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown(wait=wait)
+
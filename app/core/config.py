@@ -5,7 +5,86 @@ class Settings(BaseSettings):
     PROJECT_NAME: str = "Resume AI"
     API_V1_STR: str = "/api/v1"
     MAX_UPLOAD_SIZE: int = 10 * 1024 * 1024  # 10MB
+    UPLOAD_IN_MEMORY_MAX_BYTES: int = 5 * 1024 * 1024  # Larger uploads are parsed from a temp file
+    PARSE_CACHE_SIZE: int = 512  # Parsed resumes kept, keyed by file hash
+    PARSE_CACHE_TTL_SECONDS: int = 3600
+    JOB_ANALYSIS_CACHE_SIZE: int = 1024  # Memoized job analyses, one per posting; keep >= RANK_MAX_JOBS
     OPENAI_API_KEY: str = ""  # Set in .env file
+    OPENAI_BASE_URL: str = ""  # Empty = api.openai.com; point at any OpenAI-compatible server
+    OPENAI_MODEL: str = "gpt-3.5-turbo"
+    
+    # LLM call budget
+    LLM_TIMEOUT_SECONDS: float = 20.0  # Per-call deadline, then fall back to mock suggestions
+    LLM_MAX_RETRIES: int = 2
+    LLM_RETRY_BACKOFF_SECONDS: float = 0.5
+    LLM_MAX_CONCURRENCY: int = 8  # In-flight completions per worker
+    LLM_MAX_CONNECTIONS: int = 16  # Shared HTTP connection pool size
+    
+    # LLM response cache (see app/services/llm_cache.py)
+    LLM_CACHE_ENABLED: bool = True  # Reuse answers for identical prompts (model, temperature, messages, max_tokens); needs LLM_DETERMINISTIC
+    LLM_CACHE_PATH: str = "vector_store/llm_cache.sqlite3"  # SQLite (WAL), shareable between workers
+    LLM_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+    LLM_CACHE_MAX_ENTRIES: int = 10000  # Least recently used answers beyond this are evicted
+    LLM_DETERMINISTIC: bool = False  # Temperature 0: repeatable answers; the response cache is only used then
+    
+    # Prompt construction (see app/services/prompt_context.py)
+    SUGGESTIONS_PROMPT_TOKENS: int = 450  # Whole user prompt for suggestions, instructions included
+    REFINE_PROMPT_TOKENS: int = 800
+    PROMPT_JOB_SHARE: float = 0.35  # Most of the budget the job requirements may take; the rest is resume
+    PROMPT_CHUNK_CHARS: int = 400  # Resume chunk size ranked against the job requirements
+    
+    # Async match jobs (POST /match/jobs, see app/services/match_queue.py)
+    MATCH_QUEUE_WORKERS: int = 4  # Pipelines run concurrently per worker process
+    MATCH_QUEUE_MAX_SIZE: int = 100  # Waiting jobs beyond this are refused with 503
+    MATCH_JOB_RESULT_TTL_SECONDS: int = 600  # How long finished results stay pollable
+    MATCH_JOB_RESULTS_MAX: int = 1000
+    
+    # Batch ranking (POST /match/rank and /match/candidates, see MatchingEngine.rank_jobs / rank_resumes)
+    RANK_MAX_JOBS: int = 1000  # Job descriptions accepted per request
+    RANK_MAX_RESUMES: int = 500  # Resumes accepted per request, zip members included
+    RANK_MAX_TOTAL_BYTES: int = 200 * 1024 * 1024  # All resumes of one request together
+    RANK_SUGGESTIONS_TOP_N: int = 3  # Candidates that get LLM suggestions by default
+    
+    # Request diagnostics (see app/core/metrics.py and app/core/profiling.py)
+    SERVER_TIMING_ENABLED: bool = True  # Per-stage Server-Timing header on every response
+    PROFILING_SAMPLE_RATE: float = 0.0  # Fraction of API requests run under the sampling profiler; 0 = off
+    PROFILING_HEADER_ENABLED: bool = False  # Also profile requests sent with "X-Profile: 1"
+    PROFILING_INTERVAL_MS: float = 5.0  # Stack sampling period
+    PROFILING_OUTPUT_DIR: str = "profiles"  # Folded stacks (flamegraph.pl / speedscope), one file per request
+    
+    # Embeddings
+    EMBEDDING_MODEL_NAME: str = "all-MiniLM-L6-v2"
+    EMBEDDING_BACKEND: str = "torch"  # "torch", "onnx" or "onnx-int8" (CPU, see scripts/export_onnx.py)
+    EMBEDDING_ONNX_DIR: str = "vector_store/onnx/all-MiniLM-L6-v2"
+    EMBEDDING_ONNX_THREADS: int = 0  # 0 = ONNX Runtime default
+    EMBEDDING_CACHE_SIZE: int = 50000  # In-memory LRU entries
+    EMBEDDING_CACHE_DIR: str = ""  # Memory-mapped disk tier, disabled when empty
+    EMBEDDING_BATCHING_ENABLED: bool = True  # Merge concurrent encode calls into one forward pass
+    EMBEDDING_BATCH_MAX_SIZE: int = 64
+    EMBEDDING_BATCH_MAX_WAIT_MS: float = 5.0
+    WARM_UP_ON_STARTUP: bool = True  # Load the model in the background after startup
+    EMBEDDING_SERVER_SOCKET: str = ""  # Encode through a shared embedding server on this Unix socket instead of an in-process model
+    EMBEDDING_SERVER_TIMEOUT_SECONDS: float = 30.0
+    
+    # Vector index (see app/services/vector_store.py)
+    VECTOR_INDEX_TYPE: str = "flat"  # "flat" (exact), "hnsw" or "ivf"
+    VECTOR_INDEX_PATH: str = ""  # Load from / save to this directory when set
+    VECTOR_INDEX_MMAP: bool = True  # Memory-map a saved index instead of reading it into RAM
+    HNSW_M: int = 32
+    HNSW_EF_SEARCH: int = 64
+    IVF_NLIST: int = 256
+    IVF_NPROBE: int = 16
+    INGEST_BATCH_SIZE: int = 256  # Texts encoded / added to FAISS per block in add_many
+    
+    # Skill taxonomy (see app/services/skill_taxonomy.py)
+    SKILL_TAXONOMY_PATH: str = "app/data/skills.json"  # Canonical skills + aliases
+    SKILL_EMBEDDINGS_PATH: str = "vector_store/skills/skill_embeddings.npy"  # Built on first use or by scripts/build_skill_index.py
+    
+    # Worker pools for blocking work (see app/core/concurrency.py)
+    PARSE_POOL_KIND: str = "thread"  # "thread" or "process"
+    PARSE_WORKERS: int = 4
+    COMPUTE_WORKERS: int = 8  # With embedding batching on, up to this many requests share a forward pass
+    IO_WORKERS: int = 16
 
     class Config:
         case_sensitive = True
@@ -0,0 +1,303 @@
+import bisect
+import contextvars
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram (cumulative counts, Prometheus-style `le` buckets).
+    Cheap enough to observe on the hot path.
+    """
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets: List[float] = sorted(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        slot = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[slot] += 1
+            self._sum += value
+            self._count += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = list(self._counts)
+            total, count = self._sum, self._count
+        cumulative = {}
+        running = 0
+        for bound, n in zip(self.buckets + [float("inf")], counts):
+            running += n
+            cumulative["+Inf" if bound == float("inf") else f"{bound:g}"] = running
+        return {
+            "count": count,
+            "sum": round(total, 6),
+            "mean": round(total / count, 6) if count else 0.0,
+            "buckets": cumulative
+        }
+
+
+class Counter:
+    """Monotonic counter, optionally split by one label."""
+
+    def __init__(self):
+        self._values: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, label: str = "", value: float = 1.0) -> None:
+        with self._lock:
+            self._values[label] = self._values.get(label, 0.0) + value
+
+    def values(self) -> Dict[str, float]:
+        with self._lock:
+            return dict(self._values)
+
+
+class Gauge:
+    """Value that goes up and down (e.g. requests in flight)."""
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, value: float = 1.0) -> None:
+        with self._lock:
+            self.value += value
+
+    def dec(self, value: float = 1.0) -> None:
+        with self._lock:
+            self.value -= value
+
+
+class LabeledHistogram:
+    """One Histogram per label value (e.g. per pipeline stage), created on first use."""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = sorted(buckets)
+        self._histograms: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, label: str) -> Histogram:
+        histogram = self._histograms.get(label)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(label, Histogram(self.buckets))
+        return histogram
+
+    def observe(self, label: str, value: float) -> None:
+        self.labels(label).observe(value)
+
+    def items(self) -> List[Tuple[str, Histogram]]:
+        with self._lock:
+            return sorted(self._histograms.items())
+
+
+# A collector yields (name, type, help, samples); samples map label pairs to values
+Samples = Dict[Tuple[Tuple[str, str], ...], float]
+Collector = Callable[[], Iterable[Tuple[str, str, str, Samples]]]
+
+
+def _format_value(value: float) -> str:
+    return "+Inf" if value == float("inf") else f"{value:g}"
+
+
+class MetricsRegistry:
+    """
+    Named metrics rendered in the Prometheus text format. Observing is a
+    lock + a few additions; all formatting happens at scrape time. Collectors
+    add samples computed on scrape (e.g. from existing cache counters).
+    """
+
+    def __init__(self):
+        self._metrics: List[Tuple[str, str, str, Optional[str], Any]] = []  # name, type, help, label name, metric
+        self._collectors: List[Collector] = []
+
+    def counter(self, name: str, help: str, label: Optional[str] = None) -> Counter:
+        metric = Counter()
+        self._metrics.append((name, "counter", help, label, metric))
+        return metric
+
+    def gauge(self, name: str, help: str) -> Gauge:
+        metric = Gauge()
+        self._metrics.append((name, "gauge", help, None, metric))
+        return metric
+
+    def histogram(self, name: str, help: str, buckets: Sequence[float], label: str) -> LabeledHistogram:
+        metric = LabeledHistogram(buckets)
+        self._metrics.append((name, "histogram", help, label, metric))
+        return metric
+
+    def add_collector(self, collector: Collector) -> None:
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for name, kind, help, label, metric in self._metrics:
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            if kind == "counter":
+                for value_label, value in sorted(metric.values().items()):
+                    selector = f'{{{label}="{value_label}"}}' if label else ""
+                    lines.append(f"{name}{selector} {_format_value(value)}")
+            elif kind == "gauge":
+                lines.append(f"{name} {_format_value(metric.value)}")
+            else:
+                for value_label, histogram in metric.items():
+                    with histogram._lock:
+                        counts = list(histogram._counts)
+                        total, count = histogram._sum, histogram._count
+                    running = 0
+                    for bound, n in zip(histogram.buckets + [float("inf")], counts):
+                        running += n
+                        lines.append(f'{name}_bucket{{{label}="{value_label}",le="{_format_value(bound)}"}} {running}')
+                    lines.append(f'{name}_sum{{{label}="{value_label}"}} {total:.6f}')
+                    lines.append(f'{name}_count{{{label}="{value_label}"}} {count}')
+
+        for collector in self._collectors:
+            for name, kind, help, samples in collector():
+                lines.append(f"# HELP {name} {help}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples.items():
+                    selector = ",".join(f'{k}="{v}"' for k, v in labels)
+                    lines.append(f"{name}{{{selector}}} {_format_value(value)}" if selector else f"{name} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+STAGE_SECONDS_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+stage_seconds = metrics.histogram(
+    "resume_ai_stage_seconds", "Latency of each matching pipeline stage.", STAGE_SECONDS_BUCKETS, label="stage"
+)
+llm_fallbacks = metrics.counter(
+    "resume_ai_llm_fallbacks_total", "LLM answers replaced by the built-in fallback (no key, error, deadline).", label="kind"
+)
+requests_in_flight = metrics.gauge("resume_ai_http_requests_in_flight", "HTTP requests being served.")
+
+
+class InFlightRequestsMiddleware:
+    """ASGI middleware keeping requests_in_flight current; a streamed response counts until its last byte."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        requests_in_flight.inc()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            requests_in_flight.dec()
+
+
+class RequestTimings:
+    """
+    Stage durations of one HTTP request, for its Server-Timing header.
+    Shared by reference with every context copied from the request, so
+    stages timed in the worker pools land here too.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self._stages: Dict[str, List[float]] = {}  # stage -> [seconds, calls], in first-seen order
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            entry = self._stages.setdefault(stage, [0.0, 0])
+            entry[0] += seconds
+            entry[1] += 1
+
+    def header(self) -> str:
+        """Server-Timing value: `stage;dur=ms` per stage (calls summed), then the total so far."""
+        with self._lock:
+            stages = [(name, seconds, calls) for name, (seconds, calls) in self._stages.items()]
+        parts = []
+        for name, seconds, calls in stages:
+            part = f"{name};dur={seconds * 1000.0:.1f}"
+            if calls > 1:
+                part += f';desc="{calls} calls"'
+            parts.append(part)
+        parts.append(f"total;dur={(time.perf_counter() - self.started) * 1000.0:.1f}")
+        return ", ".join(parts)
+
+
+request_timings: contextvars.ContextVar[Optional[RequestTimings]] = contextvars.ContextVar(
+    "request_timings", default=None
+)
+
+
+class ServerTimingMiddleware:
+    """
+    ASGI middleware adding a Server-Timing header with the stages timed
+    while serving the request. The header leaves with the first byte, so a
+    streamed response only reports the stages finished before it started.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        timings = RequestTimings()
+        token = request_timings.set(timings)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", timings.header().encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            request_timings.reset(token)
+
+
+def record_stage(stage: str, seconds: float) -> None:
+    """Observes a stage into resume_ai_stage_seconds and the current request's Server-Timing."""
+    stage_seconds.observe(stage, seconds)
+    timings = request_timings.get()
+    if timings is not None:
+        timings.add(stage, seconds)
+
+
+@contextmanager
+def stage_timer(stage: str) -> Iterator[None]:
+    """Times the enclosed block into resume_ai_stage_seconds{stage=...}."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(stage, time.perf_counter() - started)
+
+
+def timed(stage: str) -> Callable:
+    """Decorator form of stage_timer for plain functions and methods."""
+    def decorator(func: Callable) -> Callable:
+        histogram = stage_seconds.labels(stage)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                seconds = time.perf_counter() - started
+                histogram.observe(seconds)
+                timings = request_timings.get()
+                if timings is not None:
+                    timings.add(stage, seconds)
+        return wrapper
+    return decorator
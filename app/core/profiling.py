@@ -0,0 +1,161 @@
+import asyncio
+import contextvars
+import logging
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Any, Callable, Dict, Optional, Set
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-profile"
+SHARED_THREADS = ("embedding-batcher",)  # serve every request; sampled too, so encodes show up
+
+
+class SamplingProfiler:
+    """
+    Wall-clock sampling profiler for one request. A background thread reads
+    the stacks of the threads working for the request (the event loop, the
+    pool threads running its calls, the embedding batcher) every `interval`
+    seconds with sys._current_frames(), so the profiled code itself runs
+    untouched. Output is folded stacks (`thread;outer;...;inner count`),
+    the input of flamegraph.pl and speedscope.
+
+    The event loop and the batcher are shared, so under concurrency their
+    samples can include other requests' work.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.samples = 0
+        self.stacks: Counter = Counter()
+        self._threads: Set[int] = set()
+        self._labels: Dict[Any, str] = {}
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+
+    def add_thread(self, ident: int) -> None:
+        self._threads.add(ident)
+
+    def remove_thread(self, ident: int) -> None:
+        self._threads.discard(ident)
+
+    def start(self) -> None:
+        self.add_thread(threading.get_ident())  # the caller: the event loop thread
+        self._sampler = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self._sampler.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            names = {t.ident: t.name for t in threading.enumerate()}
+            watched = set(self._threads)
+            watched.update(ident for ident, name in names.items() if name in SHARED_THREADS)
+            for ident in watched:
+                frame = frames.get(ident)
+                if frame is not None:
+                    self.stacks[self._fold(names.get(ident, str(ident)), frame)] += 1
+            self.samples += 1
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            path = code.co_filename.replace(os.sep, "/").split("/")
+            label = self._labels[code] = f"{code.co_name} ({'/'.join(path[-2:])}:{code.co_firstlineno})"
+        return label
+
+    def _fold(self, thread_name: str, frame) -> str:
+        stack = []
+        while frame is not None:
+            stack.append(self._label(frame.f_code))
+            frame = frame.f_back
+        stack.append(thread_name)
+        return ";".join(reversed(stack))
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def write(self, path: str) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w") as f:
+            f.write(self.folded())
+
+
+active_profile: contextvars.ContextVar[Optional[SamplingProfiler]] = contextvars.ContextVar(
+    "active_profile", default=None
+)
+
+
+def traced_call(call: Callable[[], Any]) -> Any:
+    """Runs `call`, sampling the current thread while it works for a profiled request."""
+    profile = active_profile.get()
+    if profile is None:
+        return call()
+    ident = threading.get_ident()
+    profile.add_thread(ident)
+    try:
+        return call()
+    finally:
+        profile.remove_thread(ident)
+
+
+def should_profile(scope) -> bool:
+    """PROFILING_SAMPLE_RATE of API requests, or any with `X-Profile: 1` if PROFILING_HEADER_ENABLED."""
+    if not scope["path"].startswith(settings.API_V1_STR):
+        return False
+    if settings.PROFILING_HEADER_ENABLED:
+        for name, value in scope.get("headers", []):
+            if name == PROFILE_HEADER and value.strip() == b"1":
+                return True
+    return settings.PROFILING_SAMPLE_RATE > 0 and random.random() < settings.PROFILING_SAMPLE_RATE
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware profiling the requests picked by should_profile. Each
+    profile is written to PROFILING_OUTPUT_DIR as `<id>.folded` once the
+    response is complete; the response names it in an X-Profile header.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not should_profile(scope):
+            return await self.app(scope, receive, send)
+
+        profile_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        profile = SamplingProfiler(settings.PROFILING_INTERVAL_MS / 1000.0)
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((PROFILE_HEADER, profile_id.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        token = active_profile.set(profile)
+        profile.start()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            active_profile.reset(token)
+            profile.stop()
+            path = os.path.join(settings.PROFILING_OUTPUT_DIR, f"{profile_id}.folded")
+            try:
+                await asyncio.get_running_loop().run_in_executor(None, profile.write, path)
+                logger.info(f"Profile of {scope['method']} {scope['path']}: {path} ({profile.samples} samples)")
+            except OSError as e:
+                logger.warning(f"Could not write profile {path}: {e}")
@@ -1,16 +1,55 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 import os
 from app.core.config import settings
 from app.core.logging import setup_logging
+from app.core.concurrency import run_in_compute_pool, shutdown_pools
+from app.core.metrics import InFlightRequestsMiddleware, ServerTimingMiddleware, metrics
+from app.core.profiling import ProfilingMiddleware
 from app.api.routes import resume, job, match, refine
+from app.services.embedding_service import embedding_service
+from app.services.parse_cache import parse_cache
+from app.services.job_analyzer import job_analyzer
+from app.services.match_queue import match_queue
+from app.services.skill_taxonomy import skill_taxonomy
+from app.services.tailoring_service import tailoring_service
 
 setup_logging()
+logger = logging.getLogger(__name__)
+
+async def warm_up_models():
+    """Loads the embedding model in the background so /health answers immediately."""
+    try:
+        await run_in_compute_pool(embedding_service.warm_up)
+        logger.info("Embedding model loaded")
+        # Maps the skill embedding table (building it on the very first run)
+        await run_in_compute_pool(lambda: skill_taxonomy.table)
+    except Exception as e:
+        logger.error(f"Model warm-up failed: {e}")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    warm_up_task = None
+    if settings.WARM_UP_ON_STARTUP:
+        warm_up_task = asyncio.create_task(warm_up_models())
+    yield
+    if warm_up_task is not None and not warm_up_task.done():
+        warm_up_task.cancel()
+    await match_queue.shutdown()
+    if settings.VECTOR_INDEX_PATH and embedding_service.has_unsaved_vectors:
+        embedding_service.save_index()
+    # Let in-flight parse/encode/LLM jobs finish before the worker exits
+    shutdown_pools()
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -22,6 +61,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(InFlightRequestsMiddleware)
+if settings.SERVER_TIMING_ENABLED:
+    app.add_middleware(ServerTimingMiddleware)
+# Checks PROFILING_SAMPLE_RATE / X-Profile per request; a pass-through otherwise
+app.add_middleware(ProfilingMiddleware)
+
 # Request size limit (10MB for file uploads)
 app.add_middleware(
     lambda app: app,  # Placeholder - FastAPI handles this via max_upload_size
@@ -36,6 +81,47 @@ app.include_router(refine.router, prefix=f"{settings.API_V1_STR}/refine", tags=[
 def health_check():
     return {"status": "ok", "app_name": settings.PROJECT_NAME}
 
+@app.get("/ready")
+def readiness_check():
+    """Readiness probe: 503 until the embedding model is loaded."""
+    if not embedding_service.is_ready:
+        return JSONResponse(status_code=503, content={"status": "warming_up"})
+    return {"status": "ready"}
+
+@app.get("/stats")
+def service_stats():
+    """Cache counters, useful to see how much work is being saved."""
+    return {
+        "embedding_cache": embedding_service.cache_stats(),
+        "embedding_batcher": embedding_service.batch_stats(),
+        "parse_cache": parse_cache.stats(),
+        "job_analysis_cache": job_analyzer.cache_stats(),
+        "llm_cache": tailoring_service.cache_stats(),
+        "match_queue": match_queue.stats()
+    }
+
+def cache_metrics():
+    """Scrape-time view of the existing cache and queue counters, so the hot path pays nothing extra."""
+    caches = {
+        "embedding": embedding_service.cache_stats(),
+        "parse": parse_cache.stats(),
+        "job_analysis": job_analyzer.cache_stats(),
+        "llm": tailoring_service.cache_stats() or {"hits": 0, "misses": 0}
+    }
+    yield ("resume_ai_cache_hits_total", "counter", "Cache hits by cache.",
+           {(("cache", name),): stats["hits"] for name, stats in caches.items()})
+    yield ("resume_ai_cache_misses_total", "counter", "Cache misses by cache.",
+           {(("cache", name),): stats["misses"] for name, stats in caches.items()})
+    yield ("resume_ai_match_queue_depth", "gauge", "Async match jobs waiting for a worker.",
+           {(): match_queue.depth})
+
+metrics.add_collector(cache_metrics)
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    """Prometheus scrape endpoint: per-stage latency histograms, cache/fallback counters, in-flight requests."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 # Serve frontend static files
 frontend_path = os.path.join(os.path.dirname(__file__), "..", "frontend")
 if os.path.exists(frontend_path):
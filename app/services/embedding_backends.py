@@ -0,0 +1,168 @@
+import inspect
+import json
+import os
+from typing import Any, Dict, List
+import numpy as np
+
+# Backends are selected with settings.EMBEDDING_BACKEND:
+#   torch      -> SentenceTransformer (PyTorch, fp32), the reference
+#   onnx       -> exported graph on ONNX Runtime (fp32)
+#   onnx-int8  -> same graph with int8 dynamically quantized weights
+# All of them return L2-normalized float32 vectors when the source pipeline does.
+
+ONNX_MODEL_FILE = "model.onnx"
+ONNX_INT8_MODEL_FILE = "model.int8.onnx"
+ONNX_CONFIG_FILE = "embedding_config.json"
+TOKENIZER_FILE = "tokenizer.json"
+
+
+class EmbeddingBackend:
+    """Interface for anything that turns a batch of texts into vectors."""
+
+    name = "base"
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """Returns a (len(texts), dimension) float32 matrix."""
+        raise NotImplementedError
+
+
+class TorchBackend(EmbeddingBackend):
+    name = "torch"
+
+    def __init__(self, model_name: str):
+        from sentence_transformers import SentenceTransformer
+        self.model = SentenceTransformer(model_name)
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        return np.asarray(self.model.encode(texts), dtype="float32")
+
+
+class OnnxBackend(EmbeddingBackend):
+    """
+    Runs an exported model (see export_onnx) on ONNX Runtime's CPU provider:
+    tokenize -> transformer -> mean pooling -> optional L2 normalize,
+    mirroring the SentenceTransformer pipeline.
+    """
+
+    def __init__(self, model_dir: str, quantized: bool = False, num_threads: int = 0):
+        try:
+            import onnxruntime as ort
+        except ImportError:
+            raise RuntimeError("The ONNX embedding backend needs onnxruntime: pip install onnxruntime")
+        from tokenizers import Tokenizer
+
+        self.name = "onnx-int8" if quantized else "onnx"
+        model_file = os.path.join(model_dir, ONNX_INT8_MODEL_FILE if quantized else ONNX_MODEL_FILE)
+        if not os.path.exists(model_file):
+            raise RuntimeError(f"{model_file} not found. Export it first: python scripts/export_onnx.py")
+
+        with open(os.path.join(model_dir, ONNX_CONFIG_FILE), "r") as f:
+            self.config: Dict[str, Any] = json.load(f)
+
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, TOKENIZER_FILE))
+        self.tokenizer.enable_truncation(max_length=self.config["max_seq_length"])
+        self.tokenizer.enable_padding(
+            pad_id=self.config.get("pad_token_id", 0),
+            pad_token=self.config.get("pad_token", "[PAD]")
+        )
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        self.session = ort.InferenceSession(model_file, options, providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self.config["dimension"]), dtype="float32")
+
+        encodings = self.tokenizer.encode_batch(list(texts))
+        feeds = {
+            "input_ids": np.array([e.ids for e in encodings], dtype="int64"),
+            "attention_mask": np.array([e.attention_mask for e in encodings], dtype="int64"),
+            "token_type_ids": np.array([e.type_ids for e in encodings], dtype="int64")
+        }
+        feeds = {k: v for k, v in feeds.items() if k in self.input_names}
+        token_embeddings = self.session.run(None, feeds)[0]
+
+        # Mean pooling over real (non-padding) tokens
+        mask = feeds["attention_mask"][..., None].astype("float32")
+        pooled = (token_embeddings * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+
+        if self.config.get("normalize", True):
+            pooled /= np.maximum(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12)
+        return pooled.astype("float32", copy=False)
+
+
+def create_backend(name: str, model_name: str, onnx_dir: str, num_threads: int = 0) -> EmbeddingBackend:
+    if name == "torch":
+        return TorchBackend(model_name)
+    if name in ("onnx", "onnx-int8"):
+        return OnnxBackend(onnx_dir, quantized=(name == "onnx-int8"), num_threads=num_threads)
+    raise ValueError(f"Unknown embedding backend: {name}")
+
+
+def export_onnx(model_name: str, output_dir: str, quantize: bool = True, opset: int = 17) -> Dict[str, str]:
+    """
+    Exports the transformer of a SentenceTransformer model to ONNX, plus an
+    int8 dynamically quantized copy. Pooling/normalization stay in numpy
+    (OnnxBackend) so the graph is the plain encoder.
+    """
+    import torch
+    from sentence_transformers import SentenceTransformer
+    from sentence_transformers.models import Normalize
+
+    os.makedirs(output_dir, exist_ok=True)
+    st_model = SentenceTransformer(model_name, device="cpu")
+    transformer = st_model[0]
+    hf_model = transformer.auto_model.eval()
+    tokenizer = transformer.tokenizer
+
+    sample = tokenizer(["example sentence for tracing"], return_tensors="pt")
+    input_names = [n for n in ("input_ids", "attention_mask", "token_type_ids") if n in sample]
+
+    class EncoderOnly(torch.nn.Module):
+        def __init__(self, model):
+            super().__init__()
+            self.model = model
+
+        def forward(self, *inputs):
+            return self.model(**dict(zip(input_names, inputs))).last_hidden_state
+
+    model_path = os.path.join(output_dir, ONNX_MODEL_FILE)
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["token_embeddings"] = {0: "batch", 1: "sequence"}
+    # Newer torch defaults to the dynamo exporter; the TorchScript one handles HF encoders fine
+    extra = {"dynamo": False} if "dynamo" in inspect.signature(torch.onnx.export).parameters else {}
+    with torch.no_grad():
+        torch.onnx.export(
+            EncoderOnly(hf_model),
+            tuple(sample[n] for n in input_names),
+            model_path,
+            input_names=input_names,
+            output_names=["token_embeddings"],
+            dynamic_axes=dynamic_axes,
+            opset_version=opset,
+            **extra
+        )
+
+    tokenizer.backend_tokenizer.save(os.path.join(output_dir, TOKENIZER_FILE))
+    config = {
+        "model_name": model_name,
+        "dimension": st_model.get_sentence_embedding_dimension(),
+        "max_seq_length": st_model.max_seq_length,
+        "pad_token_id": tokenizer.pad_token_id or 0,
+        "pad_token": tokenizer.pad_token or "[PAD]",
+        "normalize": any(isinstance(module, Normalize) for module in st_model)
+    }
+    with open(os.path.join(output_dir, ONNX_CONFIG_FILE), "w") as f:
+        json.dump(config, f, indent=2)
+
+    paths = {"onnx": model_path}
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        int8_path = os.path.join(output_dir, ONNX_INT8_MODEL_FILE)
+        quantize_dynamic(model_path, int8_path, weight_type=QuantType.QInt8)
+        paths["onnx-int8"] = int8_path
+    return paths
@@ -0,0 +1,133 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional
+import numpy as np
+from app.core.metrics import Histogram
+
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+WAIT_MS_BUCKETS = (0.1, 0.5, 1, 2, 5, 10, 25, 50, 100)
+
+
+class _Request:
+    __slots__ = ("texts", "future", "enqueued_at")
+
+    def __init__(self, texts: List[str]):
+        self.texts = texts
+        self.future: Future = Future()
+        self.enqueued_at = time.perf_counter()
+
+
+class EmbeddingBatcher:
+    """
+    Dynamic micro-batcher in front of the model forward pass.
+
+    Callers from any thread submit their texts and block; a single worker
+    thread gathers requests until the next one would take the batch past
+    `max_batch_size` texts or the oldest request has waited `max_wait_ms`,
+    runs one batched encode and hands every caller back its own slice.
+    A single request larger than `max_batch_size` is encoded on its own.
+
+    The wait is adaptive: the worker only holds a batch open while another
+    caller has entered encode() but is not in it yet. A lone request on an
+    idle server is encoded at once; under load, batches form from the
+    requests that queue up during the previous forward pass.
+    """
+
+    def __init__(self, encode_fn: Callable[[List[str]], np.ndarray], max_batch_size: int = 64, max_wait_ms: float = 5.0):
+        self.encode_fn = encode_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+
+        self._queue: "queue.Queue[_Request]" = queue.Queue()
+        self._carry: Optional[_Request] = None  # did not fit the last batch; starts the next one
+        self._worker = None
+        self._start_lock = threading.Lock()
+        self._pending = 0  # callers inside encode() whose batch has not finished
+        self._pending_lock = threading.Lock()
+
+        self.batch_sizes = Histogram(BATCH_SIZE_BUCKETS)        # texts per forward pass
+        self.requests_per_batch = Histogram(BATCH_SIZE_BUCKETS)  # callers merged per forward pass
+        self.wait_ms = Histogram(WAIT_MS_BUCKETS)                # queueing delay per caller
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        request = _Request(list(texts))
+        self._ensure_worker()
+        with self._pending_lock:
+            self._pending += 1
+        self._queue.put(request)
+        return request.future.result()
+
+    def _ensure_worker(self):
+        if self._worker is None:
+            with self._start_lock:
+                if self._worker is None:
+                    self._worker = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+                    self._worker.start()
+
+    def _collect(self) -> List[_Request]:
+        first = self._carry if self._carry is not None else self._queue.get()
+        self._carry = None
+        batch = [first]
+        size = len(first.texts)
+        deadline = first.enqueued_at + self.max_wait
+
+        while size < self.max_batch_size:
+            try:
+                request = self._queue.get_nowait()
+            except queue.Empty:
+                # Nobody else on the way in: waiting would only add latency
+                timeout = deadline - time.perf_counter()
+                if self._pending <= len(batch) or timeout <= 0:
+                    break
+                try:
+                    request = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+            if size + len(request.texts) > self.max_batch_size:
+                # Requests are not split: this one waits for the next forward pass
+                self._carry = request
+                break
+            batch.append(request)
+            size += len(request.texts)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            started = time.perf_counter()
+            texts = [t for request in batch for t in request.texts]
+
+            for request in batch:
+                self.wait_ms.observe((started - request.enqueued_at) * 1000.0)
+            self.batch_sizes.observe(len(texts))
+            self.requests_per_batch.observe(len(batch))
+
+            try:
+                vectors = np.asarray(self.encode_fn(texts), dtype="float32")
+            except Exception as e:
+                self._done(batch)
+                for request in batch:
+                    request.future.set_exception(e)
+                continue
+            self._done(batch)
+
+            offset = 0
+            for request in batch:
+                request.future.set_result(vectors[offset:offset + len(request.texts)])
+                offset += len(request.texts)
+
+    def _done(self, batch: List[_Request]) -> None:
+        # Before the callers wake up, so the next _collect sees only callers still to be served
+        with self._pending_lock:
+            self._pending -= len(batch)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000.0,
+            "batch_size": self.batch_sizes.snapshot(),
+            "requests_per_batch": self.requests_per_batch.snapshot(),
+            "wait_ms": self.wait_ms.snapshot()
+        }
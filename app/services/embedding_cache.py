@@ -0,0 +1,154 @@
+import hashlib
+import os
+import re
+import threading
+import numpy as np
+from typing import Any, Dict, List, Optional
+from app.utils.cache import LRUCache
+
+def normalize_text(text: str) -> str:
+    """Whitespace-insensitive form of a text used for cache keys."""
+    return " ".join(text.split())
+
+
+class DiskVectorStore:
+    """
+    Append-only on-disk tier: a raw float32 matrix plus a key file with one
+    hex key per row. The matrix is memory-mapped, so a restarted process can
+    serve hits without re-reading or re-encoding anything.
+
+    Each process should use its own directory (or a directory pre-built
+    offline); concurrent writers to the same files are not coordinated.
+    """
+
+    def __init__(self, directory: str, dimension: int, max_entries: int = 1_000_000):
+        self.dimension = dimension
+        self.max_entries = max_entries
+        os.makedirs(directory, exist_ok=True)
+        self.keys_path = os.path.join(directory, "keys.txt")
+        self.vectors_path = os.path.join(directory, "vectors.f32")
+
+        self._lock = threading.Lock()
+        self._rows: Dict[str, int] = {}
+        self._mmap: Optional[np.memmap] = None
+        self._load()
+
+    def _load(self):
+        keys = []
+        if os.path.exists(self.keys_path):
+            with open(self.keys_path, "r", encoding="ascii") as f:
+                keys = [line.strip() for line in f if line.strip()]
+
+        row_bytes = self.dimension * 4
+        stored_rows = os.path.getsize(self.vectors_path) // row_bytes if os.path.exists(self.vectors_path) else 0
+
+        # Drop keys whose vectors never made it to disk (e.g. crash mid-append)
+        count = min(len(keys), stored_rows)
+        if count != len(keys) or count != stored_rows:
+            keys = keys[:count]
+            with open(self.keys_path, "w", encoding="ascii") as f:
+                f.writelines(k + "\n" for k in keys)
+            with open(self.vectors_path, "ab") as f:
+                f.truncate(count * row_bytes)
+
+        self._rows = {k: i for i, k in enumerate(keys)}
+
+    def _matrix(self) -> Optional[np.memmap]:
+        n = len(self._rows)
+        if n == 0:
+            return None
+        if self._mmap is None or self._mmap.shape[0] < n:
+            self._mmap = np.memmap(self.vectors_path, dtype="float32", mode="r", shape=(n, self.dimension))
+        return self._mmap
+
+    def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        found = {}
+        with self._lock:
+            rows = [(k, self._rows[k]) for k in keys if k in self._rows]
+            if not rows:
+                return found
+            matrix = self._matrix()
+            for k, row in rows:
+                found[k] = np.array(matrix[row])
+        return found
+
+    def put_many(self, items: Dict[str, np.ndarray]) -> None:
+        with self._lock:
+            new = [(k, v) for k, v in items.items() if k not in self._rows]
+            new = new[:max(0, self.max_entries - len(self._rows))]
+            if not new:
+                return
+            block = np.stack([v for _, v in new]).astype("float32", copy=False)
+            # Vectors first, keys second: a key is only visible once its row exists
+            with open(self.vectors_path, "ab") as f:
+                f.write(block.tobytes())
+            with open(self.keys_path, "a", encoding="ascii") as f:
+                f.writelines(k + "\n" for k, _ in new)
+            start = len(self._rows)
+            for i, (k, _) in enumerate(new):
+                self._rows[k] = start + i
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+
+class EmbeddingCache:
+    """
+    Content-addressed vector cache: key = sha256(model name + normalized text).
+    Lookups go to a bounded in-memory LRU first, then the optional disk tier;
+    disk hits are promoted into memory.
+    """
+
+    def __init__(self, model_name: str, dimension: int, max_entries: int = 50_000, cache_dir: Optional[str] = None):
+        self.model_name = model_name
+        self.memory = LRUCache(maxsize=max_entries)
+        self.disk = None
+        if cache_dir:
+            safe_name = re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name)
+            self.disk = DiskVectorStore(os.path.join(cache_dir, safe_name), dimension)
+
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+
+    def key(self, text: str) -> str:
+        payload = f"{self.model_name}\x00{normalize_text(text)}".encode("utf-8")
+        return hashlib.sha256(payload).hexdigest()
+
+    def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        found = {}
+        missing = []
+        for k in keys:
+            vector = self.memory.get(k)
+            if vector is None:
+                missing.append(k)
+            else:
+                found[k] = vector
+
+        if missing and self.disk is not None:
+            from_disk = self.disk.get_many(missing)
+            for k, vector in from_disk.items():
+                self.memory.set(k, vector)
+            found.update(from_disk)
+            self.disk_hits += len(from_disk)
+
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, items: Dict[str, np.ndarray]) -> None:
+        for k, vector in items.items():
+            self.memory.set(k, vector)
+        if self.disk is not None:
+            self.disk.put_many(items)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "disk_hits": self.disk_hits,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "memory_entries": len(self.memory),
+            "disk_entries": len(self.disk) if self.disk is not None else 0
+        }
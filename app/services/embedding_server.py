@@ -0,0 +1,155 @@
+import json
+import logging
+import os
+import socket
+import socketserver
+import struct
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from app.services.embedding_backends import EmbeddingBackend
+
+logger = logging.getLogger(__name__)
+
+# Sidecar mode (settings.EMBEDDING_SERVER_SOCKET): one process owns the model
+# and API workers encode through it over a Unix socket.
+#
+# Frame, both directions: >II (header length, payload length), a JSON header,
+# then the payload. Requests:  {"op": "info"} | {"op": "encode"} + UTF-8 JSON
+# list of texts. Responses: {"namespace", "dimension"} | {"rows", "dimension"}
+# + float32 row-major vectors | {"error": "..."}.
+
+_FRAME = struct.Struct(">II")
+
+
+def send_frame(sock: socket.socket, header: Dict[str, Any], payload: bytes = b"") -> None:
+    head = json.dumps(header).encode("utf-8")
+    sock.sendall(_FRAME.pack(len(head), len(payload)) + head + payload)
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytearray:
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        n = sock.recv_into(view[received:])
+        if n == 0:
+            raise ConnectionError("Embedding server connection closed")
+        received += n
+    return buffer
+
+
+def recv_frame(sock: socket.socket) -> Tuple[Dict[str, Any], bytearray]:
+    head_size, payload_size = _FRAME.unpack(_recv_exact(sock, _FRAME.size))
+    header = json.loads(_recv_exact(sock, head_size))
+    return header, _recv_exact(sock, payload_size)
+
+
+class EmbeddingServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Serves one embedding backend to every local worker. Requests from all
+    connections go through one EmbeddingBatcher, so concurrent workers share
+    forward passes as well as the model's memory.
+    """
+
+    daemon_threads = True
+    request_queue_size = 128  # every worker thread opens its own connection; a Unix socket refuses past the backlog
+
+    def __init__(self, socket_path: str, backend: EmbeddingBackend, namespace: str,
+                 max_batch_size: int = 64, max_wait_ms: float = 5.0):
+        from app.services.embedding_batcher import EmbeddingBatcher
+        self.socket_path = socket_path
+        self.backend = backend
+        self.namespace = namespace
+        self.dimension = int(backend.encode(["warm up"]).shape[1])
+        self.batcher = EmbeddingBatcher(backend.encode, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms)
+
+        if os.path.exists(socket_path):
+            os.remove(socket_path)  # stale socket of a previous run
+        directory = os.path.dirname(socket_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        super().__init__(socket_path, _Handler)
+        os.chmod(socket_path, 0o660)
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    def handle(self):
+        server: EmbeddingServer = self.server
+        while True:  # one persistent connection per worker thread
+            try:
+                header, payload = recv_frame(self.request)
+            except (ConnectionError, OSError):
+                return
+            try:
+                if header.get("op") == "info":
+                    send_frame(self.request, {"namespace": server.namespace, "dimension": server.dimension})
+                elif header.get("op") == "encode":
+                    texts = json.loads(payload)
+                    vectors = np.ascontiguousarray(server.batcher.encode(texts), dtype="float32")
+                    send_frame(self.request, {"rows": len(vectors), "dimension": server.dimension}, vectors.tobytes())
+                else:
+                    send_frame(self.request, {"error": f"Unknown op: {header.get('op')}"})
+            except (ConnectionError, OSError):
+                return
+            except Exception as e:
+                logger.error(f"Embedding request failed: {e}")
+                send_frame(self.request, {"error": str(e)})
+
+
+class RemoteBackend(EmbeddingBackend):
+    """
+    Client side of the sidecar: encodes through the embedding server instead
+    of loading a model in this process. Refuses a server running a different
+    model/backend than this worker is configured for, since its vectors would
+    end up in this worker's cache and index.
+    """
+
+    name = "remote"
+
+    def __init__(self, socket_path: str, namespace: str, timeout: float = 30.0):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._local = threading.local()  # one connection per calling thread
+
+        info = self._request({"op": "info"})[0]
+        if info["namespace"] != namespace:
+            raise RuntimeError(f"Embedding server at {socket_path} runs {info['namespace']}, expected {namespace}")
+        self.dimension = info["dimension"]
+
+    def _connect(self) -> socket.socket:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        return sock
+
+    def _request(self, header: Dict[str, Any], payload: bytes = b"") -> Tuple[Dict[str, Any], bytearray]:
+        # One reconnect covers a restarted server or a connection dropped while idle
+        for attempt in range(2):
+            sock: Optional[socket.socket] = getattr(self._local, "sock", None)
+            try:
+                if sock is None:
+                    sock = self._local.sock = self._connect()
+                send_frame(sock, header, payload)
+                response, body = recv_frame(sock)
+                break
+            except (ConnectionError, OSError):
+                if sock is not None:
+                    sock.close()
+                self._local.sock = None
+                if attempt == 1:
+                    raise
+        if "error" in response:
+            raise RuntimeError(f"Embedding server error: {response['error']}")
+        return response, body
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self.dimension), dtype="float32")
+        response, body = self._request({"op": "encode"}, json.dumps(list(texts)).encode("utf-8"))
+        return np.frombuffer(body, dtype="float32").reshape(response["rows"], response["dimension"])
@@ -1,61 +1,235 @@
-import faiss
+import logging
+import os
+import threading
+import time
 import numpy as np
-from typing import List, Dict, Any, Tuple
-from sentence_transformers import SentenceTransformer
+from itertools import islice
+from typing import List, Dict, Any, Iterable, Iterator, Tuple
+from app.core.config import settings
+from app.core.metrics import timed
+from app.services.embedding_cache import EmbeddingCache, normalize_text
+from app.services.embedding_batcher import EmbeddingBatcher
+from app.services.embedding_backends import EmbeddingBackend, create_backend
+from app.services.vector_store import MANIFEST_FILE, VectorStore
+
+logger = logging.getLogger(__name__)
 
 class EmbeddingService:
     def __init__(self):
-        # Load model (downloads on first run)
-        self.model = SentenceTransformer('all-MiniLM-L6-v2')
+        # torch / onnxruntime / faiss are imported on first use so
+        # importing the app stays fast; warm_up() loads them ahead of traffic.
+        self.model_name = settings.EMBEDDING_MODEL_NAME
+        self.backend_name = settings.EMBEDDING_BACKEND
+        self._backend = None
+        self._store = None
+        self._load_lock = threading.Lock()
         self.dimension = 384 # Dimension for all-MiniLM-L6-v2
         
-        # Initialize FAISS index
-        self.index = faiss.IndexFlatL2(self.dimension)
+        # Vector cache keyed by hash(model name + backend + normalized text);
+        # quantized vectors must not be served for the fp32 model and vice versa
+        self.cache = EmbeddingCache(
+            f"{self.model_name}@{self.backend_name}",
+            self.dimension,
+            max_entries=settings.EMBEDDING_CACHE_SIZE,
+            cache_dir=settings.EMBEDDING_CACHE_DIR or None
+        )
+        
+        # Cache misses from concurrent requests are merged into shared forward passes
+        self.batcher = None
+        if settings.EMBEDDING_BATCHING_ENABLED:
+            self.batcher = EmbeddingBatcher(
+                self._forward,
+                max_batch_size=settings.EMBEDDING_BATCH_MAX_SIZE,
+                max_wait_ms=settings.EMBEDDING_BATCH_MAX_WAIT_MS
+            )
+        
+
+    @property
+    def backend(self) -> EmbeddingBackend:
+        """
+        Embedding backend (torch / onnx / onnx-int8), loaded on first access.
+        With EMBEDDING_SERVER_SOCKET set, a client of the shared embedding
+        server instead (see scripts/embedding_server.py); no model is loaded here.
+        """
+        if self._backend is None:
+            with self._load_lock:
+                if self._backend is None and settings.EMBEDDING_SERVER_SOCKET:
+                    from app.services.embedding_server import RemoteBackend
+                    self._backend = RemoteBackend(
+                        settings.EMBEDDING_SERVER_SOCKET,
+                        namespace=self.cache.model_name,
+                        timeout=settings.EMBEDDING_SERVER_TIMEOUT_SECONDS
+                    )
+                elif self._backend is None:
+                    self._backend = create_backend(
+                        self.backend_name,
+                        self.model_name,
+                        settings.EMBEDDING_ONNX_DIR,
+                        num_threads=settings.EMBEDDING_ONNX_THREADS
+                    )
+        return self._backend
+
+    @property
+    def store(self) -> VectorStore:
+        """
+        Vector index + metadata, created on first access. When VECTOR_INDEX_PATH
+        holds a saved index it is loaded (memory-mapped) instead of rebuilt.
+        """
+        if self._store is None:
+            with self._load_lock:
+                if self._store is None:
+                    store = VectorStore(
+                        self.dimension,
+                        index_type=settings.VECTOR_INDEX_TYPE,
+                        hnsw_m=settings.HNSW_M,
+                        hnsw_ef_search=settings.HNSW_EF_SEARCH,
+                        ivf_nlist=settings.IVF_NLIST,
+                        ivf_nprobe=settings.IVF_NPROBE,
+                        namespace=self.cache.model_name
+                    )
+                    path = settings.VECTOR_INDEX_PATH
+                    if path and os.path.exists(os.path.join(path, MANIFEST_FILE)):
+                        store.load(path, mmap=settings.VECTOR_INDEX_MMAP)
+                        logger.info(f"Loaded vector index with {store.ntotal} vectors from {path}")
+                    self._store = store
+        return self._store
+
+    @property
+    def has_unsaved_vectors(self) -> bool:
+        return self._store is not None and self._store.dirty
+
+    def save_index(self, path: str = None) -> None:
+        """Persists the vector index and metadata (defaults to VECTOR_INDEX_PATH)."""
+        path = path or settings.VECTOR_INDEX_PATH
+        if not path:
+            raise ValueError("No index path given and VECTOR_INDEX_PATH is not set")
+        self.store.save(path)
+
+    @property
+    def is_ready(self) -> bool:
+        return self._backend is not None
+
+    def warm_up(self) -> None:
+        """Loads the backend and runs one forward pass so the first request is not cold."""
+        self.backend.encode(["warm up"])
+        if settings.VECTOR_INDEX_PATH:
+            self.store  # load the saved index ahead of traffic
+
+    @timed("encode")
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """
+        Returns a (len(texts), dimension) float32 matrix.
+        Duplicate lines are collapsed and only cache misses reach the model,
+        in a single batched forward pass.
+        """
+        if not texts:
+            return np.zeros((0, self.dimension), dtype="float32")
+            
+        keys = [self.cache.key(t) for t in texts]
+        vectors = self.cache.get_many(list(dict.fromkeys(keys)))
         
-        # Simple in-memory metadata store: id -> metadata
-        # In production, this would be a DB or ChromaDB
-        self.metadata_store: Dict[int, Dict[str, Any]] = {}
-        self.current_id = 0
+        # Unique misses, first occurrence wins
+        misses: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in vectors and key not in misses:
+                misses[key] = normalize_text(text)
+                
+        if misses:
+            texts_to_encode = list(misses.values())
+            if self.batcher is not None:
+                encoded = self.batcher.encode(texts_to_encode)
+            else:
+                encoded = self._forward(texts_to_encode)
+            fresh = {key: np.asarray(vec, dtype="float32") for key, vec in zip(misses, encoded)}
+            self.cache.put_many(fresh)
+            vectors.update(fresh)
+            
+        return np.stack([vectors[key] for key in keys])
+
+    def _forward(self, texts: List[str]) -> np.ndarray:
+        """One batched model forward pass."""
+        return self.backend.encode(texts)
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters of the embedding cache."""
+        return self.cache.stats()
+
+    def batch_stats(self) -> Dict[str, Any]:
+        """Batch-size and wait-time histograms of the micro-batcher."""
+        if self.batcher is None:
+            return {"enabled": False}
+        return {"enabled": True, **self.batcher.stats()}
 
     def embed_text(self, text: str) -> List[float]:
         """Generates embedding vector for text."""
         # encode returns numpy array, convert to list
-        embedding = self.model.encode(text)
+        embedding = self.encode([text])[0]
         return embedding.tolist()
 
     def add_to_index(self, text: str, metadata: Dict[str, Any]) -> int:
         """Adds text embedding to index and returns the assigned ID."""
-        embedding = self.model.encode([text]) # Expects list of texts, returns (1, dim) ndarray
-        
-        # FAISS expects float32
-        vector = np.array(embedding).astype('float32')
-        self.index.add(vector)
+        return self.add_many([(text, metadata)])["first_id"]
+
+    def add_many(self, items: Iterable[Tuple[str, Dict[str, Any]]], batch_size: int = None) -> Dict[str, Any]:
+        """
+        Streaming ingest of (text, metadata) pairs. Texts are encoded and added
+        to FAISS one block of `batch_size` at a time, so memory stays bounded
+        by the block size however long the input iterable is.
+        Returns the assigned id range and the ingest rate.
+        """
+        batch_size = batch_size or settings.INGEST_BATCH_SIZE
+        started = time.perf_counter()
+        added = 0
+        first_id = last_id = None
         
-        doc_id = self.current_id
-        self.metadata_store[doc_id] = {
-            "text": text,
-            **metadata
+        for block in self._blocks(items, batch_size):
+            texts = [text for text, _ in block]
+            # Bulk blocks bypass the request-path cache/batcher: they are
+            # already large batches and would only evict hot entries.
+            # Single inserts (add_to_index) keep going through encode().
+            if len(block) > 1:
+                vectors = self.backend.encode(texts)
+            else:
+                vectors = self.encode(texts)
+            ids = self.store.add(vectors, [{"text": text, **metadata} for text, metadata in block])
+            
+            if first_id is None:
+                first_id = ids[0]
+            last_id = ids[-1]
+            added += len(ids)
+            
+        elapsed = time.perf_counter() - started
+        report = {
+            "added": added,
+            "first_id": first_id,
+            "last_id": last_id,
+            "seconds": round(elapsed, 4),
+            "rate_per_s": round(added / elapsed, 1) if elapsed > 0 else 0.0
         }
-        self.current_id += 1
-        
-        return doc_id
+        if added > 1:
+            logger.info(f"Ingested {added} texts in {elapsed:.2f}s ({report['rate_per_s']}/s)")
+        return report
+
+    @staticmethod
+    def _blocks(items: Iterable[Tuple[str, Dict[str, Any]]], size: int) -> Iterator[List[Tuple[str, Dict[str, Any]]]]:
+        iterator = iter(items)
+        while True:
+            block = list(islice(iterator, size))
+            if not block:
+                return
+            yield block
 
     def search(self, query_text: str, k: int = 5) -> List[Dict[str, Any]]:
-        """Searches for similar texts."""
-        query_vector = self.model.encode([query_text]).astype('float32')
-        
-        distances, indices = self.index.search(query_vector, k)
+        """Searches for similar texts. Scores are cosine similarities (higher is better)."""
+        query_vector = self.encode([query_text])
         
         results = []
-        for i in range(len(indices[0])):
-            idx = indices[0][i]
-            dist = distances[0][i]
-            
-            if idx != -1 and idx in self.metadata_store:
-                item = self.metadata_store[idx]
+        for idx, score in self.store.search(query_vector, k):
+            item = self.store.metadata.get(idx)
+            if item is not None:
                 results.append({
-                    "id": int(idx),
-                    "score": float(dist), # L2 distance (lower is better)
+                    "id": idx,
+                    "score": score,
                     "metadata": item
                 })
                 
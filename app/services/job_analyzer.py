@@ -1,102 +1,167 @@
+import copy
+import hashlib
 import re
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
+from app.core.concurrency import run_in_parse_pool
+from app.core.config import settings
+from app.core.metrics import timed
+from app.services.skill_taxonomy import skill_taxonomy
+from app.utils.cache import LRUCache
+from app.utils.text import normalize_whitespace
+
+# Section headers. A header is a line holding only one of these phrases
+# (plus surrounding whitespace / colons), matched case-insensitively.
+REQUIRED_HEADERS = frozenset(["requirements", "required skills", "what we look for", "qualifications"])
+PREFERRED_HEADERS = frozenset(["preferred skills", "nice to have", "bonus points", "desired"])
+RESPONSIBILITY_HEADERS = frozenset(["responsibilities", "what you will do", "duties", "role overview"])
+
+# Headers that close a section
+SKILLS_END_HEADERS = frozenset(["responsibilities", "requirements", "preferred", "benefits", "about"])
+RESPONSIBILITIES_END_HEADERS = frozenset(["requirements", "preferred", "benefits", "about"])
+
+_ALL_HEADERS = REQUIRED_HEADERS | PREFERRED_HEADERS | RESPONSIBILITY_HEADERS | SKILLS_END_HEADERS | RESPONSIBILITIES_END_HEADERS
+
+# One alternation over every header phrase: a single scan finds all headers and their offsets
+_HEADER_RE = re.compile(
+    r"(?im)^[^\S\n]*(" + "|".join(re.escape(h) for h in sorted(_ALL_HEADERS, key=len, reverse=True)) + r")[\s:]*$"
+)
+_BULLET_RE = re.compile(r'^[\-\*•\d\.]+\s*')
+
+# Output key -> (headers that open the section, headers that close it)
+SECTIONS = (
+    ("required_skills", REQUIRED_HEADERS, SKILLS_END_HEADERS),
+    ("preferred_skills", PREFERRED_HEADERS, SKILLS_END_HEADERS),
+    ("responsibilities", RESPONSIBILITY_HEADERS, RESPONSIBILITIES_END_HEADERS)
+)
 
 class JobAnalyzer:
     def __init__(self):
-        pass
+        # Same posting is analyzed once per candidate; memoize by text hash
+        self._cache = LRUCache(maxsize=settings.JOB_ANALYSIS_CACHE_SIZE)
 
+    @timed("job_analyze")
     def analyze(self, text: str) -> Dict[str, Any]:
         """
         Analyzes job description text to extract structured requirements.
         """
-        normalized_text = self._normalize_whitespace(text)
+        normalized_text, key = self._key(text)
+        cached = self._cache.get(key)
+        if cached is None:
+            cached = self._extract(normalized_text)
+            self._cache.set(key, cached)
         
-        return {
-            "raw_text": normalized_text,
-            "required_skills": self._extract_skills(normalized_text, "required"),
-            "preferred_skills": self._extract_skills(normalized_text, "preferred"),
-            "responsibilities": self._extract_responsibilities(normalized_text)
-        }
-
-    def _normalize_whitespace(self, text: str) -> str:
-        text = text.replace('\xa0', ' ')
-        text = re.sub(r'[ \t]+', ' ', text)
-        text = re.sub(r'\n+', '\n', text)
-        return text.strip()
-
-    def _extract_skills(self, text: str, type: str = "required") -> List[str]:
+        return copy.deepcopy(cached)
+
+    def analyze_many(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """analyze() for each posting."""
+        return [self.analyze(text) for text in texts]
+
+    async def aanalyze(self, text: str) -> Dict[str, Any]:
         """
-        Extracts skills based on sections.
-        This is a heuristic implementation for Phase 2.
+        analyze() for the request path: the memo is checked here, in the
+        serving process, and only a miss goes to the parse pool. Works with
+        either PARSE_POOL_KIND, and process workers share this one memo.
         """
-        skills = []
-        
-        # Define section headers based on type
-        if type == "required":
-            pattern = r"(?im)^[\s]*(requirements|required skills|what we look for|qualifications)[\s:]*$"
-        else:
-            pattern = r"(?im)^[\s]*(preferred skills|nice to have|bonus points|desired)[\s:]*$"
-            
-        # Find start of section
-        match = re.search(pattern, text)
-        if not match:
-            return skills
-            
-        start_idx = match.end()
-        
-        # Find end of section (next header or end of text)
-        # Simple heuristic: stop at next double newline or next common header
-        # For better robustness, we look for known headers
-        next_header_pattern = r"(?im)^[\s]*(responsibilities|requirements|preferred|benefits|about)[\s:]*$"
+        return (await self.aanalyze_many([text]))[0]
+
+    async def aanalyze_many(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """aanalyze() for a catalog; all misses go to the parse pool in one hop."""
+        keys = []
+        results: Dict[str, Dict[str, Any]] = {}
+        missing: Dict[str, str] = {}  # key -> normalized text
+        for text in texts:
+            normalized_text, key = self._key(text)
+            keys.append(key)
+            if key in results or key in missing:
+                continue
+            cached = self._cache.get(key)
+            if cached is None:
+                missing[key] = normalized_text
+            else:
+                results[key] = cached
         
-        # Look for the NEXT header after the current one
-        next_match = re.search(next_header_pattern, text[start_idx:])
+        if missing:
+            extracted = await run_in_parse_pool(extract_requirements, list(missing.values()))
+            for key, result in zip(missing, extracted):
+                self._cache.set(key, result)
+                results[key] = result
+        return [copy.deepcopy(results[key]) for key in keys]
+
+    def cache_stats(self) -> Dict[str, Any]:
+        return self._cache.stats()
+
+    @staticmethod
+    def _key(text: str) -> Tuple[str, str]:
+        # One entry per posting, keyed on the normalized text: whitespace-only
+        # variants share it, and a catalog of N postings fills N slots
+        normalized_text = normalize_whitespace(text)
+        return normalized_text, hashlib.sha256(normalized_text.encode("utf-8")).hexdigest()
+
+    def _extract(self, normalized_text: str) -> Dict[str, Any]:
+        spans = self._locate_sections(normalized_text)
+        result = {"raw_text": normalized_text}
+        for name, _, _ in SECTIONS:
+            result[name] = self._section_items(normalized_text, spans.get(name))
+        # Canonical skill ids (see app/data/skills.json) for table-based scoring
+        result["required_skill_ids"] = skill_taxonomy.extract_lines(result["required_skills"])
+        result["preferred_skill_ids"] = skill_taxonomy.extract_lines(result["preferred_skills"])
+        return result
+
+    def _locate_sections(self, text: str) -> Dict[str, Tuple[int, int]]:
+        """
+        One pass over the header lines. A section runs from the end of its
+        first start header to the next closing header (or end of text); the
+        scan stops as soon as every section is resolved.
+        """
+        spans = {}
+        pending = list(SECTIONS)
+        open_sections = {}  # name -> (content start, closing headers)
         
-        if next_match:
-            end_idx = start_idx + next_match.start()
-        else:
-            end_idx = len(text)
+        for match in _HEADER_RE.finditer(text):
+            header = match.group(1).lower()
             
-        section_content = text[start_idx:end_idx].strip()
-        
-        # Split by bullets or newlines
-        lines = section_content.split('\n')
-        for line in lines:
-            line = line.strip()
-            # Remove common bullet points
-            line = re.sub(r'^[\-\*•\d\.]+\s*', '', line)
-            if line:
-                skills.append(line)
+            for name, (start_idx, end_headers) in list(open_sections.items()):
+                if header in end_headers:
+                    spans[name] = (start_idx, match.start())
+                    del open_sections[name]
+                    
+            for section in list(pending):
+                name, start_headers, end_headers = section
+                if header in start_headers:
+                    open_sections[name] = (match.end(), end_headers)
+                    pending.remove(section)
+                    
+            if not pending and not open_sections:
+                break
                 
-        return skills
+        for name, (start_idx, _) in open_sections.items():
+            spans[name] = (start_idx, len(text))
+        return spans
 
-    def _extract_responsibilities(self, text: str) -> List[str]:
-        responsibilities = []
-        pattern = r"(?im)^[\s]*(responsibilities|what you will do|duties|role overview)[\s:]*$"
-        
-        match = re.search(pattern, text)
-        if not match:
-            return responsibilities
-            
-        start_idx = match.end()
-        
-        next_header_pattern = r"(?im)^[\s]*(requirements|preferred|benefits|about)[\s:]*$"
-        next_match = re.search(next_header_pattern, text[start_idx:])
-        
-        if next_match:
-            end_idx = start_idx + next_match.start()
-        else:
-            end_idx = len(text)
+    def _section_items(self, text: str, span: Optional[Tuple[int, int]]) -> List[str]:
+        items = []
+        if span is None:
+            return items
             
-        section_content = text[start_idx:end_idx].strip()
+        section_content = text[span[0]:span[1]].strip()
         
-        lines = section_content.split('\n')
-        for line in lines:
+        # Split by bullets or newlines
+        for line in section_content.split('\n'):
             line = line.strip()
-            line = re.sub(r'^[\-\*•\d\.]+\s*', '', line)
+            # Remove common bullet points
+            line = _BULLET_RE.sub('', line)
             if line:
-                responsibilities.append(line)
+                items.append(line)
                 
-        return responsibilities
+        return items
 
 job_analyzer = JobAnalyzer()
+
+@timed("job_analyze")
+def extract_requirements(normalized_texts: List[str]) -> List[Dict[str, Any]]:
+    """
+    Uncached analysis of normalized postings, for the parse pool. A module
+    function, unlike the analyzer's bound methods (its memo holds a lock),
+    so a process pool can pickle it.
+    """
+    return [job_analyzer._extract(text) for text in normalized_texts]
@@ -0,0 +1,128 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+from app.utils.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+# Size eviction runs every this many writes rather than on each one
+EVICT_EVERY = 64
+
+
+class LLMResponseCache:
+    """
+    Persistent cache of chat-completion texts: SQLite in WAL mode (readers
+    never block, safe to share between worker processes) with an in-memory
+    LRU in front so repeated lookups do not touch SQLite at all.
+
+    Entries expire after `ttl_seconds`; beyond `max_entries` the least
+    recently used rows are dropped. Errors are logged and treated as
+    misses - the cache must never fail a request.
+    """
+
+    def __init__(self, path: str, ttl_seconds: float, max_entries: int, memory_entries: int = 1024):
+        self.path = path
+        self.ttl = ttl_seconds
+        self.max_entries = max_entries
+        self.memory = LRUCache(maxsize=memory_entries, ttl=ttl_seconds)
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._local = threading.local()  # one connection per thread
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = self._connection()
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        connection.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)")
+        connection.commit()
+
+    @staticmethod
+    def make_key(model: str, temperature: float, system_message: str, prompt: str, max_tokens: int) -> str:
+        payload = json.dumps([model, temperature, system_message, prompt, max_tokens])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=0.2, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")  # WAL: durable enough for a cache, no fsync per write
+            self._local.connection = connection
+        return connection
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.memory.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        now = time.time()
+        try:
+            connection = self._connection()
+            row = connection.execute("SELECT value, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None and now - row[1] <= self.ttl:
+                connection.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+                self.hits += 1
+                self.disk_hits += 1
+                self.memory.set(key, row[0])
+                return row[0]
+        except sqlite3.Error as e:
+            logger.warning(f"LLM cache read failed: {e}")
+        self.misses += 1
+        return None
+
+    def set(self, key: str, value: str) -> None:
+        self.memory.set(key, value)
+        now = time.time()
+        try:
+            connection = self._connection()
+            connection.execute(
+                "INSERT OR REPLACE INTO responses (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, value, now, now)
+            )
+            self._writes += 1
+            if self._writes % EVICT_EVERY == 0:
+                self.evict()
+        except sqlite3.Error as e:
+            logger.warning(f"LLM cache write failed: {e}")
+
+    def evict(self) -> int:
+        """Drops expired rows, then the least recently used beyond max_entries."""
+        connection = self._connection()
+        removed = connection.execute("DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl,)).rowcount
+        removed += connection.execute(
+            "DELETE FROM responses WHERE key IN "
+            "(SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        ).rowcount
+        return removed
+
+    def clear(self) -> None:
+        self.memory.clear()
+        self._connection().execute("DELETE FROM responses")
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "memory_entries": len(self.memory),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl
+        }
@@ -0,0 +1,195 @@
+import asyncio
+import contextvars
+import logging
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from fastapi import HTTPException
+from app.core.config import settings
+from app.core.metrics import Histogram
+from app.utils.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+MS_BUCKETS = (10, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+
+
+class QueueFullError(Exception):
+    """Raised by submit when MATCH_QUEUE_MAX_SIZE jobs are already waiting."""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Match queue is full, retry later")
+        self.retry_after = retry_after
+
+
+class MatchJob:
+    """One submitted pipeline run: queued -> running -> done | failed."""
+
+    def __init__(self, run: Callable[[], Awaitable[Any]], cleanup: Optional[Callable[[], None]] = None):
+        self.id = uuid.uuid4().hex
+        self.status = "queued"
+        self.submitted_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self._run = run
+        self._cleanup = cleanup
+
+    def release(self):
+        # Drop the closure (and the upload it holds) once the job can no longer run
+        if self._cleanup is not None:
+            try:
+                self._cleanup()
+            except Exception as e:
+                logger.warning(f"Cleanup of match job {self.id} failed: {e}")
+        self._run = self._cleanup = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {"job_id": self.id, "status": self.status, "submitted_at": self.submitted_at}
+        if self.started_at is not None:
+            data["queue_wait_ms"] = round((self.started_at - self.submitted_at) * 1000.0, 1)
+        if self.finished_at is not None:
+            data["run_ms"] = round((self.finished_at - self.started_at) * 1000.0, 1)
+        if self.status == "done":
+            data["result"] = self.result
+        elif self.status == "failed":
+            data["error"] = self.error
+        return data
+
+
+class MatchQueue:
+    """
+    In-process bounded queue for POST /match/jobs, drained by a fixed
+    number of worker tasks on the serving event loop (the blocking work
+    inside the pipeline still runs in the worker pools).
+
+    Submissions beyond `max_size` waiting jobs are refused with
+    QueueFullError, so load turns into fast 503s instead of piling up.
+    Finished jobs stay pollable for `result_ttl` seconds. Jobs live in this
+    process only: they are lost on restart and must be polled on the same
+    worker that accepted them.
+    """
+
+    def __init__(self, workers: int, max_size: int, result_ttl: float, max_results: int):
+        self.workers = workers
+        self.max_size = max_size
+        self._active: Dict[str, MatchJob] = {}
+        self._finished = LRUCache(maxsize=max_results, ttl=result_ttl)
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._running = 0
+
+        self.submitted = 0
+        self.rejected = 0
+        self.completed = 0
+        self.failed = 0
+        self.wait_ms = Histogram(MS_BUCKETS)  # submit -> a worker picks it up
+        self.run_ms = Histogram(MS_BUCKETS)   # pipeline duration
+
+    def _ensure_workers(self) -> asyncio.Queue:
+        """Starts the workers on the running loop the first time they are needed."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Jobs queued on a loop that is gone will never run
+            for job in self._active.values():
+                job.status, job.error = "failed", "Worker restarted before the job ran"
+                job.release()
+                self._finished.set(job.id, job)
+            self._active.clear()
+            self._queue = asyncio.Queue(maxsize=self.max_size)
+            # Started from a fresh context, not the submitting request's (its Server-Timing and profile)
+            self._tasks = [contextvars.Context().run(loop.create_task, self._worker(), name=f"match-worker-{i}")
+                           for i in range(self.workers)]
+            self._loop = loop
+        return self._queue
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def check_capacity(self) -> None:
+        """Raises QueueFullError when a submit would be refused (lets callers skip reading the upload)."""
+        if self.depth >= self.max_size:
+            self.rejected += 1
+            raise QueueFullError(self.retry_after())
+
+    def retry_after(self) -> int:
+        """Seconds until a slot is likely free: the backlog divided among the workers."""
+        mean_seconds = self.run_ms.snapshot()["mean"] / 1000.0 or 1.0
+        return max(1, round(mean_seconds * (self.depth + 1) / self.workers))
+
+    def submit(self, run: Callable[[], Awaitable[Any]], cleanup: Optional[Callable[[], None]] = None) -> MatchJob:
+        queue = self._ensure_workers()
+        job = MatchJob(run, cleanup)
+        try:
+            queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self.rejected += 1
+            job.release()
+            raise QueueFullError(self.retry_after())
+        self._active[job.id] = job
+        self.submitted += 1
+        return job
+
+    def get(self, job_id: str) -> Optional[MatchJob]:
+        return self._active.get(job_id) or self._finished.get(job_id)
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            job.started_at = time.time()
+            job.status = "running"
+            self.wait_ms.observe((job.started_at - job.submitted_at) * 1000.0)
+            self._running += 1
+            try:
+                job.result = await job._run()
+                job.status = "done"
+                self.completed += 1
+            except Exception as e:
+                job.error = e.detail if isinstance(e, HTTPException) else str(e)
+                job.status = "failed"
+                self.failed += 1
+            finally:
+                self._running -= 1
+                job.finished_at = time.time()
+                self.run_ms.observe((job.finished_at - job.started_at) * 1000.0)
+                job.release()
+                self._finished.set(job.id, job)
+                self._active.pop(job.id, None)
+                self._queue.task_done()
+
+    async def shutdown(self):
+        """Stops the workers; jobs still queued are dropped (their uploads cleaned up)."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        for job in list(self._active.values()):
+            job.release()
+        self._active.clear()
+        self._tasks = []
+        self._queue = None
+        self._loop = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "depth": self.depth,
+            "max_size": self.max_size,
+            "running": self._running,
+            "submitted": self.submitted,
+            "rejected": self.rejected,
+            "completed": self.completed,
+            "failed": self.failed,
+            "wait_ms": self.wait_ms.snapshot(),
+            "run_ms": self.run_ms.snapshot()
+        }
+
+
+match_queue = MatchQueue(
+    workers=settings.MATCH_QUEUE_WORKERS,
+    max_size=settings.MATCH_QUEUE_MAX_SIZE,
+    result_ttl=settings.MATCH_JOB_RESULT_TTL_SECONDS,
+    max_results=settings.MATCH_JOB_RESULTS_MAX
+)
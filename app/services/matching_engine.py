@@ -1,12 +1,22 @@
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Tuple
 import numpy as np
-from sentence_transformers import util
+from app.core.metrics import timed
 from app.services.embedding_service import embedding_service
+from app.services.skill_taxonomy import skill_taxonomy
+from app.utils.cache import LRUCache
+from app.utils.keywords import KeywordMatcher
 
 class MatchingEngine:
     def __init__(self):
         self.embedder = embedding_service
+        self.taxonomy = skill_taxonomy
+        # One compiled keyword automaton per job, reused across every resume scored against it
+        self._keyword_matchers = LRUCache(maxsize=256)
+        # Union automata of whole catalogs (rank_jobs), kept apart so one large
+        # catalog does not evict the per-job matchers
+        self._catalog_matchers = LRUCache(maxsize=4)
 
+    @timed("compute_score")
     def compute_score(self, resume_data: Dict[str, Any], job_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Computes a match score between a resume and a job description.
@@ -17,10 +27,15 @@ class MatchingEngine:
         # Compare resume skills vs job required skills
         resume_skills = resume_data.get("skills", [])
         job_skills = job_data.get("required_skills", [])
+        resume_skill_ids = resume_data.get("skill_ids", [])
+        job_skill_ids = job_data.get("required_skill_ids", [])
         
-        # If extracted skills are empty, fall back to raw text chunks? 
-        # For now, if empty, score is 0 (incentivizes parsing quality)
-        if not resume_skills or not job_skills:
+        # Canonical skills on both sides: precomputed table lookup, no model call.
+        # Otherwise compare the raw lines; if those are empty too, score is 0
+        # (incentivizes parsing quality)
+        if resume_skill_ids and job_skill_ids:
+            skill_score = self.taxonomy.similarity(resume_skill_ids, job_skill_ids)
+        elif not resume_skills or not job_skills:
             skill_score = 0.0
         else:
             skill_score = self._calculate_semantic_similarity_list(resume_skills, job_skills)
@@ -40,6 +55,10 @@ class MatchingEngine:
         # Here we check how many job keywords (skills) appear in resume text
         keyword_score = self._calculate_keyword_match(resume_data.get("raw_text", ""), job_skills)
         
+        return self._score(skill_score, exp_score, keyword_score)
+
+    @staticmethod
+    def _score(skill_score: float, exp_score: float, keyword_score: float) -> Dict[str, Any]:
         # Weighted Total
         # Weights: Skills (40%), Experience (40%), Keywords (20%)
         overall_score = (skill_score * 0.4) + (exp_score * 0.4) + (keyword_score * 0.2)
@@ -53,6 +72,172 @@ class MatchingEngine:
             }
         }
 
+    @timed("rank_jobs")
+    def rank_jobs(self, resume_data: Dict[str, Any], jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Scores one resume against many analyzed jobs, best first. Same
+        components and weights as compute_score, but the resume is encoded
+        once and all job lines go through a single similarity product.
+        Each entry is a compute_score result plus "index", the job's
+        position in `jobs`.
+        """
+        if not jobs:
+            return []
+        resume_skill_ids = resume_data.get("skill_ids", [])
+        # Jobs whose skills compare through the taxonomy table; the others fall back to line embeddings
+        by_table = [bool(resume_skill_ids and job.get("required_skill_ids")) for job in jobs]
+        table_scores = self.taxonomy.similarity_many(
+            resume_skill_ids, [job.get("required_skill_ids", []) if use else [] for job, use in zip(jobs, by_table)]
+        )
+        semantic_skill, exp_scores = self._semantic_scores_many(resume_data, jobs, by_table)
+        keyword_scores = self._keyword_scores_many(resume_data.get("raw_text", ""),
+                                                   [job.get("required_skills", []) for job in jobs])
+
+        ranked = []
+        for i, use_table in enumerate(by_table):
+            skill_score = table_scores[i] if use_table else semantic_skill[i]
+            result = self._score(float(skill_score), float(exp_scores[i]), keyword_scores[i])
+            result["index"] = i
+            ranked.append(result)
+        ranked.sort(key=lambda r: -r["overall_match"])  # stable: ties keep catalog order
+        return ranked
+
+    def _semantic_scores_many(self, resume_data: Dict[str, Any], jobs: List[Dict[str, Any]],
+                              by_table: List[bool]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Embedding-based skill and experience scores of every job, as
+        compute_score's average-of-best-match, from one matrix product:
+        (all job lines) x (resume skill lines | resume experience lines).
+        A max over the matching column block gives each job line its best
+        resume line; a mean per job segment gives the score.
+        """
+        resume_skills = resume_data.get("skills", [])
+        resume_exp = resume_data.get("experience", [])
+        skill_scores = np.zeros(len(jobs), dtype="float64")
+        exp_scores = np.zeros(len(jobs), dtype="float64")
+
+        lines: List[str] = []
+        blocks: List[int] = []  # per job line: 0 = scored against resume skills, 1 = against experience
+        segments: List[Tuple[np.ndarray, int, int]] = []  # (target scores, job index, line count)
+        for i, job in enumerate(jobs):
+            job_skills = job.get("required_skills", [])
+            if not by_table[i] and resume_skills and job_skills:
+                lines.extend(job_skills)
+                blocks.extend([0] * len(job_skills))
+                segments.append((skill_scores, i, len(job_skills)))
+            job_resp = job.get("responsibilities", [])
+            if resume_exp and job_resp:
+                lines.extend(job_resp)
+                blocks.extend([1] * len(job_resp))
+                segments.append((exp_scores, i, len(job_resp)))
+        if not segments:
+            return skill_scores, exp_scores
+
+        resume_vectors = self._normalize_rows(self.embedder.encode(resume_skills + resume_exp))
+        job_vectors, positions = self._encode_unique(lines)
+        similarities = job_vectors @ resume_vectors.T
+
+        split = len(resume_skills)
+        zeros = np.zeros(len(job_vectors), dtype=similarities.dtype)
+        best_skill = similarities[:, :split].max(axis=1) if split else zeros
+        best_exp = similarities[:, split:].max(axis=1) if resume_exp else zeros
+        best = np.where(np.asarray(blocks) == 0, best_skill[positions], best_exp[positions])
+
+        counts = np.array([count for _, _, count in segments])
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        means = np.add.reduceat(best, starts) / counts
+        for (target, i, _), mean in zip(segments, means):
+            target[i] = max(0.0, float(mean))
+        return skill_scores, exp_scores
+
+    @timed("rank_resumes")
+    def rank_resumes(self, resumes: List[Dict[str, Any]], job_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Scores many parsed resumes against one analyzed job, best first; the
+        mirror of rank_jobs. The job is encoded once and every resume line
+        goes through a single similarity product. Each entry is a
+        compute_score result plus "index", the resume's position in `resumes`.
+        """
+        if not resumes:
+            return []
+        job_skills = job_data.get("required_skills", [])
+        job_skill_ids = job_data.get("required_skill_ids", [])
+        by_table = [bool(job_skill_ids and resume.get("skill_ids")) for resume in resumes]
+        table_scores = self.taxonomy.similarity_to_many(
+            [resume.get("skill_ids", []) if use else [] for resume, use in zip(resumes, by_table)], job_skill_ids
+        )
+        semantic_skill, exp_scores = self._semantic_scores_per_resume(resumes, job_data, by_table)
+
+        ranked = []
+        for i, resume in enumerate(resumes):
+            skill_score = table_scores[i] if by_table[i] else semantic_skill[i]
+            keyword_score = self._calculate_keyword_match(resume.get("raw_text", ""), job_skills)
+            result = self._score(float(skill_score), float(exp_scores[i]), keyword_score)
+            result["index"] = i
+            ranked.append(result)
+        ranked.sort(key=lambda r: -r["overall_match"])  # stable: ties keep upload order
+        return ranked
+
+    def _semantic_scores_per_resume(self, resumes: List[Dict[str, Any]], job_data: Dict[str, Any],
+                                    by_table: List[bool]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Embedding-based skill and experience scores of every resume from one
+        matrix product: (job skill lines | job responsibility lines) x (all
+        resume lines). A max per resume column segment gives each job line
+        its best line in that resume; the mean over the job lines gives the
+        score.
+        """
+        job_skills = job_data.get("required_skills", [])
+        job_resp = job_data.get("responsibilities", [])
+        skill_scores = np.zeros(len(resumes), dtype="float64")
+        exp_scores = np.zeros(len(resumes), dtype="float64")
+
+        lines: List[str] = []
+        segments: List[Tuple[np.ndarray, int, int]] = []  # (target scores, resume index, block: 0 skills / 1 experience)
+        starts: List[int] = []
+        for i, resume in enumerate(resumes):
+            resume_skills = resume.get("skills", [])
+            if not by_table[i] and job_skills and resume_skills:
+                starts.append(len(lines))
+                lines.extend(resume_skills)
+                segments.append((skill_scores, i, 0))
+            resume_exp = resume.get("experience", [])
+            if job_resp and resume_exp:
+                starts.append(len(lines))
+                lines.extend(resume_exp)
+                segments.append((exp_scores, i, 1))
+        if not segments:
+            return skill_scores, exp_scores
+
+        job_vectors = self._normalize_rows(self.embedder.encode(job_skills + job_resp))
+        resume_vectors, positions = self._encode_unique(lines)
+        similarities = job_vectors @ resume_vectors.T
+
+        # (job lines, segments): each job line's best match within each resume segment
+        best = np.maximum.reduceat(similarities[:, positions], starts, axis=1)
+        split = len(job_skills)
+        means = (best[:split].mean(axis=0) if split else None, best[split:].mean(axis=0) if job_resp else None)
+        for column, (target, i, block) in enumerate(segments):
+            target[i] = max(0.0, float(means[block][column]))
+        return skill_scores, exp_scores
+
+    def _encode_unique(self, lines: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Unit vectors of the distinct lines, plus each line's row among them:
+        pools of resumes or postings repeat a lot of boilerplate, and every
+        row saved is saved in the encode and in the matrix product.
+        """
+        rows: Dict[str, int] = {}
+        positions = np.array([rows.setdefault(line, len(rows)) for line in lines])
+        return self._normalize_rows(self.embedder.encode(list(rows))), positions
+
+    def _keyword_scores_many(self, text: str, keyword_lists: List[List[str]]) -> List[float]:
+        """compute_score's keyword component for every job, from one scan with the union of their keywords."""
+        union = list(dict.fromkeys(kw for keywords in keyword_lists for kw in keywords))
+        hits = self._cached_matcher(self._catalog_matchers, union).find(text) if union else {}
+        return [sum(1 for kw in keywords if kw in hits) / len(keywords) if keywords else 0.0
+                for keywords in keyword_lists]
+
     def _calculate_semantic_similarity_list(self, list_a: List[str], list_b: List[str]) -> float:
         """
         Calculates average max similarity: for each item in list_b (job reqs),
@@ -61,26 +246,46 @@ class MatchingEngine:
         if not list_a or not list_b:
             return 0.0
             
-        # Embed all items
-        # SentenceTransformers.encode can take a list
-        embeddings_a = self.embedder.model.encode(list_a, convert_to_tensor=True)
-        embeddings_b = self.embedder.model.encode(list_b, convert_to_tensor=True)
+        # Embed all items in one call (cached, only unseen lines hit the model)
+        embeddings = self.embedder.encode(list_a + list_b)
+        embeddings_a, embeddings_b = embeddings[:len(list_a)], embeddings[len(list_a):]
         
         # Compute cosine similarity matrix
-        # tensor of shape (len(list_b), len(list_a))
+        # shape (len(list_b), len(list_a))
         # cosine_scores[i][j] = similarity between list_b[i] and list_a[j]
-        cosine_scores = util.cos_sim(embeddings_b, embeddings_a)
+        cosine_scores = self._normalize_rows(embeddings_b) @ self._normalize_rows(embeddings_a).T
         
         # For each item in B (Job), find max similarity in A (Resume)
         # We want to know: "For each job requirement, how well does the resume meet it?"
-        max_scores_per_req, _ = cosine_scores.max(dim=1)
+        max_scores_per_req = cosine_scores.max(axis=1)
         
         # Average the scores
-        average_score = max_scores_per_req.mean().item()
+        average_score = float(max_scores_per_req.mean())
         
         # Normalize to 0-1 (cosine sim is -1 to 1, but usually positive for text)
         return max(0.0, average_score)
 
+    @staticmethod
+    def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.maximum(norms, 1e-12)
+
+    def keyword_matcher(self, keywords: List[str]) -> KeywordMatcher:
+        return self._cached_matcher(self._keyword_matchers, keywords)
+
+    @staticmethod
+    def _cached_matcher(cache: LRUCache, keywords: List[str]) -> KeywordMatcher:
+        key = tuple(keywords)
+        matcher = cache.get(key)
+        if matcher is None:
+            matcher = KeywordMatcher(keywords)
+            cache.set(key, matcher)
+        return matcher
+
+    def find_keywords(self, text: str, keywords: List[str]) -> Dict[str, List[int]]:
+        """Character offsets of every whole-word, case-insensitive keyword hit in text."""
+        return self.keyword_matcher(keywords).find(text)
+
     def _calculate_keyword_match(self, text: str, keywords: List[str]) -> float:
         """
         Score based on fraction of keywords present in text.
@@ -88,12 +293,8 @@ class MatchingEngine:
         if not keywords:
             return 0.0
             
-        text_lower = text.lower()
-        found_count = 0
-        for kw in keywords:
-            # Simple substring match (could be improved with regex boundary)
-            if kw.lower() in text_lower:
-                found_count += 1
+        hits = self.find_keywords(text, keywords)
+        found_count = sum(1 for kw in keywords if kw in hits)
                 
         return found_count / len(keywords)
 
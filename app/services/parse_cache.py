@@ -0,0 +1,33 @@
+import copy
+from typing import Any, Dict, Optional
+from app.core.config import settings
+from app.services.resume_parser import PARSER_VERSION
+from app.utils.cache import LRUCache
+
+class ParseCache:
+    """
+    Bounded LRU+TTL cache of structured parse results, keyed by the SHA-256
+    of the uploaded bytes plus the parser version, so re-uploads of the same
+    file skip pdfplumber/docx and section extraction.
+    Entries are deep-copied in and out, so concurrent requests never share
+    (or mutate) the same dict.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache = LRUCache(maxsize=maxsize, ttl=ttl)
+
+    @staticmethod
+    def key(content_sha256: str, content_type: str) -> str:
+        return f"{PARSER_VERSION}:{content_type}:{content_sha256}"
+
+    def get(self, content_sha256: str, content_type: str) -> Optional[Dict[str, Any]]:
+        parsed = self._cache.get(self.key(content_sha256, content_type))
+        return copy.deepcopy(parsed) if parsed is not None else None
+
+    def set(self, content_sha256: str, content_type: str, parsed: Dict[str, Any]) -> None:
+        self._cache.set(self.key(content_sha256, content_type), copy.deepcopy(parsed))
+
+    def stats(self) -> Dict[str, Any]:
+        return self._cache.stats()
+
+parse_cache = ParseCache(settings.PARSE_CACHE_SIZE, settings.PARSE_CACHE_TTL_SECONDS)
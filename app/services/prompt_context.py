@@ -0,0 +1,167 @@
+import logging
+import math
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+from app.core.config import settings
+from app.services.job_analyzer import job_analyzer
+
+logger = logging.getLogger(__name__)
+
+GAP_MARKER = "\n[...]\n"  # between non-adjacent resume chunks
+
+_encoding = None
+
+
+def count_tokens(text: str) -> int:
+    """
+    Prompt tokens for `text`: exact with tiktoken installed, otherwise the
+    usual ~4 characters per token estimate.
+    """
+    global _encoding
+    if _encoding is None:
+        try:
+            import tiktoken
+            try:
+                _encoding = tiktoken.encoding_for_model(settings.OPENAI_MODEL)
+            except KeyError:
+                _encoding = tiktoken.get_encoding("cl100k_base")
+        except ImportError:
+            _encoding = False
+    if _encoding:
+        return len(_encoding.encode(text))
+    return math.ceil(len(text) / 4)
+
+
+class PromptContextBuilder:
+    """
+    Fits a resume and a job description into a token budget for the LLM.
+
+    The job side is reduced to its extracted requirements, nice-to-haves and
+    responsibilities (in that priority). The resume is split with
+    EmbeddingService.chunk_text and the chunks most similar to those
+    requirements are kept, in their original order, until the budget is
+    spent. Without a usable model it keeps the leading chunks instead.
+    """
+
+    def build(self, resume_text: str, job_description: str, budget: int, extra_queries: Sequence[str] = (),
+              keep_first: bool = False) -> Tuple[str, str]:
+        """
+        Returns (job context, resume context) totalling at most `budget`
+        tokens. The job gets up to PROMPT_JOB_SHARE of it; whatever it leaves
+        unused goes to the resume.
+        """
+        job_text = self.job_context(job_description, int(budget * settings.PROMPT_JOB_SHARE))
+        resume_budget = max(0, budget - count_tokens(job_text))
+        queries = self.requirement_lines(job_description) + list(extra_queries)
+        return job_text, self.resume_context(resume_text, queries, resume_budget, keep_first=keep_first)
+
+    def requirement_lines(self, job_description: str) -> List[str]:
+        job = job_analyzer.analyze(job_description)
+        lines = job.get("required_skills", []) + job.get("preferred_skills", []) + job.get("responsibilities", [])
+        return list(dict.fromkeys(line.strip() for line in lines if line.strip() and not line.strip().endswith(":")))
+
+    def job_context(self, job_description: str, budget: int) -> str:
+        job = job_analyzer.analyze(job_description)
+        groups = (
+            ("Requirements", job.get("required_skills", [])),
+            ("Nice to have", job.get("preferred_skills", [])),
+            ("Responsibilities", job.get("responsibilities", []))
+        )
+
+        seen = set()
+        blocks = []
+        used = 0
+        for title, lines in groups:
+            block = []
+            header_tokens = count_tokens(f"{title}:\n")
+            for line in lines:
+                line = line.strip()
+                # Skip repeats and header-like lines that leaked into a section
+                if not line or line.endswith(":") or line.lower() in seen:
+                    continue
+                cost = count_tokens(f"- {line}\n") + (0 if block else header_tokens)
+                if used + cost > budget:
+                    break
+                seen.add(line.lower())
+                block.append(f"- {line}")
+                used += cost
+            if block:
+                blocks.append(f"{title}:\n" + "\n".join(block))
+
+        if blocks:
+            return "\n".join(blocks)
+        # No recognizable sections: the opening of the posting
+        return self._pack_leading(self._chunks(job_description), budget)
+
+    def resume_context(self, resume_text: str, queries: Sequence[str], budget: int, keep_first: bool = False) -> str:
+        """
+        Most relevant resume chunks for `queries` within `budget` tokens.
+        keep_first always includes the opening chunk (summary / headline).
+        """
+        chunks = self._chunks(resume_text)
+        if not chunks:
+            return ""
+        costs = [count_tokens(chunk) for chunk in chunks]
+        if sum(costs) <= budget:
+            return resume_text.strip()
+
+        scores = self._relevance(chunks, [q for q in queries if q.strip()])
+        if scores is None:
+            return self._pack_leading(chunks, budget)
+
+        gap = count_tokens(GAP_MARKER)  # charged per chunk: an upper bound on the separators
+        order = sorted(range(len(chunks)), key=lambda i: -scores[i])
+        if keep_first:
+            order.remove(0)
+            order.insert(0, 0)
+
+        selected = []
+        used = 0
+        for i in order:
+            if used + costs[i] + gap <= budget:
+                selected.append(i)
+                used += costs[i] + gap
+        return self._join(chunks, sorted(selected))
+
+    def _chunks(self, text: str) -> List[str]:
+        from app.services.embedding_service import embedding_service
+        # No overlap: adjacent chunks then concatenate back to the original text
+        return embedding_service.chunk_text(text.strip(), chunk_size=settings.PROMPT_CHUNK_CHARS, overlap=0)
+
+    def _relevance(self, chunks: List[str], queries: List[str]) -> Optional[np.ndarray]:
+        """Per chunk, the best cosine similarity to any query; None if there is nothing to rank by."""
+        if not queries:
+            return None
+        from app.services.embedding_service import embedding_service
+        try:
+            vectors = np.asarray(embedding_service.encode(chunks + queries), dtype="float32")
+        except Exception as e:
+            logger.warning(f"Prompt context falls back to leading chunks: {e}")
+            return None
+        vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        return (vectors[:len(chunks)] @ vectors[len(chunks):].T).max(axis=1)
+
+    def _pack_leading(self, chunks: List[str], budget: int) -> str:
+        selected = []
+        used = 0
+        for i, chunk in enumerate(chunks):
+            cost = count_tokens(chunk)
+            if used + cost > budget:
+                break
+            selected.append(i)
+            used += cost
+        return self._join(chunks, selected)
+
+    @staticmethod
+    def _join(chunks: List[str], indices: List[int]) -> str:
+        parts = []
+        previous = None
+        for i in indices:
+            if previous is not None:
+                parts.append("" if i == previous + 1 else GAP_MARKER)
+            parts.append(chunks[i])
+            previous = i
+        return "".join(parts).strip()
+
+
+prompt_context = PromptContextBuilder()
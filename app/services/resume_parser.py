@@ -1,27 +1,56 @@
+import io
 import os
 import shutil
 import re
-from typing import Dict, Any, List
+from typing import Dict, Any, BinaryIO, List, Union
 from fastapi import UploadFile, HTTPException
-import pdfplumber
-import docx
+from app.core.metrics import timed
+from app.services.skill_taxonomy import skill_taxonomy
+from app.utils.text import normalize_whitespace
+
+# Section headers: a line holding only one of these (plus whitespace / colons)
+SECTION_HEADERS = {
+    "experience": r"experience|employment|work history",
+    "education": r"education|academic|qualifications",
+    "skills": r"skills|technologies|technical skills",
+    "certifications": r"certifications?|licenses?"
+}
+
+# One alternation for every section, scanned once; headers never span lines,
+# so matches of different sections cannot overlap. Anchoring on a literal
+# newline (rather than ^) lets the regex engine skip ahead between lines;
+# the text is scanned with a newline prepended so line 1 is covered too.
+_HEADER_RE = re.compile(
+    r"(?i)\n[^\S\n]*(?:" + "|".join(f"(?P<{name}>{words})" for name, words in SECTION_HEADERS.items()) + r")[\s:]*$",
+    re.MULTILINE
+)
+
+# Part of the parse-cache key: bump whenever the structure of parse() output changes
+PARSER_VERSION = "2"
 
 class ResumeParser:
     def __init__(self):
         pass
 
-    def extract_text(self, file_path: str, content_type: str) -> str:
-        """Extracts raw text from PDF or DOCX."""
+    @timed("extract_text")
+    def extract_text(self, source: Union[str, bytes, BinaryIO], content_type: str) -> str:
+        """
+        Extracts raw text from PDF or DOCX.
+        `source` is a file path, the raw bytes, or a binary file-like object.
+        """
         text = ""
+        document = io.BytesIO(source) if isinstance(source, (bytes, bytearray)) else source
         try:
             if content_type == "application/pdf":
-                with pdfplumber.open(file_path) as pdf:
+                import pdfplumber
+                with pdfplumber.open(document) as pdf:
                     for page in pdf.pages:
                         extracted = page.extract_text()
                         if extracted:
                             text += extracted + "\n"
             elif content_type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
-                doc = docx.Document(file_path)
+                import docx
+                doc = docx.Document(document)
                 for para in doc.paragraphs:
                     text += para.text + "\n"
             else:
@@ -29,27 +58,20 @@ class ResumeParser:
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Failed to extract text: {str(e)}")
         
-        return self._normalize_whitespace(text)
-
-    def _normalize_whitespace(self, text: str) -> str:
-        """Cleans up extra spaces and newlines."""
-        # Replace non-breaking spaces
-        text = text.replace('\xa0', ' ')
-        # Replace multiple spaces (not newlines) with single space
-        text = re.sub(r'[ \t]+', ' ', text)
-        # Replace multiple newlines with single newline
-        text = re.sub(r'\n+', '\n', text)
-        return text.strip()
+        return normalize_whitespace(text)
 
-    def parse(self, file_path: str, content_type: str) -> Dict[str, Any]:
-        """Main entry point to parse resume file into structured data."""
-        raw_text = self.extract_text(file_path, content_type)
+    def parse(self, source: Union[str, bytes, BinaryIO], content_type: str) -> Dict[str, Any]:
+        """Main entry point to parse resume file (path, bytes or stream) into structured data."""
+        raw_text = self.extract_text(source, content_type)
         
         structured_data = self._extract_sections(raw_text)
+        # Skills are mentioned all over a resume (experience, projects), not just under "Skills"
+        structured_data["skill_ids"] = skill_taxonomy.extract(raw_text)
         structured_data["raw_text"] = raw_text
         
         return structured_data
 
+    @timed("extract_sections")
     def _extract_sections(self, text: str) -> Dict[str, List[str]]:
         """
         Heuristic-based section extraction using Regex.
@@ -62,22 +84,15 @@ class ResumeParser:
             "certifications": []
         }
         
-        # Define keywords for sections
-        # Use multiline mode to match headers that are on their own lines
-        patterns = {
-            "experience": r"(?im)^[\s]*(experience|employment|work history)[\s:]*$",
-            "education": r"(?im)^[\s]*(education|academic|qualifications)[\s:]*$",
-            "skills": r"(?im)^[\s]*(skills|technologies|technical skills)[\s:]*$",
-            "certifications": r"(?im)^[\s]*(certifications?|licenses?)[\s:]*$"
-        }
-        
-        # Find all header positions
+        # Find all header positions in one scan; the named group says which section
         matches = []
-        for key, pattern in patterns.items():
-            for match in re.finditer(pattern, text):
-                matches.append((match.start(), key))
-                
-        matches.sort()
+        last_end = {}
+        for match in _HEADER_RE.finditer("\n" + text):
+            section_name = match.lastgroup
+            # Offsets are shifted by the prepended newline
+            start_idx = self._header_start(text, match.start(section_name) - 1, last_end.get(section_name, 0))
+            last_end[section_name] = match.end() - 1
+            matches.append((start_idx, section_name))
         
         # If no sections found, return empty
         if not matches:
@@ -110,5 +125,19 @@ class ResumeParser:
             
         return sections
 
+    @staticmethod
+    def _header_start(text: str, word_start: int, floor: int) -> int:
+        """
+        Where a per-section `^[\\s]*header` search would have started its match:
+        the earliest line start in the whitespace run before the header word,
+        but not before the previous header of the same section ended.
+        """
+        run_start = word_start
+        while run_start > floor and text[run_start - 1].isspace():
+            run_start -= 1
+        if run_start == 0 or text[run_start - 1] == '\n':
+            return run_start
+        return text.index('\n', run_start) + 1
+
 
 resume_parser = ResumeParser()
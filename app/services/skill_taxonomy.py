@@ -0,0 +1,190 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import numpy as np
+from typing import Any, Dict, List, Optional
+from app.core.config import settings
+from app.utils.keywords import KeywordMatcher
+
+logger = logging.getLogger(__name__)
+
+
+class SkillTaxonomy:
+    """
+    Canonical skill vocabulary (app/data/skills.json) used to map free text to
+    skill ids ("k8s", "EKS" -> kubernetes), plus a memory-mapped .npy table
+    holding one unit-length embedding per skill. Comparing two skill sets is a
+    row lookup and one small matrix product; no model call on the request path.
+
+    The JSON and the alias automaton are loaded on first use (cheap); the
+    table is only needed for scoring and is built once if missing or stale.
+    """
+
+    def __init__(self, taxonomy_path: str, table_path: str):
+        self.taxonomy_path = taxonomy_path
+        self.table_path = table_path
+        self._skills: Optional[List[Dict[str, Any]]] = None
+        self._rows: Dict[str, int] = {}
+        self._alias_to_id: Dict[str, str] = {}
+        self._matcher: Optional[KeywordMatcher] = None
+        self._table: Optional[np.ndarray] = None
+        self._lock = threading.RLock()
+
+    # --- vocabulary -----------------------------------------------------------
+
+    @property
+    def skills(self) -> List[Dict[str, Any]]:
+        if self._skills is None:
+            with self._lock:
+                if self._skills is None:
+                    with open(self.taxonomy_path, "r", encoding="utf-8") as f:
+                        skills = json.load(f)["skills"]
+                    self._rows = {skill["id"]: row for row, skill in enumerate(skills)}
+                    self._alias_to_id = {
+                        alias: skill["id"] for skill in skills for alias in skill["aliases"]
+                    }
+                    self._matcher = KeywordMatcher(self._alias_to_id)
+                    self._skills = skills
+        return self._skills
+
+    def name(self, skill_id: str) -> str:
+        return self.skills[self._rows[skill_id]]["name"]
+
+    def extract(self, text: str) -> List[str]:
+        """
+        Skill ids mentioned in text, in order of first mention. Where aliases
+        overlap the longest wins ("React Native" is not also "React").
+        """
+        self.skills  # load
+        spans = sorted(self._matcher.find_spans(text), key=lambda span: (span[0], -span[1]))
+        found: Dict[str, None] = {}
+        covered = 0
+        for start, end, alias in spans:
+            if start < covered:
+                continue
+            covered = end
+            found.setdefault(self._alias_to_id[alias], None)
+        return list(found)
+
+    def extract_lines(self, lines: List[str]) -> List[str]:
+        # The separator is not a vocabulary token, so aliases never match across lines
+        return self.extract("\n|\n".join(lines))
+
+    # --- embedding table ------------------------------------------------------
+
+    def _table_meta(self) -> Dict[str, Any]:
+        from app.services.embedding_service import embedding_service
+        vocabulary = json.dumps([[skill["id"], skill["name"]] for skill in self.skills])
+        return {
+            "namespace": embedding_service.cache.model_name,
+            "taxonomy_sha256": hashlib.sha256(vocabulary.encode("utf-8")).hexdigest(),
+            "dimension": embedding_service.dimension,
+            "count": len(self.skills)
+        }
+
+    def _meta_path(self, table_path: str) -> str:
+        return os.path.splitext(table_path)[0] + ".json"
+
+    @property
+    def table(self) -> np.ndarray:
+        """(n_skills, dim) float32 unit vectors, memory-mapped read-only."""
+        if self._table is None:
+            with self._lock:
+                if self._table is None:
+                    self._table = self._load_table()
+        return self._table
+
+    def _load_table(self) -> np.ndarray:
+        expected = self._table_meta()
+        meta_path = self._meta_path(self.table_path)
+        current = None
+        if os.path.exists(self.table_path) and os.path.exists(meta_path):
+            with open(meta_path, "r") as f:
+                current = json.load(f)
+        if current != expected:
+            logger.info("Skill embedding table missing or stale, building it")
+            self.build_table()
+        return np.load(self.table_path, mmap_mode="r")
+
+    def build_table(self, path: Optional[str] = None) -> str:
+        """Encodes every canonical skill name once and writes the .npy table + its manifest."""
+        from app.services.embedding_service import embedding_service
+        path = path or self.table_path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        vectors = np.asarray(embedding_service.encode([skill["name"] for skill in self.skills]), dtype="float32")
+        vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+
+        # Written under temporary names first so a crash never leaves a torn table
+        with open(path + ".tmp", "wb") as f:
+            np.save(f, vectors)
+        with open(self._meta_path(path) + ".tmp", "w") as f:
+            json.dump(self._table_meta(), f, indent=2)
+        os.replace(path + ".tmp", path)
+        os.replace(self._meta_path(path) + ".tmp", self._meta_path(path))
+        return path
+
+    # --- scoring --------------------------------------------------------------
+
+    def similarity(self, resume_ids: List[str], job_ids: List[str]) -> float:
+        """
+        For each job skill the closest resume skill (cosine), averaged;
+        an exact id match counts 1.0.
+        """
+        self.skills  # load
+        job_rows = [self._rows[i] for i in job_ids if i in self._rows]
+        resume_rows = [self._rows[i] for i in resume_ids if i in self._rows]
+        if not job_rows or not resume_rows:
+            return 0.0
+
+        table = self.table
+        scores = table[job_rows] @ table[resume_rows].T
+        return max(0.0, float(scores.max(axis=1).mean()))
+
+    def similarity_many(self, resume_ids: List[str], job_ids_list: List[List[str]]) -> np.ndarray:
+        """
+        similarity(resume_ids, job_ids) for each job, from one product of all
+        jobs' skill rows with the resume's, then a mean per job.
+        """
+        self.skills  # load
+        scores = np.zeros(len(job_ids_list), dtype="float64")
+        resume_rows = [self._rows[i] for i in resume_ids if i in self._rows]
+        job_rows = [[self._rows[i] for i in job_ids if i in self._rows] for job_ids in job_ids_list]
+        scored = [j for j, rows in enumerate(job_rows) if rows]
+        if not resume_rows or not scored:
+            return scores
+
+        table = self.table
+        rows = [row for j in scored for row in job_rows[j]]
+        best = (table[rows] @ table[resume_rows].T).max(axis=1)
+        counts = np.array([len(job_rows[j]) for j in scored])
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        scores[scored] = np.maximum(0.0, np.add.reduceat(best, starts) / counts)
+        return scores
+
+    def similarity_to_many(self, resume_ids_list: List[List[str]], job_ids: List[str]) -> np.ndarray:
+        """
+        similarity(resume_ids, job_ids) for each resume, from one product of
+        the job's skill rows with all resumes' rows, then a max per resume.
+        """
+        self.skills  # load
+        scores = np.zeros(len(resume_ids_list), dtype="float64")
+        job_rows = [self._rows[i] for i in job_ids if i in self._rows]
+        resume_rows = [[self._rows[i] for i in ids if i in self._rows] for ids in resume_ids_list]
+        scored = [r for r, rows in enumerate(resume_rows) if rows]
+        if not job_rows or not scored:
+            return scores
+
+        table = self.table
+        rows = [row for r in scored for row in resume_rows[r]]
+        starts = np.concatenate(([0], np.cumsum([len(resume_rows[r]) for r in scored])[:-1]))
+        best = np.maximum.reduceat(table[job_rows] @ table[rows].T, starts, axis=1)
+        scores[scored] = np.maximum(0.0, best.mean(axis=0))
+        return scores
+
+
+skill_taxonomy = SkillTaxonomy(settings.SKILL_TAXONOMY_PATH, settings.SKILL_EMBEDDINGS_PATH)
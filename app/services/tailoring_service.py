@@ -1,13 +1,253 @@
-from typing import List, Dict, Any
+from typing import AsyncIterator, Callable, List, Dict, Any, Optional, Tuple
+import asyncio
 import json
-from openai import OpenAI
+import random
+import threading
+import time
+from app.core.concurrency import run_in_compute_pool, run_in_io_pool
 from app.core.config import settings
+from app.core.metrics import llm_fallbacks, record_stage, stage_timer, timed
+from app.services.llm_cache import LLMResponseCache
+from app.services.prompt_context import count_tokens, prompt_context
+from app.utils.json_stream import JSONArrayStream
+
+SUGGESTIONS_SYSTEM_MESSAGE = "You are an expert career coach and resume writer. Provide specific, actionable suggestions in JSON format."
+REFINE_SYSTEM_MESSAGE = "You are an expert professional resume writer. Rewrite the resume content to be more impactful and relevant to the job description. Output purely JSON."
+
+SUGGESTIONS_PROMPT = """
+You are an expert career coach and resume writer.
+I will provide you with a Resume and a Job Description.
+Your goal is to provide specific, actionable suggestions to tailor the resume for this job.
+
+### Job Description
+{job}
+
+### Resume
+{resume}
+
+### Missing Skills Detected
+{missing}
+
+### Instructions
+1. Analyze the gap between the resume and the job description.
+2. Provide 3 specific suggestions to improve the resume.
+3. Suggestions should not fabricate experience, but highlight relevant existing experience.
+4. Output MUST be in valid JSON format:
+[
+  {{
+    "section": "Target Section (e.g., Skills, Experience)",
+    "suggestion": "Actionable advice...",
+    "justification": "Why this matters..."
+  }}
+]
+"""
+
+REFINE_PROMPT = """
+You are an expert resume writer.
+I will provide a Resume and a Job Description.
+Rewrite the "Professional Summary" and improve 3 key "Experience" bullet points to better match the job description.
+
+### Job Description
+{job}
+
+### Resume
+{resume}
+
+### Instructions
+1. Rewrite the **Professional Summary** to highlight relevant skills and experience for this specific job.
+2. Select 3 existing experience bullet points and rewrite them to be more results-oriented and relevant to the job.
+3. Output MUST be in valid JSON format with these exact keys:
+{{
+  "summary": "Rewritten summary text...",
+  "experience": "Markdown list of 3 rewritten bullet points..."
+}}
+"""
 
 class TailoringService:
     def __init__(self):
-        self.client = None
-        if settings.OPENAI_API_KEY:
-            self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
+        # Blocking client, created on first use: openai/httpx stay unimported until a completion is needed
+        self._client = None
+        self._client_lock = threading.Lock()
+            
+        # Async client + concurrency cap, created lazily on the serving event loop
+        self._async_client = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._response_cache: Optional[LLMResponseCache] = None
+
+    @property
+    def client(self):
+        """The blocking OpenAI client; None when no API key is configured."""
+        if self._client is None and settings.OPENAI_API_KEY:
+            with self._client_lock:
+                if self._client is None:
+                    from openai import OpenAI
+                    self._client = OpenAI(
+                        api_key=settings.OPENAI_API_KEY,
+                        base_url=settings.OPENAI_BASE_URL or None,
+                        timeout=settings.LLM_TIMEOUT_SECONDS
+                    )
+        return self._client
+
+    @client.setter
+    def client(self, client) -> None:
+        self._client = client
+
+    def _temperature(self) -> float:
+        # Deterministic mode: identical prompts get identical answers, so a cached answer is the answer
+        return 0.0 if settings.LLM_DETERMINISTIC else 0.7
+
+    def _cache_active(self) -> bool:
+        # Sampled answers (temperature > 0) are not cached: replaying one would
+        # hand every retry the same draw instead of a fresh answer
+        return settings.LLM_CACHE_ENABLED and self._temperature() == 0.0
+
+    @property
+    def response_cache(self) -> Optional[LLMResponseCache]:
+        """The persistent completion cache, opened on first use; None when disabled or not deterministic."""
+        if not self._cache_active():
+            return None
+        if self._response_cache is None:
+            self._response_cache = LLMResponseCache(
+                settings.LLM_CACHE_PATH,
+                ttl_seconds=settings.LLM_CACHE_TTL_SECONDS,
+                max_entries=settings.LLM_CACHE_MAX_ENTRIES
+            )
+        return self._response_cache
+
+    def _cache_lookup(self, system_message: str, prompt: str, max_tokens: int) -> Tuple[Optional[str], Optional[str]]:
+        """Returns (cache key, cached completion text); (None, None) when caching is off."""
+        cache = self.response_cache
+        if cache is None:
+            return None, None
+        key = LLMResponseCache.make_key(settings.OPENAI_MODEL, self._temperature(), system_message, prompt, max_tokens)
+        return key, cache.get(key)
+
+    def _cache_store(self, key: Optional[str], text: str, cache_if: Optional[Callable[[str], bool]]) -> None:
+        # Only answers the caller could use are kept; a malformed one is worth asking again
+        if key is not None and (cache_if is None or cache_if(text)):
+            self.response_cache.set(key, text)
+
+    async def _acache_lookup(self, system_message: str, prompt: str,
+                             max_tokens: int) -> Tuple[Optional[str], Optional[str]]:
+        """_cache_lookup off the event loop: SQLite calls (a disk hit records its access time) can wait on other writers."""
+        if not self._cache_active():
+            return None, None
+        return await run_in_io_pool(self._cache_lookup, system_message, prompt, max_tokens)
+
+    async def _acache_store(self, key: Optional[str], text: str, cache_if: Optional[Callable[[str], bool]]) -> None:
+        if key is not None:
+            await run_in_io_pool(self._cache_store, key, text, cache_if)
+
+    def cache_stats(self) -> Optional[Dict[str, Any]]:
+        # Reporting alone should not create the database; None until first used
+        cache = self._response_cache
+        return cache.stats() if cache is not None else None
+
+    def _async_state(self):
+        """Returns (client, semaphore) bound to the running loop; one shared connection pool per loop."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            import httpx
+            from openai import AsyncOpenAI
+            http_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=settings.LLM_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.LLM_MAX_CONNECTIONS
+                ),
+                timeout=settings.LLM_TIMEOUT_SECONDS
+            )
+            self._async_client = AsyncOpenAI(
+                api_key=settings.OPENAI_API_KEY,
+                base_url=settings.OPENAI_BASE_URL or None,
+                http_client=http_client,
+                max_retries=0  # Retries are budgeted below, inside the deadline
+            )
+            self._semaphore = asyncio.Semaphore(settings.LLM_MAX_CONCURRENCY)
+            self._loop = loop
+        return self._async_client, self._semaphore
+
+    async def _acomplete(self, system_message: str, prompt: str, max_tokens: int,
+                         cache_if: Optional[Callable[[str], bool]] = None) -> Optional[str]:
+        """
+        Runs one chat completion under the concurrency cap with bounded,
+        jittered retries. Returns None when the deadline passes or the call
+        fails, so callers can fall back right away. Answers come from / go to
+        the response cache (stored only if cache_if accepts them).
+        """
+        if not settings.OPENAI_API_KEY:
+            return None
+            
+        key, cached = await self._acache_lookup(system_message, prompt, max_tokens)
+        if cached is not None:
+            return cached
+            
+        from openai import APIConnectionError, APITimeoutError, InternalServerError, RateLimitError
+        # Transient failures worth another attempt; anything else (auth, bad request) falls back immediately
+        retryable_errors = (APIConnectionError, APITimeoutError, InternalServerError, RateLimitError)
+        
+        client, semaphore = self._async_state()
+        
+        async def attempt_with_retries() -> str:
+            async with semaphore:
+                for attempt in range(settings.LLM_MAX_RETRIES + 1):
+                    try:
+                        response = await client.chat.completions.create(
+                            model=settings.OPENAI_MODEL,
+                            messages=[
+                                {"role": "system", "content": system_message},
+                                {"role": "user", "content": prompt}
+                            ],
+                            temperature=self._temperature(),
+                            max_tokens=max_tokens
+                        )
+                        return response.choices[0].message.content
+                    except retryable_errors:
+                        if attempt == settings.LLM_MAX_RETRIES:
+                            raise
+                        # Full jitter exponential backoff
+                        await asyncio.sleep(random.uniform(0, settings.LLM_RETRY_BACKOFF_SECONDS * (2 ** attempt)))
+                        
+        try:
+            with stage_timer("llm"):
+                text = await asyncio.wait_for(attempt_with_retries(), timeout=settings.LLM_TIMEOUT_SECONDS)
+            if text is not None:
+                await self._acache_store(key, text, cache_if)
+            return text
+        except asyncio.TimeoutError:
+            print(f"OpenAI API Error: deadline of {settings.LLM_TIMEOUT_SECONDS}s exceeded")
+        except Exception as e:
+            print(f"OpenAI API Error: {e}")
+        return None
+
+    def _complete(self, system_message: str, prompt: str, max_tokens: int,
+                  cache_if: Optional[Callable[[str], bool]] = None) -> Optional[str]:
+        """Blocking counterpart of _acomplete (no retries/deadline beyond the client timeout)."""
+        if not self.client:
+            return None
+            
+        key, cached = self._cache_lookup(system_message, prompt, max_tokens)
+        if cached is not None:
+            return cached
+            
+        try:
+            with stage_timer("llm"):
+                response = self.client.chat.completions.create(
+                    model=settings.OPENAI_MODEL,
+                    messages=[
+                        {"role": "system", "content": system_message},
+                        {"role": "user", "content": prompt}
+                    ],
+                    temperature=self._temperature(),
+                    max_tokens=max_tokens
+                )
+            text = response.choices[0].message.content
+            if text is not None:
+                self._cache_store(key, text, cache_if)
+            return text
+        except Exception as e:
+            print(f"OpenAI API Error: {e}")
+            return None
 
     def generate_suggestions(
         self, 
@@ -21,44 +261,180 @@ class TailoringService:
         prompt = self._build_prompt(resume_text, job_description, missing_skills)
         
         # If OpenAI API key is configured, use real AI
-        if self.client:
-            try:
-                response = self.client.chat.completions.create(
-                    model="gpt-3.5-turbo",
-                    messages=[
-                        {"role": "system", "content": "You are an expert career coach and resume writer. Provide specific, actionable suggestions in JSON format."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=0.7,
-                    max_tokens=500
-                )
-                
-                # Parse AI response
-                ai_text = response.choices[0].message.content
-                
-                # Try to extract JSON from response
-                try:
-                    # Look for JSON array in the response
-                    start = ai_text.find('[')
-                    end = ai_text.rfind(']') + 1
-                    if start != -1 and end > start:
-                        suggestions = json.loads(ai_text[start:end])
-                        return suggestions, prompt
-                except:
-                    pass
-                    
-                # If JSON parsing fails, create structured response from text
-                return self._parse_text_to_suggestions(ai_text), prompt
-                
-            except Exception as e:
-                print(f"OpenAI API Error: {e}")
-                # Fall back to mock if API fails
+        ai_text = self._complete(SUGGESTIONS_SYSTEM_MESSAGE, prompt, max_tokens=500, cache_if=self._is_suggestions_array)
+        if ai_text is not None:
+            return self._suggestions_from_text(ai_text), prompt
         
         # Fallback: Mocked response (when no API key or API fails)
-        mock_suggestions = [
+        llm_fallbacks.inc("suggestions")
+        return self._mock_suggestions(missing_skills), prompt
+
+    async def agenerate_suggestions(
+        self,
+        resume_text: str,
+        job_description: str,
+        missing_skills: List[str]
+    ) -> List[Dict[str, Any]]:
+        """
+        Async variant of generate_suggestions for the request path.
+        Falls back to the mock suggestions on deadline or API failure.
+        """
+        # Ranking resume chunks runs the embedding model: keep it off the event loop
+        prompt = await run_in_compute_pool(self._build_prompt, resume_text, job_description, missing_skills)
+        
+        ai_text = await self._acomplete(SUGGESTIONS_SYSTEM_MESSAGE, prompt, max_tokens=500, cache_if=self._is_suggestions_array)
+        if ai_text is not None:
+            return self._suggestions_from_text(ai_text), prompt
+            
+        llm_fallbacks.inc("suggestions")
+        return self._mock_suggestions(missing_skills), prompt
+
+    async def astream_suggestions(
+        self,
+        resume_text: str,
+        job_description: str,
+        missing_skills: List[str]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streaming variant of agenerate_suggestions: yields each suggestion as
+        soon as the model has finished writing it. Falls back like the
+        non-streaming path when nothing usable arrives.
+        """
+        prompt = await run_in_compute_pool(self._build_prompt, resume_text, job_description, missing_skills)
+        
+        array = JSONArrayStream()
+        emitted = 0
+        async for delta in self._astream(SUGGESTIONS_SYSTEM_MESSAGE, prompt, max_tokens=500, cache_if=self._is_suggestions_array):
+            for suggestion in array.feed(delta):
+                emitted += 1
+                yield suggestion
+                
+        if emitted or array.finished:
+            return
+        # Plain-text answer: structure it. Nothing, or a JSON array cut off
+        # before its first element (deadline/failure): mock suggestions.
+        if array.text.strip() and not array.started:
+            fallback = self._parse_text_to_suggestions(array.text)
+        else:
+            llm_fallbacks.inc("suggestions")
+            fallback = self._mock_suggestions(missing_skills)
+        for suggestion in fallback:
+            yield suggestion
+
+    async def _astream(self, system_message: str, prompt: str, max_tokens: int,
+                       cache_if: Optional[Callable[[str], bool]] = None) -> AsyncIterator[str]:
+        """
+        Streams completion text deltas under the same concurrency cap and
+        deadline as _acomplete. Retries only while nothing has been received
+        (a partial answer cannot be taken back); on deadline or failure the
+        stream just ends, leaving callers with whatever arrived. A cached
+        answer is replayed as one delta; a completed stream is cached.
+        """
+        if not settings.OPENAI_API_KEY:
+            return
+            
+        key, cached = await self._acache_lookup(system_message, prompt, max_tokens)
+        if cached is not None:
+            yield cached
+            return
+            
+        from openai import APIConnectionError, APITimeoutError, InternalServerError, RateLimitError
+        retryable_errors = (APIConnectionError, APITimeoutError, InternalServerError, RateLimitError)
+        
+        client, semaphore = self._async_state()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.LLM_TIMEOUT_SECONDS
+        
+        def remaining() -> float:
+            return max(0.0, deadline - loop.time())
+            
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(semaphore.acquire(), timeout=remaining())
+        except asyncio.TimeoutError:
+            print(f"OpenAI API Error: deadline of {settings.LLM_TIMEOUT_SECONDS}s exceeded")
+            record_stage("llm", time.perf_counter() - started)
+            return
+            
+        try:
+            for attempt in range(settings.LLM_MAX_RETRIES + 1):
+                received = []
+                stream = None
+                try:
+                    stream = await asyncio.wait_for(client.chat.completions.create(
+                        model=settings.OPENAI_MODEL,
+                        messages=[
+                            {"role": "system", "content": system_message},
+                            {"role": "user", "content": prompt}
+                        ],
+                        temperature=self._temperature(),
+                        max_tokens=max_tokens,
+                        stream=True
+                    ), timeout=remaining())
+                    chunks = stream.__aiter__()
+                    while True:
+                        try:
+                            chunk = await asyncio.wait_for(chunks.__anext__(), timeout=remaining())
+                        except StopAsyncIteration:
+                            await self._acache_store(key, "".join(received), cache_if)
+                            return
+                        delta = chunk.choices[0].delta.content if chunk.choices else None
+                        if delta:
+                            received.append(delta)
+                            yield delta
+                except retryable_errors as e:
+                    if received or attempt == settings.LLM_MAX_RETRIES:
+                        print(f"OpenAI API Error: {e}")
+                        return
+                    # Full jitter exponential backoff, still inside the deadline
+                    await asyncio.sleep(min(remaining(), random.uniform(0, settings.LLM_RETRY_BACKOFF_SECONDS * (2 ** attempt))))
+                except asyncio.TimeoutError:
+                    print(f"OpenAI API Error: deadline of {settings.LLM_TIMEOUT_SECONDS}s exceeded")
+                    return
+                except Exception as e:
+                    print(f"OpenAI API Error: {e}")
+                    return
+                finally:
+                    if stream is not None:
+                        await stream.close()
+        finally:
+            semaphore.release()
+            record_stage("llm", time.perf_counter() - started)
+
+    @staticmethod
+    def _is_suggestions_array(ai_text: str) -> bool:
+        # A complete array holding at least one suggestion object (the parser emits objects only)
+        array = JSONArrayStream()
+        return bool(array.feed(ai_text)) and array.finished
+
+    def _is_refined_json(self, ai_text: str) -> bool:
+        return self._refined_from_text(ai_text) is not None
+
+    def _suggestions_from_text(self, ai_text: str) -> List[Dict[str, Any]]:
+        """Extracts the JSON suggestions array, or structures free text."""
+        # Same incremental parser as the streaming path, fed the whole answer at once
+        array = JSONArrayStream()
+        suggestions = array.feed(ai_text)
+        if suggestions or array.finished:
+            return suggestions
+            
+        # If JSON parsing fails, create structured response from text
+        return self._parse_text_to_suggestions(ai_text)
+
+    def _mock_suggestions(self, missing_skills: List[str]) -> List[Dict[str, Any]]:
+        if not missing_skills:
+            return [
+                {
+                    "section": "Summary",
+                    "suggestion": "Emphasize your strong match in the professional summary.",
+                    "justification": "You have all required skills, so focus on leadership and impact."
+                }
+            ]
+            
+        return [
             {
                 "section": "Skills",
-                "suggestion": f"Add {', '.join(missing_skills[:3])} to your skills section." if missing_skills else "Emphasize your technical skills more prominently.",
+                "suggestion": f"Add {', '.join(missing_skills[:3])} to your skills section.",
                 "justification": "These are key requirements mentioned in the job description that are missing from your resume."
             },
             {
@@ -67,17 +443,6 @@ class TailoringService:
                 "justification": "Demonstrating practical application increases relevance score."
             }
         ]
-        
-        if not missing_skills:
-             mock_suggestions = [
-                {
-                    "section": "Summary",
-                    "suggestion": "Emphasize your strong match in the professional summary.",
-                    "justification": "You have all required skills, so focus on leadership and impact."
-                }
-            ]
-
-        return mock_suggestions, prompt
 
     def _parse_text_to_suggestions(self, text: str) -> List[Dict[str, Any]]:
         """Parse unstructured AI text into suggestion format"""
@@ -106,38 +471,16 @@ class TailoringService:
             "justification": "AI-generated recommendation"
         }]
 
+    @timed("prompt_build")
     def _build_prompt(self, resume_text: str, job_desc: str, missing_skills: List[str]) -> str:
         """
-        Constructs the prompt with context injection.
+        Constructs the prompt with context injection: the job requirements and
+        the resume chunks most relevant to them, within SUGGESTIONS_PROMPT_TOKENS.
         """
-        prompt = f"""
-You are an expert career coach and resume writer.
-I will provide you with a Resume and a Job Description.
-Your goal is to provide specific, actionable suggestions to tailor the resume for this job.
-
-### Job Description
-{job_desc[:1000]}... (truncated)
-
-### Resume
-{resume_text[:1000]}... (truncated)
-
-### Missing Skills Detected
-{', '.join(missing_skills) if missing_skills else 'None - good match!'}
-
-### Instructions
-1. Analyze the gap between the resume and the job description.
-2. Provide 3 specific suggestions to improve the resume.
-3. Suggestions should not fabricate experience, but highlight relevant existing experience.
-4. Output MUST be in valid JSON format:
-[
-  {{
-    "section": "Target Section (e.g., Skills, Experience)",
-    "suggestion": "Actionable advice...",
-    "justification": "Why this matters..."
-  }}
-]
-"""
-        return prompt.strip()
+        missing = ', '.join(missing_skills) if missing_skills else 'None - good match!'
+        budget = settings.SUGGESTIONS_PROMPT_TOKENS - count_tokens(SUGGESTIONS_PROMPT.format(job="", resume="", missing=missing))
+        job_context, resume_context = prompt_context.build(resume_text, job_desc, budget, extra_queries=missing_skills)
+        return SUGGESTIONS_PROMPT.format(job=job_context, resume=resume_context, missing=missing).strip()
 
     def refine_resume(
         self,
@@ -149,58 +492,56 @@ Your goal is to provide specific, actionable suggestions to tailor the resume fo
         """
         prompt = self._build_refine_prompt(resume_text, job_description)
         
-        if self.client:
-            try:
-                response = self.client.chat.completions.create(
-                    model="gpt-3.5-turbo",
-                    messages=[
-                        {"role": "system", "content": "You are an expert professional resume writer. Rewrite the resume content to be more impactful and relevant to the job description. Output purely JSON."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=0.7,
-                    max_tokens=1000
-                )
-                
-                ai_text = response.choices[0].message.content
-                
-                # Extract JSON
-                try:
-                    start = ai_text.find('{')
-                    end = ai_text.rfind('}') + 1
-                    if start != -1 and end > start:
-                        return json.loads(ai_text[start:end])
-                except Exception as e:
-                    print(f"JSON Parse Error: {e}")
-                    pass
-            except Exception as e:
-                print(f"OpenAI API Error: {e}")
+        ai_text = self._complete(REFINE_SYSTEM_MESSAGE, prompt, max_tokens=1000, cache_if=self._is_refined_json)
+        if ai_text is not None:
+            refined = self._refined_from_text(ai_text)
+            if refined is not None:
+                return refined
         
-        # Fallback
+        llm_fallbacks.inc("refine")
+        return self._refine_fallback()
+
+    async def arefine_resume(
+        self,
+        resume_text: str,
+        job_description: str
+    ) -> Dict[str, str]:
+        """
+        Async variant of refine_resume with deadline, retries and concurrency cap.
+        """
+        prompt = await run_in_compute_pool(self._build_refine_prompt, resume_text, job_description)
+        
+        ai_text = await self._acomplete(REFINE_SYSTEM_MESSAGE, prompt, max_tokens=1000, cache_if=self._is_refined_json)
+        if ai_text is not None:
+            refined = self._refined_from_text(ai_text)
+            if refined is not None:
+                return refined
+                
+        llm_fallbacks.inc("refine")
+        return self._refine_fallback()
+
+    def _refined_from_text(self, ai_text: str) -> Optional[Dict[str, str]]:
+        # Extract JSON
+        try:
+            start = ai_text.find('{')
+            end = ai_text.rfind('}') + 1
+            if start != -1 and end > start:
+                return json.loads(ai_text[start:end])
+        except Exception as e:
+            print(f"JSON Parse Error: {e}")
+        return None
+
+    def _refine_fallback(self) -> Dict[str, str]:
         return {
             "summary": "Could not generate refined summary. (API Error or Missing Key)",
             "experience": "Could not generate refined experience."
         }
 
+    @timed("prompt_build")
     def _build_refine_prompt(self, resume_text: str, job_desc: str) -> str:
-        return f"""
-You are an expert resume writer.
-I will provide a Resume and a Job Description.
-Rewrite the "Professional Summary" and improve 3 key "Experience" bullet points to better match the job description.
-
-### Job Description
-{job_desc[:1500]}
-
-### Resume
-{resume_text[:2000]}
-
-### Instructions
-1. Rewrite the **Professional Summary** to highlight relevant skills and experience for this specific job.
-2. Select 3 existing experience bullet points and rewrite them to be more results-oriented and relevant to the job.
-3. Output MUST be in valid JSON format with these exact keys:
-{{
-  "summary": "Rewritten summary text...",
-  "experience": "Markdown list of 3 rewritten bullet points..."
-}}
-"""
+        budget = settings.REFINE_PROMPT_TOKENS - count_tokens(REFINE_PROMPT.format(job="", resume=""))
+        # The opening chunk holds the summary being rewritten, so it is always kept
+        job_context, resume_context = prompt_context.build(resume_text, job_desc, budget, keep_first=True)
+        return REFINE_PROMPT.format(job=job_context, resume=resume_context)
 
 tailoring_service = TailoringService()
@@ -0,0 +1,197 @@
+import json
+import logging
+import os
+import threading
+import numpy as np
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE = "index.faiss"
+METADATA_FILE = "metadata.jsonl"
+MANIFEST_FILE = "manifest.json"
+
+INDEX_TYPES = ("flat", "hnsw", "ivf")
+
+
+class VectorStore:
+    """
+    FAISS index + metadata with cosine scoring.
+
+    Vectors are L2-normalized on the way in and searched by inner product, so
+    scores are cosine similarities (higher is better) for every index type:
+      flat -> exact IndexFlatIP
+      hnsw -> IndexHNSWFlat graph, no training
+      ivf  -> IndexIVFFlat; vectors are staged in a flat index until there are
+              enough of them (39 * nlist) to train the coarse quantizer
+    Ids are assigned sequentially in insertion order.
+    """
+
+    def __init__(self, dimension: int, index_type: str = "flat", hnsw_m: int = 32, hnsw_ef_search: int = 64,
+                 ivf_nlist: int = 256, ivf_nprobe: int = 16, namespace: str = ""):
+        if index_type not in INDEX_TYPES:
+            raise ValueError(f"Unknown index type: {index_type} (expected one of {INDEX_TYPES})")
+        self.dimension = dimension
+        self.index_type = index_type
+        self.hnsw_m = hnsw_m
+        self.hnsw_ef_search = hnsw_ef_search
+        self.ivf_nlist = ivf_nlist
+        self.ivf_nprobe = ivf_nprobe
+        self.namespace = namespace  # e.g. model@backend; vectors from another model are meaningless here
+
+        self.metadata: Dict[int, Dict[str, Any]] = {}
+        self._index = None
+        self._trained = index_type != "ivf"
+        self._mmap_path: Optional[str] = None  # set while the index is a read-only memory-mapped view
+        self.dirty = False  # added to since the last save/load
+        self._lock = threading.RLock()
+
+    # --- index construction -------------------------------------------------
+
+    def _new_index(self):
+        import faiss
+        if self.index_type == "hnsw":
+            index = faiss.IndexHNSWFlat(self.dimension, self.hnsw_m, faiss.METRIC_INNER_PRODUCT)
+            index.hnsw.efSearch = self.hnsw_ef_search
+            return index
+        # flat, and the staging index of an untrained ivf
+        return faiss.IndexFlatIP(self.dimension)
+
+    @property
+    def index(self):
+        if self._index is None:
+            with self._lock:
+                if self._index is None:
+                    self._index = self._new_index()
+        return self._index
+
+    @property
+    def ntotal(self) -> int:
+        return 0 if self._index is None else int(self._index.ntotal)
+
+    def _maybe_train_ivf(self):
+        if self._trained or self.ntotal < 39 * self.ivf_nlist:
+            return
+        import faiss
+        staged = self._index.reconstruct_n(0, self._index.ntotal)
+        quantizer = faiss.IndexFlatIP(self.dimension)
+        ivf = faiss.IndexIVFFlat(quantizer, self.dimension, self.ivf_nlist, faiss.METRIC_INNER_PRODUCT)
+        ivf.train(staged)
+        ivf.add(staged)
+        ivf.nprobe = self.ivf_nprobe
+        self._index = ivf
+        self._trained = True
+        logger.info(f"Trained IVF index with {self.ivf_nlist} lists on {len(staged)} vectors")
+
+    def _ensure_writable(self):
+        # Memory-mapped FAISS storage is a read-only view; re-read it owned before the first write
+        if self._mmap_path is not None:
+            import faiss
+            self._index = faiss.read_index(self._mmap_path)
+            self._apply_search_params()
+            self._mmap_path = None
+
+    def _apply_search_params(self):
+        if hasattr(self._index, "nprobe"):
+            self._index.nprobe = self.ivf_nprobe
+        if hasattr(self._index, "hnsw"):
+            self._index.hnsw.efSearch = self.hnsw_ef_search
+
+    # --- add / search -------------------------------------------------------
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        vectors = np.ascontiguousarray(np.atleast_2d(vectors), dtype="float32")
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    def add(self, vectors: np.ndarray, metadatas: List[Dict[str, Any]]) -> List[int]:
+        """Adds a block of vectors; returns their ids."""
+        vectors = self._normalize(vectors)
+        if len(vectors) != len(metadatas):
+            raise ValueError("vectors and metadatas must have the same length")
+        with self._lock:
+            self.index  # create lazily
+            self._ensure_writable()
+            start = self.ntotal
+            self._index.add(vectors)
+            for offset, metadata in enumerate(metadatas):
+                self.metadata[start + offset] = metadata
+            self._maybe_train_ivf()
+            self.dirty = True
+        return list(range(start, start + len(vectors)))
+
+    def search(self, vector: np.ndarray, k: int = 5) -> List[Tuple[int, float]]:
+        """Returns up to k (id, cosine similarity) pairs, best first."""
+        if self.ntotal == 0:
+            return []
+        query = self._normalize(vector)
+        with self._lock:
+            scores, ids = self._index.search(query, min(k, self.ntotal))
+        return [(int(i), float(s)) for i, s in zip(ids[0], scores[0]) if i != -1]
+
+    # --- persistence --------------------------------------------------------
+
+    def save(self, directory: str) -> None:
+        import faiss
+        os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            index = self.index
+            tmp_index = os.path.join(directory, INDEX_FILE + ".tmp")
+            faiss.write_index(index, tmp_index)
+            with open(os.path.join(directory, METADATA_FILE + ".tmp"), "w", encoding="utf-8") as f:
+                for doc_id in range(self.ntotal):
+                    f.write(json.dumps(self.metadata.get(doc_id, {})) + "\n")
+            manifest = {
+                "index_type": self.index_type,
+                "trained": self._trained,
+                "dimension": self.dimension,
+                "count": self.ntotal,
+                "namespace": self.namespace
+            }
+            with open(os.path.join(directory, MANIFEST_FILE + ".tmp"), "w") as f:
+                json.dump(manifest, f, indent=2)
+            self.dirty = False
+
+        # Swap in all files only once everything is written
+        for name in (INDEX_FILE, METADATA_FILE, MANIFEST_FILE):
+            os.replace(os.path.join(directory, name + ".tmp"), os.path.join(directory, name))
+
+    def load(self, directory: str, mmap: bool = True) -> None:
+        """
+        Loads a saved store. With mmap=True the vectors stay on disk and are
+        paged in on demand, so even a large corpus is searchable immediately.
+        """
+        import faiss
+        with open(os.path.join(directory, MANIFEST_FILE), "r") as f:
+            manifest = json.load(f)
+        if manifest["dimension"] != self.dimension:
+            raise ValueError(f"Index dimension {manifest['dimension']} != {self.dimension}")
+        if manifest.get("namespace") and self.namespace and manifest["namespace"] != self.namespace:
+            raise ValueError(f"Index was built with {manifest['namespace']}, not {self.namespace}")
+        if manifest["index_type"] != self.index_type:
+            logger.warning(f"Loaded a {manifest['index_type']} index, configured type is {self.index_type}")
+            self.index_type = manifest["index_type"]
+
+        index_path = os.path.join(directory, INDEX_FILE)
+        index = None
+        if mmap:
+            flag = getattr(faiss, "IO_FLAG_MMAP_IFC", None) or faiss.IO_FLAG_MMAP
+            try:
+                index = faiss.read_index(index_path, flag)
+                self._mmap_path = index_path
+            except RuntimeError:
+                index = None
+        if index is None:
+            index = faiss.read_index(index_path)
+            self._mmap_path = None
+
+        with open(os.path.join(directory, METADATA_FILE), "r", encoding="utf-8") as f:
+            metadata = {doc_id: json.loads(line) for doc_id, line in enumerate(f)}
+
+        with self._lock:
+            self._index = index
+            self._trained = manifest.get("trained", True)
+            self._apply_search_params()
+            self.metadata = metadata
+            self.dirty = False
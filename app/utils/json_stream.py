@@ -0,0 +1,102 @@
+import json
+from typing import Any, Dict, List
+
+
+class JSONArrayStream:
+    """
+    Incremental parser for a JSON array of objects arriving in arbitrary
+    chunks (e.g. LLM tokens). Text before the array is ignored; each
+    top-level object is returned by feed() as soon as its closing brace
+    arrives, without waiting for the rest of the array. An array whose first
+    element is not an object ("Here are [3] tips", a list of strings) is
+    dropped and the search goes on from the next '['. Elements that are not
+    valid JSON objects are skipped.
+    """
+
+    def __init__(self):
+        self.started = False   # inside a candidate array (saw its '[')
+        self.finished = False  # saw the matching ']'
+        self.text = ""         # everything fed so far (for non-JSON fallbacks)
+        self._element: List[str] = []
+        self._depth = 0        # nesting inside the current element
+        self._in_string = False
+        self._escaped = False
+        self._emitted = 0      # objects handed out from the current array
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """Consumes a chunk; returns the objects completed by it."""
+        self.text += chunk
+        completed: List[Dict[str, Any]] = []
+        position = 0
+        while position < len(chunk) and not self.finished:
+            if not self.started:
+                start = chunk.find('[', position)
+                if start == -1:
+                    break
+                self.started = True
+                position = start + 1
+            position = self._consume(chunk, position, completed)
+        return completed
+
+    def _consume(self, chunk: str, position: int, completed: List[Dict[str, Any]]) -> int:
+        """Parses the current array from chunk[position:]; returns where it stopped."""
+        element = self._element
+        for index in range(position, len(chunk)):
+            char = chunk[index]
+            if self._in_string:
+                element.append(char)
+                if self._escaped:
+                    self._escaped = False
+                elif char == '\\':
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if self._depth == 0 and not self._emitted and not char.isspace() and char not in '{],' \
+                    and not "".join(element).strip():
+                # The array does not start with an object: not the answer, look further
+                self._reset()
+                return index + 1
+
+            if char == '"':
+                self._in_string = True
+            elif char in '[{':
+                self._depth += 1
+            elif char in ']}':
+                if self._depth == 0:
+                    # ']' closing the top-level array
+                    self._emit(completed)
+                    self.finished = True
+                    return index + 1
+                self._depth -= 1
+                if self._depth == 0:
+                    # An object/array element just closed: hand it out now
+                    element.append(char)
+                    self._emit(completed)
+                    continue
+            elif char == ',' and self._depth == 0:
+                self._emit(completed)
+                continue
+            element.append(char)
+        return len(chunk)
+
+    def _emit(self, completed: List[Dict[str, Any]]) -> None:
+        raw = "".join(self._element).strip()
+        self._element.clear()
+        if not raw:
+            return
+        try:
+            value = json.loads(raw)
+        except ValueError:
+            return
+        if isinstance(value, dict):
+            completed.append(value)
+            self._emitted += 1
+
+    def _reset(self) -> None:
+        self.started = False
+        self._element.clear()
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
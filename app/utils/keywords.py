@@ -0,0 +1,118 @@
+import re
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+# Words, or single punctuation characters ("C++" -> c, +, +; "Node.js" -> node, ., js)
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+_WORD_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[Tuple[int, str]]:
+    """(offset, lowercased token) pairs; offsets index into `text`."""
+    return [(m.start(), m.group().lower()) for m in _TOKEN_RE.finditer(text)]
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton over word tokens.
+
+    Keywords and text are tokenized the same way, so matches always sit on
+    word boundaries ("Java" does not match inside "JavaScript") and are
+    case-insensitive; any run of whitespace between the words of a phrase
+    matches ("machine\nlearning"). Every keyword is found in one pass over
+    the text, overlapping ones included. Build once per keyword set and
+    reuse it.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords: List[str] = list(dict.fromkeys(keywords))
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, int]]] = [[]]  # (keyword index, length in tokens)
+
+        for index, keyword in enumerate(self.keywords):
+            tokens = [token for _, token in tokenize(keyword)]
+            if not tokens:
+                continue
+            state = 0
+            for token in tokens:
+                next_state = self._goto[state].get(token)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][token] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = next_state
+            self._out[state].append((index, len(tokens)))
+
+        # Breadth-first failure links; outputs inherit those of their failure state
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(token, 0)
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+        # Tokens outside the keyword vocabulary always send the automaton back to
+        # the root, so only vocabulary tokens need visiting. This regex finds them
+        # in C; any other token in between shows up as a non-blank gap.
+        vocabulary = set()
+        for transitions in self._goto:
+            vocabulary.update(transitions)
+        words = sorted((t for t in vocabulary if _WORD_RE.fullmatch(t)), key=len, reverse=True)
+        symbols = sorted(t for t in vocabulary if not _WORD_RE.fullmatch(t))
+        alternatives = []
+        if words:
+            alternatives.append(r"\b(?:" + "|".join(re.escape(w) for w in words) + r")\b")
+        if symbols:
+            alternatives.append("[" + "".join(re.escape(c) for c in symbols) + "]")
+        pattern = "|".join(alternatives)
+        self._candidates = re.compile(pattern) if alternatives else None
+        # For the rare text whose lowercase form changes length (offsets would drift)
+        self._candidates_ignorecase = re.compile(pattern, re.IGNORECASE) if alternatives else None
+
+    def find(self, text: str) -> Dict[str, List[int]]:
+        """Maps each keyword found in `text` to the character offsets of its hits."""
+        hits: Dict[str, List[int]] = {}
+        for index, start, _ in self._scan(text):
+            hits.setdefault(self.keywords[index], []).append(start)
+        return hits
+
+    def find_spans(self, text: str) -> List[Tuple[int, int, str]]:
+        """Every hit as (start, end, keyword), ordered by where it ends."""
+        return [(start, end, self.keywords[index]) for index, start, end in self._scan(text)]
+
+    def _scan(self, text: str) -> Iterator[Tuple[int, int, int]]:
+        """Yields (keyword index, start, end) for every hit."""
+        if self._candidates is None:
+            return
+
+        lowered = text.lower()
+        if len(lowered) == len(text):
+            text, candidates = lowered, self._candidates
+        else:
+            candidates = self._candidates_ignorecase
+
+        goto, fail, out = self._goto, self._fail, self._out
+        starts: List[int] = []  # offsets of the tokens in the current unbroken run
+        state = 0
+        previous_end = 0
+        for match in candidates.finditer(text):
+            start = match.start()
+            if start != previous_end and not text[previous_end:start].isspace():
+                state = 0
+                starts = []
+            previous_end = match.end()
+            starts.append(start)
+
+            token = match.group().lower()
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            for index, length in out[state]:
+                yield index, starts[-length], previous_end
@@ -0,0 +1,21 @@
+import re
+
+# Once tabs/NBSPs are plain spaces only runs of 2+ need rewriting, so the
+# common single separators are skipped by C-level scans instead of being
+# substituted one by one.
+_SPACE_RUNS_RE = re.compile(r' {2,}')
+_NEWLINE_RUNS_RE = re.compile(r'\n{2,}')
+
+
+def normalize_whitespace(text: str) -> str:
+    """
+    Collapses runs of spaces/tabs/NBSPs to one space and runs of newlines to
+    one newline, then strips. Same result as
+    re.sub(r'\\n+', '\\n', re.sub(r'[ \\t]+', ' ', text.replace('\\xa0', ' '))).strip().
+    """
+    text = text.replace('\xa0', ' ').replace('\t', ' ')
+    if '  ' in text:
+        text = _SPACE_RUNS_RE.sub(' ', text)
+    if '\n\n' in text:
+        text = _NEWLINE_RUNS_RE.sub('\n', text)
+    return text.strip()
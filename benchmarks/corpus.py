@@ -0,0 +1,136 @@
+"""
+Synthetic resumes and job postings for the benchmarks, generated from a
+seed so every run (and every machine) times the same documents.
+
+Resumes come as plain text, DOCX (python-docx) or a text-only PDF written
+here directly, so no PDF library beyond pdfplumber is needed.
+"""
+import io
+import random
+from typing import Dict, List
+
+# Resume pages / job posting length per size
+RESUME_PAGES: Dict[str, int] = {"small": 1, "medium": 3, "large": 10}
+JOB_REPEATS: Dict[str, int] = {"small": 1, "medium": 3, "large": 8}
+LINES_PER_PAGE = 50
+
+SUMMARIES = [
+    "Backend engineer with eight years of experience building reliable APIs and data pipelines.",
+    "Full-stack developer focused on Python services, React front ends and cloud infrastructure.",
+    "Platform engineer who enjoys automating deployments and mentoring junior developers.",
+]
+EXPERIENCE = [
+    "- Built REST APIs in Python with FastAPI serving two million requests a day",
+    "- Tuned PostgreSQL queries and added Redis caching, cutting p95 latency by 60%",
+    "- Containerized services with Docker and deployed them on Kubernetes in AWS",
+    "- Introduced Terraform modules for staging and production infrastructure",
+    "- Led design reviews and mentored four engineers on the platform team",
+    "- Migrated a legacy Django monolith to event-driven services on Kafka",
+    "- Wrote React and TypeScript dashboards used by the support organization",
+    "- Set up CI/CD pipelines with GitHub Actions and automated integration tests",
+    "- Organized quarterly community events and volunteer programs",
+    "- Coordinated vendor relationships and negotiated service contracts",
+]
+ROLES = ["Senior Engineer, Acme Corp 2019 - 2023", "Software Engineer, Globex 2016 - 2019",
+         "Developer, Initech 2013 - 2016", "Consultant, Umbrella Labs 2011 - 2013"]
+SKILLS = ["Python", "FastAPI", "Django", "PostgreSQL", "Redis", "Docker", "Kubernetes", "AWS",
+          "Terraform", "Kafka", "React", "TypeScript", "Git", "Linux", "GraphQL", "Go"]
+
+JOB_INTRO = """Senior Backend Engineer
+
+About the company
+We build hiring tools used by thousands of recruiters. Our team is distributed
+across three time zones and values written communication and ownership.
+"""
+JOB_RESPONSIBILITIES = [
+    "Design and build REST APIs for the matching platform",
+    "Own services in production, including on-call",
+    "Improve query performance on PostgreSQL",
+    "Mentor engineers and review designs",
+    "Work with product managers on the roadmap",
+]
+JOB_REQUIREMENTS = ["5+ years of Python", "FastAPI or Flask", "PostgreSQL and Redis", "Docker and Kubernetes",
+                    "Experience with AWS", "Strong written communication"]
+JOB_NICE = ["Terraform", "Kafka", "GraphQL"]
+
+
+def resume_text(size: str, seed: int = 7) -> str:
+    """A resume of RESUME_PAGES[size] pages: summary, experience, education, skills."""
+    rng = random.Random(seed)
+    lines = ["Jordan Example", "jordan@example.com | +1 555 0100", "", "Professional Summary", rng.choice(SUMMARIES),
+             "", "Experience"]
+    body = RESUME_PAGES[size] * LINES_PER_PAGE - 20
+    while body > 0:
+        lines.append(rng.choice(ROLES))
+        for _ in range(min(body, rng.randint(4, 8))):
+            lines.append(rng.choice(EXPERIENCE))
+            body -= 1
+        body -= 1
+    lines += ["", "Education", "B.Sc. Computer Science, State University", "",
+              "Skills", ", ".join(rng.sample(SKILLS, 10)), "",
+              "Certifications", "AWS Certified Solutions Architect"]
+    return "\n".join(lines)
+
+
+def job_text(size: str, seed: int = 11) -> str:
+    """A posting whose responsibilities / requirements repeat JOB_REPEATS[size] times."""
+    rng = random.Random(seed)
+    repeats = JOB_REPEATS[size]
+    responsibilities = [f"- {line} ({i})" if i else f"- {line}"
+                        for i in range(repeats) for line in rng.sample(JOB_RESPONSIBILITIES, len(JOB_RESPONSIBILITIES))]
+    requirements = [f"- {line} ({i})" if i else f"- {line}"
+                    for i in range(repeats) for line in JOB_REQUIREMENTS]
+    return "\n".join([JOB_INTRO, "Responsibilities:", *responsibilities, "", "Requirements:", *requirements, "",
+                      "Nice to have:", *(f"- {line}" for line in JOB_NICE), "", "Benefits",
+                      "Remote-first, equipment budget, yearly retreat."])
+
+
+def docx_bytes(text: str) -> bytes:
+    import docx
+    document = docx.Document()
+    for line in text.split("\n"):
+        document.add_paragraph(line)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def _pdf_escape(line: str) -> str:
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def pdf_bytes(text: str, lines_per_page: int = LINES_PER_PAGE) -> bytes:
+    """Minimal PDF 1.4: Helvetica 10pt, one text line per resume line, ASCII only."""
+    lines = text.encode("ascii", "replace").decode("ascii").split("\n")
+    pages: List[List[str]] = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+
+    objects: List[bytes] = []  # object n is objects[n - 1]
+    font_id = 3
+    page_ids = []
+    for page in pages:
+        content = ["BT", "/F1 10 Tf", "12 TL", "50 780 Td"]
+        content += [f"({_pdf_escape(line)}) Tj T*" for line in page]
+        content.append("ET")
+        stream = "\n".join(content).encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        content_id = len(objects) + 3  # after catalog, page tree and font
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] /Contents %d 0 R "
+                       b"/Resources << /Font << /F1 %d 0 R >> >> >>" % (content_id, font_id))
+        page_ids.append(content_id + 1)
+    kids = " ".join(f"{i} 0 R" for i in page_ids).encode("ascii")
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>",
+               b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(pages)),
+               b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>"] + objects
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return out.getvalue()
@@ -0,0 +1,118 @@
+"""
+Embedding backend benchmark: torch fp32 vs ONNX fp32 vs ONNX int8.
+
+Reports per backend:
+  - throughput (sentences/s) for batched encoding
+  - single-sentence latency p50/p95 (ms), i.e. a cache miss on the request path
+  - cosine agreement with the torch fp32 vectors (mean / min)
+
+Usage:
+    python scripts/export_onnx.py           # once
+    python benchmarks/embedding_backends.py [--sentences 512] [--batch-size 32]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import numpy as np
+
+sys.path.append(os.getcwd())
+
+from app.core.config import settings
+from app.services.embedding_backends import create_backend
+
+SKILLS = ["Python", "FastAPI", "Docker", "Kubernetes", "PostgreSQL", "React", "AWS", "Terraform",
+          "machine learning", "CI/CD pipelines", "REST APIs", "microservices", "Java", "Go"]
+TEMPLATES = [
+    "Built {a} services deployed with {b} for high-traffic workloads",
+    "{n}+ years of experience with {a} and {b}",
+    "Led a team migrating legacy systems to {a}, cutting costs by {n}0%",
+    "Strong knowledge of {a}; familiarity with {b} is a plus",
+    "Designed and maintained {a} integrations across {n} product teams",
+]
+
+
+def synthetic_sentences(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    return [
+        rng.choice(TEMPLATES).format(a=rng.choice(SKILLS), b=rng.choice(SKILLS), n=rng.randint(2, 9))
+        for _ in range(count)
+    ]
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def bench_backend(backend, sentences, batch_size, latency_samples):
+    backend.encode(sentences[:batch_size])  # warm-up
+
+    started = time.perf_counter()
+    vectors = np.concatenate([
+        backend.encode(sentences[i:i + batch_size]) for i in range(0, len(sentences), batch_size)
+    ])
+    throughput = len(sentences) / (time.perf_counter() - started)
+
+    latencies = []
+    for sentence in sentences[:latency_samples]:
+        t = time.perf_counter()
+        backend.encode([sentence])
+        latencies.append((time.perf_counter() - t) * 1000.0)
+
+    return vectors, {
+        "throughput_per_s": round(throughput, 1),
+        "latency_p50_ms": round(percentile(latencies, 0.50), 3),
+        "latency_p95_ms": round(percentile(latencies, 0.95), 3)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sentences", type=int, default=512)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--latency-samples", type=int, default=100)
+    parser.add_argument("--backends", default="torch,onnx,onnx-int8")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    sentences = synthetic_sentences(args.sentences)
+    results = {}
+    reference = None
+
+    for name in args.backends.split(","):
+        try:
+            backend = create_backend(name, settings.EMBEDDING_MODEL_NAME, settings.EMBEDDING_ONNX_DIR,
+                                     num_threads=settings.EMBEDDING_ONNX_THREADS)
+        except Exception as e:
+            print(f"[{name}] skipped: {e}")
+            continue
+
+        vectors, stats = bench_backend(backend, sentences, args.batch_size, args.latency_samples)
+        if reference is None and name == "torch":
+            reference = vectors
+        if reference is not None:
+            a = reference / np.linalg.norm(reference, axis=1, keepdims=True)
+            b = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+            agreement = (a * b).sum(axis=1)
+            stats["cosine_vs_fp32_mean"] = round(float(agreement.mean()), 6)
+            stats["cosine_vs_fp32_min"] = round(float(agreement.min()), 6)
+
+        results[name] = stats
+        print(f"[{name}] {stats}")
+
+    if "torch" in results:
+        base = results["torch"]["throughput_per_s"]
+        for name, stats in results.items():
+            stats["speedup_vs_torch"] = round(stats["throughput_per_s"] / base, 2)
+        print("\nSpeedup vs torch:", {name: s["speedup_vs_torch"] for name, s in results.items()})
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
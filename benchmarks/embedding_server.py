@@ -0,0 +1,153 @@
+"""
+Shared embedding server benchmark: N worker processes each loading the
+model vs N workers encoding through one embedding server.
+
+Reports per mode:
+  - memory summed over all processes (server included): RSS and PSS (MB);
+    PSS splits shared pages between processes, so it is the honest total
+  - throughput (sentences/s) with all workers encoding at once
+
+Linux only (reads /proc). Uses EMBEDDING_MODEL_NAME / EMBEDDING_BACKEND.
+
+Usage:
+    python benchmarks/embedding_server.py [--workers 4] [--sentences 256] [--batch-size 16] [--output results.json]
+"""
+import argparse
+import json
+import multiprocessing as mp
+import os
+import shutil
+import signal
+import sys
+import tempfile
+import time
+
+sys.path.append(os.getcwd())
+
+from app.core.config import settings
+
+SENTENCES = [
+    "Built Python services deployed with Docker for high-traffic workloads",
+    "5+ years of experience with FastAPI and PostgreSQL",
+    "Led a team migrating legacy systems to Kubernetes, cutting costs by 30%",
+    "Strong knowledge of AWS; familiarity with Terraform is a plus",
+    "Designed and maintained REST API integrations across 4 product teams",
+]
+
+
+def memory_mb(pid: int) -> dict:
+    """RSS and PSS of a process in MB (PSS needs smaps_rollup, Linux 4.14+)."""
+    values = {}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                key, _, rest = line.partition(":")
+                if key in ("Rss", "Pss"):
+                    values[key.lower()] = int(rest.split()[0]) / 1024.0
+    except FileNotFoundError:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    values["rss"] = values["pss"] = int(line.split()[1]) / 1024.0
+    return values
+
+
+def workload(count: int):
+    return [f"{SENTENCES[i % len(SENTENCES)]} (variant {i})" for i in range(count)]
+
+
+def make_backend(socket_path):
+    if socket_path:
+        from app.services.embedding_server import RemoteBackend
+        return RemoteBackend(socket_path, namespace=f"{settings.EMBEDDING_MODEL_NAME}@{settings.EMBEDDING_BACKEND}")
+    from app.services.embedding_backends import create_backend
+    return create_backend(settings.EMBEDDING_BACKEND, settings.EMBEDDING_MODEL_NAME, settings.EMBEDDING_ONNX_DIR,
+                          num_threads=settings.EMBEDDING_ONNX_THREADS)
+
+
+def worker(socket_path, sentences, batch_size, barrier, results):
+    backend = make_backend(socket_path)
+    backend.encode(["warm up"])
+    texts = workload(sentences)
+    barrier.wait()  # everyone loaded: encode at the same time
+    started = time.perf_counter()
+    for i in range(0, len(texts), batch_size):
+        backend.encode(texts[i:i + batch_size])
+    results.put((os.getpid(), started, time.perf_counter(), memory_mb(os.getpid())))
+
+
+def serve(socket_path, ready_pipe):
+    from app.services.embedding_server import EmbeddingServer
+    server = EmbeddingServer(socket_path, make_backend(None),
+                             namespace=f"{settings.EMBEDDING_MODEL_NAME}@{settings.EMBEDDING_BACKEND}",
+                             max_batch_size=settings.EMBEDDING_BATCH_MAX_SIZE,
+                             max_wait_ms=settings.EMBEDDING_BATCH_MAX_WAIT_MS)
+    ready_pipe.send(server.dimension)
+    # Exit cleanly on terminate() so the process releases what it registered
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+
+def run(mode: str, workers: int, sentences: int, batch_size: int) -> dict:
+    ctx = mp.get_context("spawn")  # no inherited torch state: each process pays its own imports
+    server = None
+    socket_path = None
+    if mode == "server":
+        socket_path = os.path.join(tempfile.mkdtemp(), "embeddings.sock")
+        ready, ready_pipe = ctx.Pipe(duplex=False)
+        server = ctx.Process(target=serve, args=(socket_path, ready_pipe), daemon=True)
+        server.start()
+        if not ready.poll(300):
+            raise RuntimeError("Embedding server did not start")
+
+    barrier = ctx.Barrier(workers)
+    results = ctx.Queue()
+    processes = [ctx.Process(target=worker, args=(socket_path, sentences, batch_size, barrier, results))
+                 for _ in range(workers)]
+    for p in processes:
+        p.start()
+    reports = [results.get(timeout=600) for _ in processes]
+    memory = [report[3] for report in reports]
+    if server is not None:
+        memory.append(memory_mb(server.pid))
+    for p in processes:
+        p.join()
+    if server is not None:
+        server.terminate()
+        server.join()
+        shutil.rmtree(os.path.dirname(socket_path), ignore_errors=True)
+
+    elapsed = max(r[2] for r in reports) - min(r[1] for r in reports)
+    return {
+        "processes": len(memory),
+        "rss_mb": round(sum(m["rss"] for m in memory), 1),
+        "pss_mb": round(sum(m["pss"] for m in memory), 1),
+        "sentences_per_s": round(workers * sentences / elapsed, 1)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--sentences", type=int, default=256, help="Per worker")
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    results = {}
+    for mode in ("in-process", "server"):
+        results[mode] = r = run(mode, args.workers, args.sentences, args.batch_size)
+        print(f"{mode:<10} {args.workers} workers ({r['processes']} processes)  RSS {r['rss_mb']:>8.1f} MB  "
+              f"PSS {r['pss_mb']:>8.1f} MB  {r['sentences_per_s']:>8.1f} sentences/s")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Job analyzer benchmark: section extraction on typical, large and
+pathological (header-dense) job descriptions.
+
+Reports per input:
+  - cold analyze latency (memo cache cleared each run), mean / p95 (ms)
+  - warm analyze latency (memoized hit), mean (ms)
+
+Usage:
+    python benchmarks/job_analyzer.py [--runs 50] [--output results.json]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.append(os.getcwd())
+
+from app.services.job_analyzer import JobAnalyzer
+
+TYPICAL = """Senior Backend Engineer
+
+About the company
+We build hiring tools.
+
+Responsibilities:
+- Design and build REST APIs
+- Own services in production
+- Mentor engineers
+
+Requirements:
+- 5+ years of Python
+- FastAPI or Flask
+- PostgreSQL
+- Docker
+
+Nice to have:
+- Kubernetes
+- AWS
+
+Benefits
+Remote-first, learning budget.
+"""
+
+
+def large_posting(target_bytes: int = 40_000) -> str:
+    # A long posting: the typical one padded with many bullet lines per section
+    body = [TYPICAL]
+    i = 0
+    while sum(len(part) for part in body) < target_bytes:
+        body.append(f"- Experience with distributed system component {i}, observability and on-call rotations")
+        i += 1
+    return "\n".join(body)
+
+
+def pathological_posting(sections: int = 2_000) -> str:
+    # Header-dense: thousands of short sections with blank and colon-only lines between them
+    headers = ["Requirements", "Responsibilities", "Nice to have", "Benefits", "About", "Qualifications", "Duties"]
+    lines = []
+    for i in range(sections):
+        lines.append(f"  {headers[i % len(headers)]} :")
+        lines.append(":")
+        lines.append(f"- item {i}")
+        lines.append("\xa0 \t")
+    return "\n".join(lines)
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def bench(analyzer: JobAnalyzer, text: str, runs: int):
+    cold = []
+    for _ in range(runs):
+        analyzer._cache.clear()
+        started = time.perf_counter()
+        analyzer.analyze(text)
+        cold.append((time.perf_counter() - started) * 1000.0)
+
+    warm = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        analyzer.analyze(text)
+        warm.append((time.perf_counter() - started) * 1000.0)
+
+    return {
+        "bytes": len(text.encode("utf-8")),
+        "cold_mean_ms": round(sum(cold) / runs, 3),
+        "cold_p95_ms": round(percentile(cold, 0.95), 3),
+        "warm_mean_ms": round(sum(warm) / runs, 3)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    analyzer = JobAnalyzer()
+    inputs = {
+        "typical": TYPICAL,
+        "large": large_posting(),
+        "pathological": pathological_posting()
+    }
+
+    results = {}
+    for name, text in inputs.items():
+        results[name] = bench(analyzer, text, args.runs)
+        r = results[name]
+        print(f"{name:<13} {r['bytes']:>8} B  cold {r['cold_mean_ms']:>8.3f} ms (p95 {r['cold_p95_ms']:.3f})  "
+              f"warm {r['warm_mean_ms']:.3f} ms")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+"""
+Load test: requests/s ceiling of /api/v1/match/ or /api/v1/refine/ without
+calling OpenAI.
+
+By default the harness starts the fake OpenAI server
+(tests/fake_openai_server.py, with the --llm-* latency / error rate /
+answer shape) and the app under uvicorn pointed at it via OPENAI_BASE_URL,
+with the LLM cache off. --url targets an already running deployment
+instead (configure its OPENAI_BASE_URL yourself).
+
+For each --concurrency step, that many clients send requests back to back
+for --duration seconds and the step reports:
+  - throughput (successful requests/s) and error rate (non-2xx, timeouts)
+  - latency p50 / p95 / p99 (ms)
+  - LLM fallbacks: answers the app replaced with its built-in suggestions
+    (from /metrics; with --workers > 1 only the scraped worker is counted)
+  - LLM requests and injected failures seen by the fake server
+The last two cover the whole step, warm-up included.
+
+The saturation point is the lowest concurrency reaching 90% of the best
+throughput among steps within --max-error-rate: beyond it more clients
+mostly add latency. Uploads cycle through --documents distinct resumes,
+more than the default PARSE_CACHE_SIZE, so the parse cache does not hit.
+
+Usage:
+    python benchmarks/load_test.py [--endpoint match|refine] [--concurrency 1 2 4 8 16 32] [--duration 15]
+                                   [--workers 1] [--llm-latency-ms 800] [--llm-jitter-ms 200]
+                                   [--llm-error-rate 0.0] [--llm-shape auto] [--url http://host:8000]
+                                   [--output results.json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import re
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+sys.path.append(os.getcwd())
+
+from benchmarks.corpus import docx_bytes, job_text, resume_text
+
+DOCX = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+FALLBACKS = re.compile(r"^resume_ai_llm_fallbacks_total\{[^}]*\} (\d+)", re.M)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def build_requests(endpoint: str, size: str, documents: int) -> List[Dict[str, Any]]:
+    """Request bodies cycled by the clients: distinct resumes against a handful of postings."""
+    jobs = [job_text(size, seed=i) for i in range(8)]
+    requests = []
+    for i in range(documents):
+        resume = resume_text(size, seed=1000 + i)
+        if endpoint == "match":
+            requests.append({"data": {"job_description": jobs[i % len(jobs)]},
+                             "files": {"resume_file": (f"resume-{i}.docx", docx_bytes(resume), DOCX)}})
+        else:
+            requests.append({"data": {"resume_text": resume, "job_description": jobs[i % len(jobs)]}})
+    return requests
+
+
+async def run_step(client, url: str, requests: List[Dict[str, Any]], concurrency: int, duration: float,
+                   warmup: float, counter: List[int]) -> Dict[str, Any]:
+    """Closed loop: `concurrency` clients, each sending its next request as soon as the last one returns."""
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    measure_from, stop_at = started + warmup, started + warmup + duration
+    latencies, statuses, errors = [], {}, 0
+
+    async def client_loop():
+        nonlocal errors
+        while loop.time() < stop_at:
+            counter[0] += 1
+            body = requests[counter[0] % len(requests)]
+            sent = loop.time()
+            try:
+                response = await client.post(url, **body)
+                status = response.status_code
+            except Exception as e:
+                status = type(e).__name__
+            if sent < measure_from:
+                continue  # warm-up: connections, pools and caches settle
+            statuses[status] = statuses.get(status, 0) + 1
+            if isinstance(status, int) and 200 <= status < 300:
+                latencies.append((loop.time() - sent) * 1000.0)
+            else:
+                errors += 1
+
+    await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+    elapsed = max(loop.time() - measure_from, 1e-9)  # includes the tail of requests sent before stop_at
+    total = len(latencies) + errors
+    return {
+        "concurrency": concurrency,
+        "requests": total,
+        "throughput_rps": round(len(latencies) / elapsed, 2),
+        "error_rate": round(errors / total, 4) if total else 0.0,
+        "p50_ms": round(percentile(latencies, 0.50), 1),
+        "p95_ms": round(percentile(latencies, 0.95), 1),
+        "p99_ms": round(percentile(latencies, 0.99), 1),
+        "statuses": {str(k): v for k, v in sorted(statuses.items(), key=str)}
+    }
+
+
+def saturation(steps: List[Dict[str, Any]], max_error_rate: float) -> Optional[Dict[str, Any]]:
+    """Lowest concurrency within 90% of the best healthy throughput; None if no step is healthy."""
+    healthy = [s for s in steps if s["error_rate"] <= max_error_rate and s["throughput_rps"] > 0]
+    if not healthy:
+        return None
+    ceiling = max(s["throughput_rps"] for s in healthy)
+    knee = next(s for s in healthy if s["throughput_rps"] >= 0.9 * ceiling)
+    return {"ceiling_rps": ceiling, "concurrency": knee["concurrency"], "throughput_rps": knee["throughput_rps"],
+            "p95_ms": knee["p95_ms"]}
+
+
+async def scrape(client, url: str) -> Dict[str, int]:
+    try:
+        return (await client.get(url)).json()
+    except Exception:
+        return {}
+
+
+async def fallbacks(client, base_url: str) -> Optional[int]:
+    try:
+        text = (await client.get(f"{base_url}/metrics")).text
+    except Exception:
+        return None
+    return sum(int(n) for n in FALLBACKS.findall(text))
+
+
+async def run(args, base_url: str, llm_url: Optional[str]) -> Dict[str, Any]:
+    import httpx
+    path = "/api/v1/match/" if args.endpoint == "match" else "/api/v1/refine/"
+    print(f"Preparing {args.documents} {args.size} requests for {path}")
+    requests = build_requests(args.endpoint, args.size, args.documents)
+    limits = httpx.Limits(max_connections=max(args.concurrency), max_keepalive_connections=max(args.concurrency))
+    counter = [0]
+    steps = []
+    async with httpx.AsyncClient(limits=limits, timeout=args.timeout) as client:
+        for concurrency in args.concurrency:
+            before_fallbacks = await fallbacks(client, base_url)
+            before_llm = await scrape(client, f"{llm_url}/stats") if llm_url else {}
+            step = await run_step(client, base_url + path, requests, concurrency, args.duration, args.warmup, counter)
+            after_fallbacks = await fallbacks(client, base_url)
+            after_llm = await scrape(client, f"{llm_url}/stats") if llm_url else {}
+            if before_fallbacks is not None and after_fallbacks is not None:
+                step["llm_fallbacks"] = after_fallbacks - before_fallbacks
+            if before_llm and after_llm:
+                step["llm_requests"] = after_llm["requests"] - before_llm["requests"]
+                step["llm_injected_failures"] = after_llm["failures"] - before_llm["failures"]
+            steps.append(step)
+            print(f"c={concurrency:<4} {step['throughput_rps']:>8.2f} req/s  errors {step['error_rate']:>6.1%}  "
+                  f"p50 {step['p50_ms']:>8.1f}  p95 {step['p95_ms']:>8.1f}  p99 {step['p99_ms']:>8.1f} ms  "
+                  f"fallbacks {step.get('llm_fallbacks', '-')}")
+    return {"endpoint": path, "steps": steps, "saturation": saturation(steps, args.max_error_rate)}
+
+
+def wait_until(check, timeout: float, what: str, process: subprocess.Popen):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{what} exited with code {process.returncode}, see its log")
+        try:
+            if check():
+                return
+        except Exception:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError(f"{what} did not come up within {timeout:.0f}s")
+
+
+def start_stack(args) -> Tuple[str, str, List[subprocess.Popen]]:
+    """Fake OpenAI server + uvicorn, both as child processes so the load generator has its own CPU."""
+    import httpx
+    llm_port, app_port = free_port(), free_port()
+    log = open(args.log, "w")  # app and fake server output, kept out of the report
+    print(f"Server logs: {args.log}")
+    llm = subprocess.Popen([sys.executable, os.path.join("tests", "fake_openai_server.py"), "--port", str(llm_port),
+                            "--latency-ms", str(args.llm_latency_ms), "--jitter-ms", str(args.llm_jitter_ms),
+                            "--error-rate", str(args.llm_error_rate), "--error-status", str(args.llm_error_status),
+                            "--shape", args.llm_shape, "--seed", "1"], stdout=log, stderr=subprocess.STDOUT)
+    llm_url = f"http://127.0.0.1:{llm_port}"
+    env = {**os.environ, "OPENAI_API_KEY": "sk-load-test", "OPENAI_BASE_URL": f"{llm_url}/v1",
+           "LLM_CACHE_ENABLED": "false"}
+    app = subprocess.Popen([sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1",
+                            "--port", str(app_port), "--workers", str(args.workers), "--log-level", "warning"],
+                           env=env, stdout=log, stderr=subprocess.STDOUT)
+    base_url = f"http://127.0.0.1:{app_port}"
+    processes = [llm, app]
+    try:
+        wait_until(lambda: httpx.get(f"{llm_url}/stats").status_code == 200, 30, "Fake OpenAI server", llm)
+        # /ready: the embedding model is loaded, so the first step does not time the load
+        wait_until(lambda: httpx.get(f"{base_url}/ready").status_code == 200, args.startup_timeout, "App", app)
+    except Exception:
+        stop_stack(processes)
+        raise
+    return base_url, llm_url, processes
+
+
+def stop_stack(processes: List[subprocess.Popen]):
+    for process in processes:
+        process.terminate()
+    for process in processes:
+        try:
+            process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--endpoint", choices=["match", "refine"], default="match")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    parser.add_argument("--duration", type=float, default=15.0, help="Measured seconds per step")
+    parser.add_argument("--warmup", type=float, default=3.0, help="Unmeasured seconds before each step")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Client timeout per request")
+    parser.add_argument("--size", choices=["small", "medium", "large"], default="small")
+    parser.add_argument("--documents", type=int, default=600, help="Distinct resumes cycled through")
+    parser.add_argument("--max-error-rate", type=float, default=0.01, help="Steps above this are not healthy")
+    parser.add_argument("--url", help="Load an already running app instead of starting one")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers of the started app")
+    parser.add_argument("--startup-timeout", type=float, default=300.0)
+    parser.add_argument("--log", default=os.path.join(tempfile.gettempdir(), "resume-ai-load-test.log"),
+                        help="Output of the started app and fake server")
+    parser.add_argument("--llm-latency-ms", type=float, default=800.0)
+    parser.add_argument("--llm-jitter-ms", type=float, default=200.0)
+    parser.add_argument("--llm-error-rate", type=float, default=0.0)
+    parser.add_argument("--llm-error-status", type=int, default=500)
+    parser.add_argument("--llm-shape", default="auto", choices=["auto", "suggestions", "refine", "text", "truncated"])
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    processes = []
+    llm_url = None
+    if args.url:
+        base_url = args.url.rstrip("/")
+    else:
+        base_url, llm_url, processes = start_stack(args)
+    try:
+        results = asyncio.run(run(args, base_url, llm_url))
+    finally:
+        stop_stack(processes)
+
+    knee = results["saturation"]
+    if knee:
+        print(f"\nCeiling ~{knee['ceiling_rps']:.2f} req/s; saturated from concurrency {knee['concurrency']} "
+              f"({knee['throughput_rps']:.2f} req/s, p95 {knee['p95_ms']:.1f} ms)")
+    else:
+        print(f"\nNo step stayed within {args.max_error_rate:.0%} errors")
+    results["config"] = {k: v for k, v in vars(args).items() if k != "output"}
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""
+Prompt size benchmark: tokens per LLM request before (fixed character crops
+of the resume and job) and after (requirements + retrieved resume chunks in
+a token budget).
+
+Reports per resume length, for the suggestions and refine prompts:
+  - prompt tokens, legacy vs budgeted
+  - coverage: share of the skills the resume and job have in common that
+    still reach the model in the resume part of the prompt
+  - build time of the budgeted prompt (ms, embeddings warm)
+
+Token counts are exact with tiktoken installed, ~4 chars/token otherwise.
+
+Usage:
+    python benchmarks/prompt_tokens.py [--pages 1 2 4] [--output results.json]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.getcwd())
+
+from app.services.prompt_context import count_tokens
+from app.services.skill_taxonomy import skill_taxonomy
+from app.services.tailoring_service import TailoringService
+
+JOB = """Senior Backend Engineer
+
+About the company
+We build hiring tools used by thousands of recruiters. Our team is distributed
+across three time zones and we value written communication, ownership and
+pragmatic engineering. We offer a learning budget and flexible hours.
+
+Responsibilities:
+- Design and build REST APIs for the matching platform
+- Own services in production, including on-call
+- Improve query performance on PostgreSQL
+- Mentor engineers and review designs
+
+Requirements:
+- 5+ years of Python
+- FastAPI or Flask
+- PostgreSQL and Redis
+- Docker and Kubernetes
+- Experience with AWS
+
+Nice to have:
+- Terraform
+- Kafka
+
+Benefits
+Remote-first, equipment budget, yearly retreat.
+"""
+
+SUMMARY = ("Professional Summary\nSoftware engineer with ten years of experience across retail, "
+           "education and logistics companies, focused on reliable services and mentoring.")
+
+# Blocks unrelated to the posting come first, as on many real resumes
+FILLER = [
+    "Organized quarterly community events and volunteer programs for local schools.",
+    "Coordinated vendor relationships and negotiated print and catering contracts.",
+    "Taught introductory statistics workshops and prepared course material.",
+    "Managed the office move and the inventory of shared equipment.",
+    "Wrote the internal newsletter and maintained the team wiki.",
+]
+RELEVANT = [
+    "Built REST APIs in Python with FastAPI serving two million requests a day.",
+    "Tuned PostgreSQL queries and added Redis caching, cutting p95 latency by 60%.",
+    "Containerized services with Docker and deployed them on Kubernetes in AWS.",
+    "Introduced Terraform modules for all staging and production infrastructure.",
+    "Mentored four engineers and led design reviews for the platform team.",
+]
+
+
+def synthetic_resume(pages: int, seed: int = 5) -> str:
+    # ~40 lines per page; the relevant experience sits at the end
+    rng = random.Random(seed)
+    lines = [SUMMARY, "", "Experience"]
+    for _ in range(pages * 40 - len(RELEVANT)):
+        lines.append("- " + rng.choice(FILLER))
+    lines.extend("- " + line for line in RELEVANT)
+    lines += ["", "Education", "B.Sc. Computer Science, State University"]
+    return "\n".join(lines)
+
+
+def legacy_prompt(resume_text: str, job_desc: str, missing_skills) -> str:
+    # The character-cropping builder this benchmark compares against
+    return f"""
+You are an expert career coach and resume writer.
+I will provide you with a Resume and a Job Description.
+Your goal is to provide specific, actionable suggestions to tailor the resume for this job.
+
+### Job Description
+{job_desc[:1000]}... (truncated)
+
+### Resume
+{resume_text[:1000]}... (truncated)
+
+### Missing Skills Detected
+{', '.join(missing_skills) if missing_skills else 'None - good match!'}
+
+### Instructions
+1. Analyze the gap between the resume and the job description.
+2. Provide 3 specific suggestions to improve the resume.
+3. Suggestions should not fabricate experience, but highlight relevant existing experience.
+4. Output MUST be in valid JSON format:
+[
+  {{
+    "section": "Target Section (e.g., Skills, Experience)",
+    "suggestion": "Actionable advice...",
+    "justification": "Why this matters..."
+  }}
+]
+""".strip()
+
+
+def legacy_refine_prompt(resume_text: str, job_desc: str) -> str:
+    return f"""
+You are an expert resume writer.
+I will provide a Resume and a Job Description.
+Rewrite the "Professional Summary" and improve 3 key "Experience" bullet points to better match the job description.
+
+### Job Description
+{job_desc[:1500]}
+
+### Resume
+{resume_text[:2000]}
+
+### Instructions
+1. Rewrite the **Professional Summary** to highlight relevant skills and experience for this specific job.
+2. Select 3 existing experience bullet points and rewrite them to be more results-oriented and relevant to the job.
+3. Output MUST be in valid JSON format with these exact keys:
+{{
+  "summary": "Rewritten summary text...",
+  "experience": "Markdown list of 3 rewritten bullet points..."
+}}
+"""
+
+
+def resume_part(prompt: str) -> str:
+    return prompt.split("### Resume", 1)[1].split("###", 1)[0]
+
+
+def coverage(prompt: str, shared: set) -> float:
+    if not shared:
+        return 1.0
+    return round(len(shared & set(skill_taxonomy.extract(resume_part(prompt)))) / len(shared), 3)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    service = TailoringService()
+    missing = ["kafka"]
+    results = {}
+    for pages in args.pages:
+        resume = synthetic_resume(pages)
+        shared = set(skill_taxonomy.extract(resume)) & set(skill_taxonomy.extract(JOB))
+
+        service._build_prompt(resume, JOB, missing)  # warm: model load + embedding cache
+        started = time.perf_counter()
+        suggestions = service._build_prompt(resume, JOB, missing)
+        build_ms = (time.perf_counter() - started) * 1000.0
+        refine = service._build_refine_prompt(resume, JOB)
+
+        legacy = legacy_prompt(resume, JOB, missing)
+        legacy_refine = legacy_refine_prompt(resume, JOB)
+        results[pages] = {
+            "resume_tokens": count_tokens(resume),
+            "suggestions": {
+                "legacy_tokens": count_tokens(legacy),
+                "budgeted_tokens": count_tokens(suggestions),
+                "legacy_coverage": coverage(legacy, shared),
+                "budgeted_coverage": coverage(suggestions, shared),
+                "build_ms": round(build_ms, 3)
+            },
+            "refine": {
+                "legacy_tokens": count_tokens(legacy_refine),
+                "budgeted_tokens": count_tokens(refine),
+                "legacy_coverage": coverage(legacy_refine, shared),
+                "budgeted_coverage": coverage(refine, shared)
+            }
+        }
+        r = results[pages]
+        for kind in ("suggestions", "refine"):
+            k = r[kind]
+            print(f"{pages:>2} pages {kind:<11} tokens {k['legacy_tokens']:>5} -> {k['budgeted_tokens']:>5}  "
+                  f"coverage {k['legacy_coverage']:.2f} -> {k['budgeted_coverage']:.2f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
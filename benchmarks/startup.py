@@ -0,0 +1,112 @@
+"""
+Cold-start benchmark.
+
+Spawns a fresh interpreter and records:
+  - import time of app.main and which heavy modules it pulled in
+  - time until /ready reports the model loaded
+  - time to the first /api/v1/match/ response (from process start)
+
+Usage:
+    python benchmarks/startup.py [--runs 3] [--output startup.json]
+"""
+import argparse
+import io
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+READY_TIMEOUT_SECONDS = 300
+HEAVY_MODULES = ["torch", "sentence_transformers", "faiss", "pdfplumber", "docx", "openai"]
+
+SAMPLE_JOB = """Backend Engineer
+Responsibilities:
+- Build REST APIs using FastAPI
+- Maintain PostgreSQL databases
+Requirements:
+- Python
+- Docker
+"""
+
+SAMPLE_RESUME = ["Jane Doe", "Experience", "Built REST APIs with FastAPI", "Skills", "Python", "Docker"]
+
+
+def child():
+    started = time.perf_counter()
+    sys.path.insert(0, ROOT)
+    import app.main
+    import_seconds = time.perf_counter() - started
+    heavy_loaded = [m for m in HEAVY_MODULES if m in sys.modules]
+
+    import docx
+    from fastapi.testclient import TestClient
+
+    document = docx.Document()
+    for line in SAMPLE_RESUME:
+        document.add_paragraph(line)
+    buffer = io.BytesIO()
+    document.save(buffer)
+
+    with TestClient(app.main.app) as client:
+        health_seconds = time.perf_counter() - started
+        client.get("/health")
+
+        deadline = time.perf_counter() + READY_TIMEOUT_SECONDS
+        while client.get("/ready").status_code != 200:
+            if time.perf_counter() > deadline:
+                raise SystemExit(f"Model not ready after {READY_TIMEOUT_SECONDS}s")
+            time.sleep(0.05)
+        ready_seconds = time.perf_counter() - started
+
+        response = client.post(
+            "/api/v1/match/",
+            data={"job_description": SAMPLE_JOB},
+            files={"resume_file": ("resume.docx", buffer.getvalue(),
+                                   "application/vnd.openxmlformats-officedocument.wordprocessingml.document")}
+        )
+        first_match_seconds = time.perf_counter() - started
+
+    print(json.dumps({
+        "import_seconds": round(import_seconds, 4),
+        "heavy_modules_at_import": heavy_loaded,
+        "health_seconds": round(health_seconds, 4),
+        "ready_seconds": round(ready_seconds, 4),
+        "first_match_seconds": round(first_match_seconds, 4),
+        "first_match_status": response.status_code
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    runs = []
+    for i in range(args.runs):
+        out = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child"],
+            cwd=ROOT, capture_output=True, text=True, check=True
+        )
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        runs.append(result)
+        print(f"Run {i + 1}: {result}")
+
+    summary = {
+        key: round(sorted(r[key] for r in runs)[len(runs) // 2], 4)
+        for key in ("import_seconds", "health_seconds", "ready_seconds", "first_match_seconds")
+    }
+    print(f"\nMedian of {len(runs)} runs: {summary}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"runs": runs, "median": summary}, f, indent=2)
+
+
+if __name__ == "__main__":
+    if "--child" in sys.argv:
+        child()
+    else:
+        main()
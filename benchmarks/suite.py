@@ -0,0 +1,291 @@
+"""
+Offline benchmark suite with a regression gate.
+
+Times, on the synthetic corpus of benchmarks/corpus.py (small / medium /
+large resumes and postings):
+  - parse_pdf, parse_docx      ResumeParser.parse on the file bytes
+  - job_analyze                JobAnalyzer.analyze (fresh analyzer: no memo hits)
+  - chunk_text                 EmbeddingService.chunk_text on the resume
+  - search                     EmbeddingService.search (query encode + index
+                               lookup) on a fresh store holding this size's resume chunks
+  - compute_score              MatchingEngine.compute_score on parsed data
+  - rank_jobs                  MatchingEngine.rank_jobs on parsed data, one resume
+                               against RANK_JOBS postings
+  - rank_resumes               MatchingEngine.rank_resumes on parsed data, RANK_RESUMES
+                               resumes against one posting
+  - match_e2e                  POST /api/v1/match/ through an in-process client,
+                               each upload unique so the parse cache cannot hit
+
+Everything runs offline: the OpenAI key is cleared (the built-in fallback
+suggestions stand in for the LLM) and the LLM cache is off. Cases that need
+the embedding model use EMBEDDING_MODEL_NAME / EMBEDDING_BACKEND.
+
+Each case reports the best, median and p95 time per call over --runs
+samples after warm-up; sub-millisecond calls are looped within a sample.
+--save-baseline stores them as JSON; --compare fails (exit code 1) when a
+case's best time is more than --tolerance slower than the baseline, or when
+a baseline case no longer runs. The best time is the gate because
+interference from other processes only ever adds time, and a flagged case
+is measured again before it counts. Baselines only compare on the machine
+and model they were recorded with.
+
+Usage:
+    python benchmarks/suite.py [--sizes small medium large] [--cases parse match_e2e] [--runs 15]
+                               [--save-baseline | --compare] [--baseline benchmarks/baselines/baseline.json]
+                               [--tolerance 0.25] [--output results.json]
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+sys.path.append(os.getcwd())
+
+DEFAULT_BASELINE = os.path.join("benchmarks", "baselines", "baseline.json")
+DOCX = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+PDF = "application/pdf"
+RANK_JOBS = 100
+RANK_RESUMES = 100
+
+
+def measure(func: Callable[[], Any], runs: int, warmup: int = 2, min_sample_ms: float = 20.0) -> Dict[str, float]:
+    """
+    Median / p95 per call over `runs` samples. Fast calls are repeated
+    within a sample until it lasts min_sample_ms, so timer resolution and
+    scheduler noise do not dominate sub-millisecond cases.
+    """
+    for _ in range(warmup):
+        func()
+    started = time.perf_counter()
+    func()
+    once_ms = (time.perf_counter() - started) * 1000.0
+    loops = max(1, int(min_sample_ms / max(once_ms, 1e-6)))
+
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        samples.append((time.perf_counter() - started) * 1000.0 / loops)
+    samples.sort()
+    median = statistics.median(samples)
+    return {
+        "best_ms": round(samples[0], 4),
+        "median_ms": round(median, 4),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 4),
+        "ops_per_s": round(1000.0 / median, 2) if median else float("inf"),
+        "loops": loops
+    }
+
+
+def build_cases(sizes: List[str]) -> List[Tuple[str, Callable[[], Callable[[], Any]]]]:
+    """(name, setup) pairs; setup prepares the inputs and returns the timed call."""
+    from benchmarks.corpus import docx_bytes, job_text, pdf_bytes, resume_text
+
+    cases = []
+    for size in sizes:
+        resume, job = resume_text(size), job_text(size)
+
+        def parse_pdf(resume=resume):
+            from app.services.resume_parser import ResumeParser
+            parser, data = ResumeParser(), pdf_bytes(resume)
+            return lambda: parser.parse(data, PDF)
+
+        def parse_docx(resume=resume):
+            from app.services.resume_parser import ResumeParser
+            parser, data = ResumeParser(), docx_bytes(resume)
+            return lambda: parser.parse(data, DOCX)
+
+        def job_analyze(job=job):
+            from app.services.job_analyzer import JobAnalyzer
+            return lambda: JobAnalyzer().analyze(job)
+
+        def chunk_text(resume=resume):
+            from app.services.embedding_service import embedding_service
+            return lambda: embedding_service.chunk_text(resume)
+
+        def search(resume=resume, job=job, size=size):
+            from app.services.embedding_service import embedding_service
+            from app.services.job_analyzer import job_analyzer
+            # A new, empty store for every setup: a re-measured case searches exactly
+            # this size's chunks again, not a second copy of them (or other sizes')
+            embedding_service._store = None
+            embedding_service.add_many((chunk, {"size": size}) for chunk in embedding_service.chunk_text(resume))
+            queries = job_analyzer.analyze(job)["required_skills"]
+            embedding_service.encode(queries)  # times the lookup path, not first-time encodes
+            state = {"i": 0}
+
+            def run():
+                state["i"] += 1
+                return embedding_service.search(queries[state["i"] % len(queries)], k=5)
+            return run
+
+        def compute_score(resume=resume, job=job):
+            from app.services.job_analyzer import job_analyzer
+            from app.services.matching_engine import matching_engine
+            from app.services.resume_parser import resume_parser
+            resume_data, job_data = resume_parser.parse(docx_bytes(resume), DOCX), job_analyzer.analyze(job)
+            return lambda: matching_engine.compute_score(resume_data, job_data)
+
+        def rank_jobs(resume=resume, size=size):
+            from app.services.job_analyzer import job_analyzer
+            from app.services.matching_engine import matching_engine
+            from app.services.resume_parser import resume_parser
+            resume_data = resume_parser.parse(docx_bytes(resume), DOCX)
+            jobs = job_analyzer.analyze_many([job_text(size, seed=seed) for seed in range(RANK_JOBS)])
+            return lambda: matching_engine.rank_jobs(resume_data, jobs)
+
+        def rank_resumes(job=job, size=size):
+            from app.services.job_analyzer import job_analyzer
+            from app.services.matching_engine import matching_engine
+            from app.services.resume_parser import resume_parser
+            resumes = [resume_parser.parse(docx_bytes(resume_text(size, seed=seed)), DOCX) for seed in range(RANK_RESUMES)]
+            job_data = job_analyzer.analyze(job)
+            return lambda: matching_engine.rank_resumes(resumes, job_data)
+
+        def match_e2e(resume=resume, job=job):
+            from fastapi.testclient import TestClient
+            from app.main import app
+            client = TestClient(app)
+            state = {"i": 0}
+
+            def run():
+                state["i"] += 1
+                data = docx_bytes(f"{resume}\nReference {state['i']}")  # new bytes: a parse cache miss
+                response = client.post("/api/v1/match/", data={"job_description": job},
+                                       files={"resume_file": ("resume.docx", data, DOCX)})
+                response.raise_for_status()
+            return run
+
+        for func in (parse_pdf, parse_docx, job_analyze, chunk_text, search, compute_score, rank_jobs,
+                     rank_resumes, match_e2e):
+            cases.append((f"{func.__name__}[{size}]", func))
+    return cases
+
+
+def environment() -> Dict[str, Any]:
+    from app.core.config import settings
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpus": os.cpu_count(),
+        "embedding_model": settings.EMBEDDING_MODEL_NAME,
+        "embedding_backend": settings.EMBEDDING_BACKEND
+    }
+
+
+def compare(baseline: Dict[str, Dict[str, float]], current: Dict[str, Dict[str, float]],
+            tolerance: float) -> List[Dict[str, Any]]:
+    """
+    Per case: status "regressed" (best time beyond baseline * (1 + tolerance)
+    or the case no longer runs), "improved", "ok" or "new" (not in the baseline).
+    """
+    rows = []
+    for name in list(baseline) + [n for n in current if n not in baseline]:
+        before, after = baseline.get(name), current.get(name)
+        row = {"case": name, "baseline_ms": before and before["best_ms"], "current_ms": after and after["best_ms"],
+               "change": None}
+        if before is None:
+            row["status"] = "new"
+        elif after is None:
+            row["status"] = "regressed"
+        else:
+            row["change"] = round(after["best_ms"] / before["best_ms"] - 1.0, 3) if before["best_ms"] else 0.0
+            if row["change"] > tolerance:
+                row["status"] = "regressed"
+            elif row["change"] < -tolerance:
+                row["status"] = "improved"
+            else:
+                row["status"] = "ok"
+        rows.append(row)
+    return rows
+
+
+def run_suite(sizes: List[str], prefixes: Optional[List[str]], runs: int,
+              exact: bool = False) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """Runs the cases whose name starts with one of `prefixes` (or equals one, with exact)."""
+    results, errors = {}, {}
+    for name, setup in build_cases(sizes):
+        if prefixes and not any(name == p if exact else name.startswith(p) for p in prefixes):
+            continue
+        try:
+            results[name] = measure(setup(), runs)
+        except Exception as e:
+            errors[name] = f"{type(e).__name__}: {e}"
+            print(f"{name:<28} ERROR {errors[name]}")
+            continue
+        r = results[name]
+        print(f"{name:<28} best {r['best_ms']:>10.3f} ms  median {r['median_ms']:>10.3f} ms  p95 {r['p95_ms']:>10.3f} ms  "
+              f"{r['ops_per_s']:>10.2f} ops/s")
+    return results, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", nargs="+", default=["small", "medium", "large"])
+    parser.add_argument("--cases", nargs="+", help="Only cases whose name starts with one of these")
+    parser.add_argument("--runs", type=int, default=15)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown of the best time (0.25 = 25%%)")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--save-baseline", action="store_true", help="Store the results as the baseline")
+    mode.add_argument("--compare", action="store_true", help="Exit 1 on a regression against the baseline")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    # Offline and repeatable: no OpenAI calls, no answers replayed from an earlier run
+    os.environ["OPENAI_API_KEY"] = ""
+    os.environ["LLM_CACHE_ENABLED"] = "false"
+    os.environ["VECTOR_INDEX_PATH"] = ""  # search cases build their own stores, never load a saved one
+
+    results, errors = run_suite(args.sizes, args.cases, args.runs)
+    report = {"environment": environment(), "results": results, "errors": errors}
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote {args.output}")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline) or ".", exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Saved baseline {args.baseline}")
+    elif args.compare:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get("environment") != report["environment"]:
+            print(f"WARNING: baseline recorded on {baseline.get('environment')}, "
+                  f"this run is {report['environment']}; timings may not be comparable")
+        wanted = {name for name, _ in build_cases(args.sizes)
+                  if not args.cases or any(name.startswith(prefix) for prefix in args.cases)}
+        baseline_results = {k: v for k, v in baseline["results"].items() if k in wanted}
+        rows = compare(baseline_results, results, args.tolerance)
+        flagged = [row["case"] for row in rows if row["status"] == "regressed" and row["case"] in results]
+        if flagged:
+            # A slowdown has to reproduce: one noisy stretch should not fail the gate
+            print(f"\nMeasuring again: {', '.join(flagged)}")
+            retry, _ = run_suite(args.sizes, flagged, args.runs, exact=True)
+            for name, r in retry.items():
+                if r["best_ms"] < results[name]["best_ms"]:
+                    results[name] = r
+            rows = compare(baseline_results, results, args.tolerance)
+        print()
+        for row in rows:
+            change = f"{row['change']:+.1%}" if row["change"] is not None else ""
+            print(f"{row['case']:<28} {row['status']:<10} {row['baseline_ms'] or '-':>10} ms -> "
+                  f"{row['current_ms'] or '-':>10} ms  {change}")
+        regressed = [row["case"] for row in rows if row["status"] == "regressed"]
+        if regressed:
+            print(f"\nREGRESSION (> {args.tolerance:.0%} slower or failing): {', '.join(regressed)}")
+            sys.exit(1)
+        print(f"\nNo regressions beyond {args.tolerance:.0%}.")
+
+
+if __name__ == "__main__":
+    main()
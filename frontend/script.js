@@ -148,8 +148,8 @@ analyzeBtn.addEventListener('click', async () => {
         formData.append('resume_file', selectedFile);
         formData.append('job_description', jobDescription.value.trim());
 
-        // Make API request
-        const response = await fetch(`${API_BASE_URL}/match/`, {
+        // Make API request (streamed: score first, then suggestions as they are written)
+        const response = await fetch(`${API_BASE_URL}/match/stream`, {
             method: 'POST',
             body: formData
         });
@@ -159,14 +159,25 @@ analyzeBtn.addEventListener('click', async () => {
             throw new Error(error.detail || 'Analysis failed');
         }
 
-        const data = await response.json();
-        extractedResumeText = data.resume_text || '';
-        displayResults(data);
-
-        // Scroll to results
-        setTimeout(() => {
-            results.scrollIntoView({ behavior: 'smooth', block: 'start' });
-        }, 100);
+        await readEventStream(response, (event, data) => {
+            if (event === 'match') {
+                extractedResumeText = data.resume_text || '';
+                displayMatch(data);
+                showPendingSuggestions();
+
+                // Scroll to results
+                setTimeout(() => {
+                    results.scrollIntoView({ behavior: 'smooth', block: 'start' });
+                }, 100);
+            } else if (event === 'suggestion') {
+                appendSuggestion(data);
+            } else if (event === 'done') {
+                clearPendingSuggestions();
+            } else if (event === 'error') {
+                clearPendingSuggestions();
+                throw new Error(data.detail || 'Analysis failed');
+            }
+        });
 
     } catch (error) {
         console.error('Error:', error);
@@ -180,8 +191,36 @@ analyzeBtn.addEventListener('click', async () => {
     }
 });
 
-// Display Results
-function displayResults(data) {
+// Server-Sent Events over fetch (EventSource cannot POST a file)
+async function readEventStream(response, onEvent) {
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        // Events are separated by a blank line
+        let boundary;
+        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+            const rawEvent = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+
+            let event = 'message';
+            const dataLines = [];
+            rawEvent.split('\n').forEach(line => {
+                if (line.startsWith('event:')) event = line.slice(6).trim();
+                else if (line.startsWith('data:')) dataLines.push(line.slice(5).trim());
+            });
+            if (dataLines.length) onEvent(event, JSON.parse(dataLines.join('\n')));
+        }
+    }
+}
+
+// Display Results: score and missing skills (suggestions stream in separately)
+function displayMatch(data) {
     results.style.display = 'block';
 
     // Overall Score
@@ -207,17 +246,35 @@ function displayResults(data) {
         missingSkillsSection.style.display = 'none';
     }
 
-    // Suggestions
+}
+
+// Suggestions
+function showPendingSuggestions() {
+    document.getElementById('suggestionsList').innerHTML = `
+        <div class="suggestion-item suggestion-pending" id="suggestionsPending">
+            <p>Generating suggestions...</p>
+        </div>
+    `;
+}
+
+function clearPendingSuggestions() {
+    const pending = document.getElementById('suggestionsPending');
+    if (pending) pending.remove();
+}
+
+function appendSuggestion(suggestion) {
+    const item = document.createElement('div');
+    item.className = 'suggestion-item';
+    item.innerHTML = `
+        <h5>${escapeHtml(suggestion.section)}</h5>
+        <p><strong>${escapeHtml(suggestion.suggestion)}</strong></p>
+        <small>${escapeHtml(suggestion.justification)}</small>
+    `;
+
+    // New suggestions go above the "Generating..." placeholder
     const suggestionsList = document.getElementById('suggestionsList');
-    suggestionsList.innerHTML = data.suggestions
-        .map(suggestion => `
-            <div class="suggestion-item">
-                <h5>${escapeHtml(suggestion.section)}</h5>
-                <p><strong>${escapeHtml(suggestion.suggestion)}</strong></p>
-                <small>${escapeHtml(suggestion.justification)}</small>
-            </div>
-        `)
-        .join('');
+    const pending = document.getElementById('suggestionsPending');
+    suggestionsList.insertBefore(item, pending);
 }
 
 function updateScoreBar(type, score) {
@@ -0,0 +1,32 @@
+"""
+Precompute the skill embedding table (one vector per canonical skill in
+app/data/skills.json) so the API never encodes skills on the request path.
+
+Usage:
+    python scripts/build_skill_index.py [--output vector_store/skills/skill_embeddings.npy]
+
+The table is tied to the embedding model/backend and the vocabulary; the API
+rebuilds it by itself when either changes, this just does it ahead of time.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.getcwd())
+
+from app.core.config import settings
+from app.services.skill_taxonomy import skill_taxonomy
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default=settings.SKILL_EMBEDDINGS_PATH)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    path = skill_taxonomy.build_table(args.output)
+    print(f"{len(skill_taxonomy.skills)} skills -> {path} ({os.path.getsize(path) / 1e3:.1f} KB) "
+          f"in {time.perf_counter() - started:.1f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Run the shared embedding server: one process loads the embedding model
+(EMBEDDING_MODEL_NAME / EMBEDDING_BACKEND) and every API worker encodes
+through it, so N workers hold one copy of torch and the weights.
+
+Usage:
+    python scripts/embedding_server.py [--socket /tmp/resume-ai-embeddings.sock]
+    # workers: EMBEDDING_SERVER_SOCKET=/tmp/resume-ai-embeddings.sock uvicorn app.main:app --workers 4
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.getcwd())
+
+from app.core.config import settings
+from app.services.embedding_backends import create_backend
+from app.services.embedding_server import EmbeddingServer
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--socket", default=settings.EMBEDDING_SERVER_SOCKET or "/tmp/resume-ai-embeddings.sock")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    backend = create_backend(
+        settings.EMBEDDING_BACKEND,
+        settings.EMBEDDING_MODEL_NAME,
+        settings.EMBEDDING_ONNX_DIR,
+        num_threads=settings.EMBEDDING_ONNX_THREADS
+    )
+    server = EmbeddingServer(
+        args.socket,
+        backend,
+        namespace=f"{settings.EMBEDDING_MODEL_NAME}@{settings.EMBEDDING_BACKEND}",
+        max_batch_size=settings.EMBEDDING_BATCH_MAX_SIZE,
+        max_wait_ms=settings.EMBEDDING_BATCH_MAX_WAIT_MS
+    )
+    print(f"{server.namespace} (dim {server.dimension}) loaded in {time.perf_counter() - started:.1f}s, "
+          f"listening on {args.socket}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
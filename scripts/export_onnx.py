@@ -0,0 +1,31 @@
+"""
+Export the embedding model to ONNX (fp32 + int8 dynamically quantized).
+
+Usage:
+    python scripts/export_onnx.py [--model all-MiniLM-L6-v2] [--output vector_store/onnx/all-MiniLM-L6-v2]
+
+Then set EMBEDDING_BACKEND="onnx" or "onnx-int8" (and EMBEDDING_ONNX_DIR if
+you changed --output).
+"""
+import argparse
+import os
+import sys
+
+sys.path.append(os.getcwd())
+
+from app.core.config import settings
+from app.services.embedding_backends import export_onnx
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default=settings.EMBEDDING_MODEL_NAME)
+    parser.add_argument("--output", default=settings.EMBEDDING_ONNX_DIR)
+    parser.add_argument("--no-quantize", action="store_true", help="Skip the int8 variant")
+    args = parser.parse_args()
+
+    paths = export_onnx(args.model, args.output, quantize=not args.no_quantize)
+    for variant, path in paths.items():
+        print(f"{variant}: {path} ({os.path.getsize(path) / 1e6:.1f} MB)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+"""
+Minimal OpenAI-compatible chat-completions server for local testing.
+
+Start it in-process with `FakeOpenAIServer().start()` and point
+OPENAI_BASE_URL at `server.base_url`. Requests with "stream": true get the
+content back as server-sent chunks. GET /stats returns the request and
+injected-failure counters.
+
+Run standalone (e.g. for benchmarks/load_test.py):
+    python tests/fake_openai_server.py [--port 8100] [--latency-ms 800] [--jitter-ms 200]
+                                       [--error-rate 0.05] [--shape auto]
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+DEFAULT_CONTENT = json.dumps([
+    {
+        "section": "Skills",
+        "suggestion": "Add Flask and AWS to your skills section.",
+        "justification": "Both are listed as requirements."
+    }
+])
+REFINE_CONTENT = json.dumps({
+    "summary": "Backend engineer with eight years of Python, FastAPI and PostgreSQL experience.",
+    "experience": "- Built REST APIs serving 2M requests a day\n- Cut p95 latency by 60%\n- Led a Kubernetes migration"
+})
+TEXT_CONTENT = "You should mention Docker in your skills section and quantify the impact of your API work."
+
+# Answer per shape; "auto" answers refine prompts with REFINE_CONTENT and everything else with suggestions
+SHAPES = {
+    "suggestions": DEFAULT_CONTENT,
+    "refine": REFINE_CONTENT,
+    "text": TEXT_CONTENT,                                # not JSON: the free-text fallback parsers
+    "truncated": DEFAULT_CONTENT[:len(DEFAULT_CONTENT) // 2]  # cut-off JSON
+}
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128  # load tests open many connections at once
+
+
+class FakeOpenAIServer:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, content: Optional[str] = None,
+                 delay: float = 0.0, fail_first: int = 0, fail_status: int = 500,
+                 chunk_size: int = 8, chunk_delay: float = 0.0, shape: str = "suggestions",
+                 jitter: float = 0.0, error_rate: float = 0.0, seed: Optional[int] = None):
+        if shape != "auto" and shape not in SHAPES:
+            raise ValueError(f"Unknown shape: {shape}")
+        self.content = content  # fixed answer; overrides shape
+        self.shape = shape
+        self.delay = delay
+        self.jitter = jitter            # +/- uniform seconds around delay
+        self.chunk_size = chunk_size    # characters per streamed delta ("stream": true)
+        self.chunk_delay = chunk_delay  # pause between streamed deltas
+        self.fail_first = fail_first
+        self.fail_status = fail_status
+        self.error_rate = error_rate    # share of requests answered with fail_status
+        self._random = random.Random(seed)
+
+        self.requests = 0
+        self.failures = 0
+        self.last_body = None
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+        self.httpd = _HTTPServer((host, port), self._handler_class())
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "FakeOpenAIServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                if self.path.rstrip("/") == "/stats":
+                    self._send(200, server.stats())
+                else:
+                    self._send(404, {"error": {"message": "not found", "type": "invalid_request_error"}})
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+
+                with server._lock:
+                    server.requests += 1
+                    server.last_body = body
+                    attempt = server.requests
+                    fail = attempt <= server.fail_first or server._random.random() < server.error_rate
+                    delay = max(0.0, server.delay + server._random.uniform(-server.jitter, server.jitter))
+                    if fail:
+                        server.failures += 1
+                    server.in_flight += 1
+                    server.max_in_flight = max(server.max_in_flight, server.in_flight)
+                try:
+                    if delay:
+                        time.sleep(delay)
+                    if fail:
+                        self._send(server.fail_status, {"error": {"message": "fake failure", "type": "server_error"}})
+                    elif body.get("stream"):
+                        self._send_stream(body)
+                    else:
+                        self._send(200, server.completion(body))
+                finally:
+                    with server._lock:
+                        server.in_flight -= 1
+
+            def _send(self, status: int, payload: dict):
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _send_stream(self, body: dict):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                try:
+                    for chunk in server.completion_chunks(body):
+                        self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+                        self.wfile.flush()
+                        if server.chunk_delay:
+                            time.sleep(server.chunk_delay)
+                    self.wfile.write(b"data: [DONE]\n\n")
+                    self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # client gave up (deadline)
+                self.close_connection = True
+
+        return Handler
+
+    def answer(self, body: dict) -> str:
+        if self.content is not None:
+            return self.content
+        if self.shape == "auto":
+            prompt = " ".join(str(m.get("content", "")) for m in body.get("messages", []))
+            return REFINE_CONTENT if '"summary"' in prompt else DEFAULT_CONTENT
+        return SHAPES[self.shape]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"requests": self.requests, "failures": self.failures, "max_in_flight": self.max_in_flight}
+
+    def completion_chunks(self, body: dict):
+        base = {
+            "id": "chatcmpl-fake",
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": body.get("model", "fake")
+        }
+        yield {**base, "choices": [{"index": 0, "delta": {"role": "assistant", "content": ""}, "finish_reason": None}]}
+        content = self.answer(body)
+        for i in range(0, len(content), self.chunk_size):
+            piece = content[i:i + self.chunk_size]
+            yield {**base, "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}]}
+        yield {**base, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}
+
+    def completion(self, body: dict) -> dict:
+        return {
+            "id": "chatcmpl-fake",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "fake"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": self.answer(body)},
+                "finish_reason": "stop"
+            }],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Time before each answer")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Uniform +/- around --latency-ms")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests that fail (0-1)")
+    parser.add_argument("--error-status", type=int, default=500, help="500/503 and 429 are retried by the client")
+    parser.add_argument("--shape", default="auto", choices=["auto"] + sorted(SHAPES))
+    parser.add_argument("--chunk-size", type=int, default=8, help="Characters per streamed delta")
+    parser.add_argument("--chunk-delay-ms", type=float, default=0.0)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    server = FakeOpenAIServer(host=args.host, port=args.port, delay=args.latency_ms / 1000.0,
+                              jitter=args.jitter_ms / 1000.0, error_rate=args.error_rate,
+                              fail_status=args.error_status, shape=args.shape, chunk_size=args.chunk_size,
+                              chunk_delay=args.chunk_delay_ms / 1000.0, seed=args.seed).start()
+    print(f"Fake OpenAI server listening on {server.base_url}", flush=True)
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
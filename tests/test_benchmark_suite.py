@@ -0,0 +1,50 @@
+import sys
+import os
+import time
+
+sys.path.append(os.getcwd())
+
+from app.services.resume_parser import ResumeParser
+from benchmarks.corpus import docx_bytes, job_text, pdf_bytes, resume_text
+from benchmarks.suite import DOCX, PDF, compare, measure
+
+def test_benchmark_suite():
+    print("--- Testing Benchmark Suite ---")
+
+    # 1. Synthetic PDF and DOCX resumes parse to the same text
+    print("\n[Test 1] Synthetic corpus")
+    parser = ResumeParser()
+    text = resume_text("medium")
+    from_pdf = parser.parse(pdf_bytes(text), PDF)
+    from_docx = parser.parse(docx_bytes(text), DOCX)
+    print(f"Resume: {len(text)} chars, PDF experience lines: {len(from_pdf['experience'])}")
+    if from_pdf["raw_text"] == from_docx["raw_text"] and from_pdf["experience"] and from_pdf["skills"] \
+            and resume_text("medium") == text and "Requirements:" in job_text("small"):
+        print("SUCCESS: Corpus is deterministic and parses in both formats.")
+    else:
+        print("FAILURE: Synthetic documents did not parse consistently.")
+
+    # 2. Regression gate: tolerance, failing cases and new cases
+    print("\n[Test 2] Baseline comparison")
+    baseline = {"fast": {"best_ms": 1.0}, "slow": {"best_ms": 1.0}, "gone": {"best_ms": 1.0}}
+    current = {"fast": {"best_ms": 1.1}, "slow": {"best_ms": 2.0}, "added": {"best_ms": 5.0}}
+    statuses = {row["case"]: row["status"] for row in compare(baseline, current, tolerance=0.25)}
+    print(f"Statuses: {statuses}")
+    if statuses == {"fast": "ok", "slow": "regressed", "gone": "regressed", "added": "new"}:
+        print("SUCCESS: Slowdowns and failing cases flagged.")
+    else:
+        print("FAILURE: Unexpected comparison result.")
+
+    # 3. Sub-millisecond calls are looped within a sample
+    print("\n[Test 3] Measurement")
+    result = measure(lambda: sum(range(100)), runs=5, min_sample_ms=5.0)
+    slow = measure(lambda: time.sleep(0.01), runs=3)
+    print(f"Fast: {result}, slow: {slow}")
+    if result["loops"] > 1 and slow["loops"] == 1 and slow["best_ms"] >= 10.0 \
+            and result["best_ms"] <= result["median_ms"] <= result["p95_ms"]:
+        print("SUCCESS: Per-call times with calibrated loops.")
+    else:
+        print("FAILURE: Measurement calibration wrong.")
+
+if __name__ == "__main__":
+    test_benchmark_suite()
@@ -0,0 +1,81 @@
+import sys
+import os
+import hashlib
+import numpy as np
+
+sys.path.append(os.getcwd())
+
+from app.services.embedding_service import EmbeddingService
+
+class CountingEncoder:
+    """Bag-of-words vectors (no model download) that counts forward passes."""
+    def __init__(self):
+        self.calls = 0
+
+    def encode(self, texts):
+        self.calls += 1
+        out = np.zeros((len(texts), 384), dtype="float32")
+        for i, text in enumerate(texts):
+            for word in text.lower().split():
+                out[i, int(hashlib.md5(word.encode()).hexdigest(), 16) % 384] += 1.0
+        return out
+
+def make_service():
+    service = EmbeddingService()
+    service._backend = CountingEncoder()
+    return service
+
+TEXTS = [
+    "Python developer building REST APIs",
+    "Baker of sourdough bread",
+    "Docker and Kubernetes deployments",
+    "FastAPI services with PostgreSQL",
+    "React frontend and TypeScript",
+    "Managed SQL databases",
+    "Pastry chef and cake decorator",
+    "Machine learning with PyTorch",
+    "Python data pipelines on AWS",
+    "Team lead for a mobile app"
+]
+
+def test_bulk_ingest():
+    print("--- Testing Bulk Ingest (add_many) ---")
+
+    bulk = make_service()
+    report = bulk.add_many(((text, {"row": i}) for i, text in enumerate(TEXTS)), batch_size=4)
+
+    # 1. A generator longer than one block: ids assigned as one contiguous range
+    print("\n[Test 1] Ingest across several blocks")
+    print(f"Report: {report}, forward passes: {bulk.backend.calls}")
+    if report["added"] == 10 and report["first_id"] == 0 and report["last_id"] == 9 \
+            and bulk.backend.calls == 3 and bulk.store.metadata[9]["row"] == 9:
+        print("SUCCESS: 10 texts ingested in 3 blocks with ids 0..9.")
+    else:
+        print("FAILURE: Wrong ids or block count.")
+
+    # 2. Same search results as inserting one text at a time
+    print("\n[Test 2] Matches per-item inserts")
+    single = make_service()
+    ids = [single.add_to_index(text, {"row": i}) for i, text in enumerate(TEXTS)]
+    same = ids == list(range(10))
+    for query in ["Python APIs", "bread and cake", "SQL databases"]:
+        a = [(r["id"], round(r["score"], 5)) for r in bulk.search(query, k=3)]
+        b = [(r["id"], round(r["score"], 5)) for r in single.search(query, k=3)]
+        print(f"'{query}': bulk {a}, per-item {b}")
+        same = same and a == b
+    if same:
+        print("SUCCESS: Bulk and per-item indexes return the same results.")
+    else:
+        print("FAILURE: Results differ.")
+
+    # 3. Single inserts still go through the embedding cache
+    print("\n[Test 3] add_to_index uses the cache")
+    calls = single.backend.calls
+    single.encode([TEXTS[0]])
+    if single.backend.calls == calls:
+        print("SUCCESS: Re-encoding an indexed text was a cache hit.")
+    else:
+        print("FAILURE: add_to_index bypassed the cache.")
+
+if __name__ == "__main__":
+    test_bulk_ingest()
@@ -0,0 +1,92 @@
+import sys
+import os
+import time
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.getcwd())
+
+from app.services.embedding_batcher import EmbeddingBatcher
+
+def fake_encode(texts):
+    # Vector = [len(text)] so each caller can check it got its own rows back
+    fake_encode.calls += 1
+    return np.array([[float(len(t))] for t in texts], dtype="float32")
+
+fake_encode.calls = 0
+
+def test_embedding_batcher():
+    print("--- Testing Embedding Micro-Batcher ---")
+
+    batcher = EmbeddingBatcher(fake_encode, max_batch_size=64, max_wait_ms=20)
+    requests = [["a" * (i + 1), "b" * (i + 2)] for i in range(16)]
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(pool.map(batcher.encode, requests))
+
+    # 1. Every caller gets exactly its slice
+    print("\n[Test 1] Results routed back to callers")
+    correct = all(
+        [row[0] for row in result] == [float(len(t)) for t in texts]
+        for texts, result in zip(requests, results)
+    )
+    if correct:
+        print("SUCCESS: Each caller received its own vectors.")
+    else:
+        print("FAILURE: Vectors mixed up between callers.")
+
+    # 2. Concurrent calls were merged into fewer forward passes
+    print("\n[Test 2] Requests merged")
+    stats = batcher.stats()
+    print(f"Forward passes: {fake_encode.calls} for {len(requests)} requests")
+    print(f"Batch size histogram: {stats['batch_size']}")
+    if fake_encode.calls < len(requests) and stats["wait_ms"]["count"] == len(requests):
+        print("SUCCESS: Concurrent requests shared forward passes.")
+    else:
+        print("FAILURE: No batching happened.")
+
+    # 3. Encoder errors reach every caller in the batch
+    print("\n[Test 3] Error propagation")
+    failing = EmbeddingBatcher(lambda texts: 1 / 0, max_wait_ms=1)
+    try:
+        failing.encode(["x"])
+        print("FAILURE: Error swallowed.")
+    except ZeroDivisionError:
+        print("SUCCESS: Encoder error raised to caller.")
+
+    # 4. A lone caller does not wait for company
+    print("\n[Test 4] Idle latency")
+    idle = EmbeddingBatcher(fake_encode, max_wait_ms=200)
+    idle.encode(["warm"])
+    start = time.perf_counter()
+    for _ in range(5):
+        idle.encode(["alone"])
+    per_call_ms = (time.perf_counter() - start) * 1000 / 5
+    print(f"Per call: {per_call_ms:.2f} ms (max wait 200 ms)")
+    if per_call_ms < 50:
+        print("SUCCESS: Sequential calls encoded right away.")
+    else:
+        print("FAILURE: Idle calls paid the batching wait.")
+
+    # 5. A request that does not fit is left for the next forward pass
+    print("\n[Test 5] Batch size limit")
+    sizes = []
+
+    def slow_encode(texts):
+        sizes.append(len(texts))
+        time.sleep(0.01)
+        return fake_encode(texts)
+
+    limited = EmbeddingBatcher(slow_encode, max_batch_size=8, max_wait_ms=50)
+    requests = [["c" * (i + 1)] * 3 for i in range(12)]
+    with ThreadPoolExecutor(max_workers=12) as pool:
+        results = list(pool.map(limited.encode, requests))
+    correct = all(len(result) == 3 and result[0][0] == float(len(texts[0])) for texts, result in zip(requests, results))
+    print(f"Texts per forward pass: {sizes}")
+    if correct and max(sizes) <= 8 and sum(sizes) == 36:
+        print("SUCCESS: No forward pass exceeded max_batch_size.")
+    else:
+        print("FAILURE: Batch limit exceeded or vectors lost.")
+
+if __name__ == "__main__":
+    test_embedding_batcher()
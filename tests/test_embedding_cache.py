@@ -0,0 +1,49 @@
+import sys
+import os
+import tempfile
+import numpy as np
+
+sys.path.append(os.getcwd())
+
+from app.services.embedding_cache import EmbeddingCache
+
+def test_embedding_cache():
+    print("--- Testing Embedding Cache ---")
+
+    cache_dir = tempfile.mkdtemp()
+    cache = EmbeddingCache("all-MiniLM-L6-v2", 4, max_entries=2, cache_dir=cache_dir)
+
+    # 1. Keys are whitespace-insensitive and model-specific
+    print("\n[Test 1] Content-addressed keys")
+    other_model = EmbeddingCache("other-model", 4)
+    if cache.key("Python  developer ") == cache.key("Python developer"):
+        print("SUCCESS: Normalized text shares a key.")
+    else:
+        print("FAILURE: Whitespace changed the key.")
+    if cache.key("Python") != other_model.key("Python"):
+        print("SUCCESS: Model name is part of the key.")
+    else:
+        print("FAILURE: Keys collide across models.")
+
+    # 2. Memory tier is bounded, disk tier keeps everything
+    print("\n[Test 2] LRU eviction + disk tier")
+    vectors = {cache.key(t): np.full(4, i, dtype="float32") for i, t in enumerate(["a", "b", "c"])}
+    cache.put_many(vectors)
+    print(f"Stats: {cache.stats()}")
+    if cache.stats()["memory_entries"] == 2 and cache.stats()["disk_entries"] == 3:
+        print("SUCCESS: Memory bounded, disk holds all entries.")
+    else:
+        print("FAILURE: Unexpected tier sizes.")
+
+    # 3. A fresh cache (restart) reads vectors back from the memory-mapped file
+    print("\n[Test 3] Restart survives via disk")
+    restarted = EmbeddingCache("all-MiniLM-L6-v2", 4, max_entries=2, cache_dir=cache_dir)
+    found = restarted.get_many([restarted.key("a"), restarted.key("c"), restarted.key("missing")])
+    print(f"Stats: {restarted.stats()}")
+    if len(found) == 2 and float(found[restarted.key("c")][0]) == 2.0:
+        print("SUCCESS: Vectors restored from disk.")
+    else:
+        print("FAILURE: Disk tier lost vectors.")
+
+if __name__ == "__main__":
+    test_embedding_cache()
@@ -0,0 +1,103 @@
+import sys
+import os
+import shutil
+import tempfile
+import threading
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.getcwd())
+
+from app.core.config import settings
+from app.services.embedding_backends import EmbeddingBackend
+from app.services.embedding_server import EmbeddingServer, RemoteBackend
+from app.services.embedding_service import EmbeddingService
+
+class FakeBackend(EmbeddingBackend):
+    # Vector = [len(text), first char code, 1] so rows can be checked per text
+    name = "fake"
+    calls = 0
+
+    def encode(self, texts):
+        FakeBackend.calls += 1
+        return np.array([[float(len(t)), float(ord(t[0])) if t else 0.0, 1.0] for t in texts], dtype="float32")
+
+def start_server(path: str, namespace: str = "fake-model@fake") -> EmbeddingServer:
+    server = EmbeddingServer(path, FakeBackend(), namespace=namespace, max_wait_ms=20)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def test_embedding_server():
+    print("--- Testing Shared Embedding Server ---")
+    tmp_dir = tempfile.mkdtemp()
+    path = os.path.join(tmp_dir, "embeddings.sock")
+    original = settings.model_dump()
+
+    try:
+        server = start_server(path)
+
+        # 1. Vectors over the socket equal the local backend's
+        print("\n[Test 1] Remote encode")
+        remote = RemoteBackend(path, namespace="fake-model@fake")
+        texts = ["Python", "FastAPI", "", "Kubernetes on AWS"]
+        if np.array_equal(remote.encode(texts), FakeBackend().encode(texts)) and remote.encode([]).shape == (0, 3):
+            print("SUCCESS: Remote vectors match the in-process backend.")
+        else:
+            print("FAILURE: Remote vectors differ.")
+
+        # 2. A server running another model is refused
+        print("\n[Test 2] Namespace check")
+        try:
+            RemoteBackend(path, namespace="other-model@torch")
+            print("FAILURE: Mismatched server accepted.")
+        except RuntimeError as e:
+            print(f"Refused: {e}")
+            print("SUCCESS: Vectors from another model are never used.")
+
+        # 3. Requests from many threads share forward passes on the server
+        print("\n[Test 3] Cross-client batching")
+        FakeBackend.calls = 0
+        requests = [[f"text {i}", f"line {i}"] for i in range(16)]
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            results = list(pool.map(remote.encode, requests))
+        correct = all(np.array_equal(r, FakeBackend().encode(t)) for r, t in zip(results, requests))
+        FakeBackend.calls -= len(requests)  # the reference encodes just above
+        print(f"Forward passes: {FakeBackend.calls} for {len(requests)} requests")
+        if correct and FakeBackend.calls < len(requests):
+            print("SUCCESS: Concurrent clients merged into fewer forward passes.")
+        else:
+            print("FAILURE: No batching across clients.")
+
+        # 4. The client reconnects after a server restart
+        print("\n[Test 4] Server restart")
+        server.shutdown()
+        server.server_close()
+        server = start_server(path)
+        if np.array_equal(remote.encode(["after restart"]), FakeBackend().encode(["after restart"])):
+            print("SUCCESS: Client reconnected transparently.")
+        else:
+            print("FAILURE: Client did not recover.")
+
+        # 5. EmbeddingService goes through the server when the socket is configured
+        print("\n[Test 5] EmbeddingService sidecar mode")
+        server.shutdown()
+        server.server_close()
+        settings.EMBEDDING_SERVER_SOCKET = path
+        settings.EMBEDDING_MODEL_NAME = "fake-model"
+        settings.EMBEDDING_BACKEND = "fake"
+        server = start_server(path)
+        service = EmbeddingService()
+        vectors = service.encode(["Python", "Python", "Docker"])
+        if isinstance(service.backend, RemoteBackend) and np.array_equal(vectors, FakeBackend().encode(["Python", "Python", "Docker"])):
+            print("SUCCESS: Service encodes through the shared server.")
+        else:
+            print("FAILURE: Service did not use the server.")
+        server.shutdown()
+        server.server_close()
+    finally:
+        for key, value in original.items():
+            setattr(settings, key, value)
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    test_embedding_server()
@@ -38,12 +38,12 @@ def test_embeddings():
     
     print(f"Found {len(results)} results:")
     for res in results:
-        print(f"ID: {res['id']}, Score (L2): {res['score']:.4f}")
+        print(f"ID: {res['id']}, Score (cosine): {res['score']:.4f}")
         print(f"Text: {res['metadata']['text']}")
         
     # Validation
     # "Python Developer" should be closest to "Python web developer"
-    # L2 score: Lower is better.
+    # Cosine score: higher is better.
     
     first_match_text = results[0]['metadata']['text']
     if "Python" in first_match_text:
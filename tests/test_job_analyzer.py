@@ -0,0 +1,131 @@
+import sys
+import os
+import asyncio
+import random
+import re
+
+sys.path.append(os.getcwd())
+
+from fastapi.testclient import TestClient
+from app.core.concurrency import shutdown_pools
+from app.core.config import settings
+from app.main import app
+from app.services.job_analyzer import JobAnalyzer, job_analyzer
+
+class LegacyJobAnalyzer:
+    """Reference: the regex-per-section implementation the lexer replaced."""
+
+    def analyze(self, text):
+        text = text.replace('\xa0', ' ')
+        text = re.sub(r'[ \t]+', ' ', text)
+        text = re.sub(r'\n+', '\n', text).strip()
+        return {
+            "raw_text": text,
+            "required_skills": self._section(text, r"(?im)^[\s]*(requirements|required skills|what we look for|qualifications)[\s:]*$",
+                                             r"(?im)^[\s]*(responsibilities|requirements|preferred|benefits|about)[\s:]*$"),
+            "preferred_skills": self._section(text, r"(?im)^[\s]*(preferred skills|nice to have|bonus points|desired)[\s:]*$",
+                                              r"(?im)^[\s]*(responsibilities|requirements|preferred|benefits|about)[\s:]*$"),
+            "responsibilities": self._section(text, r"(?im)^[\s]*(responsibilities|what you will do|duties|role overview)[\s:]*$",
+                                              r"(?im)^[\s]*(requirements|preferred|benefits|about)[\s:]*$")
+        }
+
+    def _section(self, text, pattern, next_header_pattern):
+        items = []
+        match = re.search(pattern, text)
+        if not match:
+            return items
+        start_idx = match.end()
+        next_match = re.search(next_header_pattern, text[start_idx:])
+        end_idx = start_idx + next_match.start() if next_match else len(text)
+        for line in text[start_idx:end_idx].strip().split('\n'):
+            line = re.sub(r'^[\-\*•\d\.]+\s*', '', line.strip())
+            if line:
+                items.append(line)
+        return items
+
+HEADERS = ["Requirements", "REQUIRED SKILLS", "What we look for", "Qualifications:", "Preferred Skills",
+           "Nice to have", "Bonus Points:", "desired", "Responsibilities", "What you will do:", "Duties",
+           "Role Overview", "Preferred", "Benefits", "About", "About the company", "Requirements include"]
+LINES = ["- Python", "* FastAPI", "• Docker", "1. AWS", "Strong SQL skills", "  ", ":", " : ", "\t- Kubernetes",
+         "Build APIs", "Requirements are flexible", "", "\xa0\xa0", "2.3 Terraform"]
+
+def random_posting(rng: random.Random) -> str:
+    parts = []
+    for _ in range(rng.randint(0, 25)):
+        if rng.random() < 0.3:
+            header = rng.choice(HEADERS)
+            parts.append(rng.choice(["", " ", "\t", "\n"]) + header + rng.choice(["", " ", ":", " :\n", "\n\n"]))
+        else:
+            parts.append(rng.choice(LINES))
+    return rng.choice(["\n", "\n\n", "\r\n"]).join(parts)
+
+def test_job_analyzer():
+    print("--- Testing Job Analyzer Lexer ---")
+
+    analyzer = JobAnalyzer()
+    legacy = LegacyJobAnalyzer()
+
+    # 1. Same output as the legacy implementation on a fuzzed corpus
+    print("\n[Test 1] Equivalence with legacy extraction")
+    rng = random.Random(11)
+    corpus = [random_posting(rng) for _ in range(3000)]
+    def sections(result):
+        return {key: result[key] for key in ("raw_text", "required_skills", "preferred_skills", "responsibilities")}
+    mismatches = [text for text in corpus if sections(analyzer.analyze(text)) != legacy.analyze(text)]
+    if not mismatches:
+        print(f"SUCCESS: {len(corpus)} postings extracted identically.")
+    else:
+        print(f"FAILURE: {len(mismatches)} postings differ, e.g. {mismatches[0]!r}")
+
+    # 2. Memoized results are copies
+    print("\n[Test 2] Memoization")
+    text = "Requirements:\n- Python\n- SQL\nBenefits\nHealth"
+    first = analyzer.analyze(text)
+    first["required_skills"].append("Mutated")
+    second = analyzer.analyze("Requirements:\n\n- Python\n- SQL\nBenefits\nHealth")  # same after normalization
+    stats = analyzer.cache_stats()
+    if second["required_skills"] == ["Python", "SQL"] and stats["hits"] >= 1:
+        print(f"SUCCESS: Cache hit returned an isolated copy ({stats}).")
+    else:
+        print(f"FAILURE: Unexpected cached result {second} ({stats}).")
+
+    # 3. One cache entry per posting: a full catalog fits and repeats hit
+    print("\n[Test 3] Cache footprint")
+    small = JobAnalyzer()
+    small._cache.maxsize = 10
+    catalog = [f"Requirements:\n- Skill {i}" for i in range(10)]
+    for text in catalog:
+        small.analyze(text)
+    misses = small.cache_stats()["misses"]
+    for text in catalog:
+        small.analyze(text)
+    stats = small.cache_stats()
+    if stats["misses"] == misses and stats["hits"] == len(catalog):
+        print(f"SUCCESS: Second pass over {len(catalog)} postings all hits ({stats}).")
+    else:
+        print(f"FAILURE: Catalog evicted itself ({stats}).")
+
+    # 4. Process parse pool: analysis crosses the process boundary, the memo stays here
+    print("\n[Test 4] Process pool")
+    kind = settings.PARSE_POOL_KIND
+    settings.PARSE_POOL_KIND = "process"
+    shutdown_pools()
+    try:
+        posting = "Requirements:\n- Python\n- Docker\nResponsibilities\n- Build APIs"
+        response = TestClient(app).post("/api/v1/job/analyze", json={"description": posting})
+        hits = job_analyzer.cache_stats()["hits"]
+        batch = asyncio.run(job_analyzer.aanalyze_many([posting, "Requirements:\n- Go", posting]))
+        stats = job_analyzer.cache_stats()
+    finally:
+        shutdown_pools()
+        settings.PARSE_POOL_KIND = kind
+    print(f"Status: {response.status_code}, batch: {[job['required_skills'] for job in batch]}, cache: {stats}")
+    if response.status_code == 200 and response.json()["required_skills"] == ["Python", "Docker"] \
+            and [job["required_skills"] for job in batch] == [["Python", "Docker"], ["Go"], ["Python", "Docker"]] \
+            and stats["hits"] == hits + 1 and batch[0] is not batch[2]:
+        print("SUCCESS: Job analysis runs in worker processes, memoized in the server.")
+    else:
+        print("FAILURE: Process pool analysis failed.")
+
+if __name__ == "__main__":
+    test_job_analyzer()
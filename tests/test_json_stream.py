@@ -0,0 +1,78 @@
+import sys
+import os
+import json
+
+sys.path.append(os.getcwd())
+
+from app.services.tailoring_service import TailoringService
+from app.utils.json_stream import JSONArrayStream
+
+def test_json_stream():
+    print("--- Testing Incremental JSON Array Parser ---")
+
+    suggestions = [
+        {"section": "Skills", "suggestion": "Add \"Flask\" [and] {AWS}", "justification": "a, b\\\\c"},
+        {"section": "Experience", "suggestion": "Nested", "justification": {"refs": [1, [2]]}}
+    ]
+    text = "Sure, here you go:\n```json\n" + json.dumps(suggestions, indent=2) + "\n```"
+
+    # 1. Elements come out as soon as they close, whatever the chunking
+    print("\n[Test 1] Token-sized chunks")
+    stream = JSONArrayStream()
+    emitted_at = []
+    received = []
+    for i in range(0, len(text), 3):
+        items = stream.feed(text[i:i + 3])
+        if items:
+            emitted_at.append(i + 3)
+            received.extend(items)
+    first_close = text.index("}", text.index('"justification"')) + 1
+    if received == suggestions and stream.finished and emitted_at[0] < first_close + 3:
+        print("SUCCESS: Elements parsed incrementally, brackets/quotes in strings handled.")
+    else:
+        print(f"FAILURE: received={received}, emitted_at={emitted_at}")
+
+    # 2. Truncated array keeps the complete elements only
+    print("\n[Test 2] Truncated output")
+    stream = JSONArrayStream()
+    items = stream.feed(text[:text.index("Nested")])
+    if items == suggestions[:1] and not stream.finished:
+        print("SUCCESS: Partial element held back.")
+    else:
+        print(f"FAILURE: {items}")
+
+    # 3. No array at all
+    print("\n[Test 3] Plain text")
+    stream = JSONArrayStream()
+    if stream.feed("1. Add Flask\n2. Add AWS") == [] and not stream.started:
+        print("SUCCESS: Plain text left for the fallback parser.")
+    else:
+        print("FAILURE: Plain text misparsed.")
+
+    # 4. Brackets in a prose preamble are not the answer
+    print("\n[Test 4] Prose preamble with brackets")
+    answer = "Here are [3] tips [see below]:\n" + json.dumps(suggestions)
+    stream = JSONArrayStream()
+    received = [item for i in range(0, len(answer), 4) for item in stream.feed(answer[i:i + 4])]
+    service = TailoringService()
+    if received == suggestions and stream.finished and service._suggestions_from_text(answer) == suggestions \
+            and not TailoringService._is_suggestions_array("Here are [3] tips") \
+            and TailoringService._is_suggestions_array(answer):
+        print("SUCCESS: Skipped to the array of objects.")
+    else:
+        print(f"FAILURE: {received}")
+
+    # 5. Arrays of strings are not suggestions
+    print("\n[Test 5] String array")
+    answer = '["Add Flask to your skills", "Quantify your impact"]'
+    stream = JSONArrayStream()
+    items = stream.feed(answer)
+    fallback = TailoringService()._suggestions_from_text(answer)
+    if items == [] and not stream.started and not TailoringService._is_suggestions_array(answer) \
+            and fallback and all(isinstance(item, dict) for item in fallback):
+        print(f"SUCCESS: Left to the text fallback ({len(fallback)} suggestions).")
+    else:
+        print(f"FAILURE: items={items}, fallback={fallback}")
+
+if __name__ == "__main__":
+    test_json_stream()
@@ -0,0 +1,44 @@
+import sys
+import os
+
+sys.path.append(os.getcwd())
+
+from app.utils.keywords import KeywordMatcher
+from app.services.matching_engine import MatchingEngine
+
+def test_keyword_matcher():
+    print("--- Testing Keyword Matcher ---")
+
+    text = "Built JavaScript UIs and Java services.\nMachine  Learning with C++ and Node.js; CI/CD on AWS."
+    matcher = KeywordMatcher(["Java", "JavaScript", "machine learning", "learning", "C++", "node.js", "ci/cd", "Go"])
+    hits = matcher.find(text)
+    print(f"Hits: {hits}")
+
+    # 1. Word boundaries: "Java" is not found inside "JavaScript"
+    print("\n[Test 1] Word boundaries")
+    if hits.get("Java") == [text.index("Java services")] and hits.get("JavaScript") == [text.index("JavaScript")]:
+        print("SUCCESS: Java and JavaScript matched separately.")
+    else:
+        print("FAILURE: Boundary handling wrong.")
+
+    # 2. Case-insensitive multi-word and symbol keywords, overlaps included
+    print("\n[Test 2] Multi-token keywords")
+    expected = {"machine learning", "learning", "C++", "node.js", "ci/cd"}
+    if expected <= set(hits) and "Go" not in hits:
+        print("SUCCESS: Phrases, symbols and overlapping keywords found.")
+    else:
+        print(f"FAILURE: Missing {expected - set(hits)}.")
+
+    # 3. Engine reuses the automaton for the same job keywords
+    print("\n[Test 3] Automaton cached per job")
+    engine = MatchingEngine()
+    keywords = ["Java", "AWS", "Kubernetes"]
+    score = engine._calculate_keyword_match(text, keywords)
+    again = engine._calculate_keyword_match("JavaScript only", keywords)
+    if engine.keyword_matcher(keywords) is engine.keyword_matcher(list(keywords)) and abs(score - 2 / 3) < 1e-9 and again == 0.0:
+        print(f"SUCCESS: Keyword score {score:.2f}, matcher reused.")
+    else:
+        print(f"FAILURE: score={score}, again={again}.")
+
+if __name__ == "__main__":
+    test_keyword_matcher()
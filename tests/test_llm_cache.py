@@ -0,0 +1,127 @@
+import sys
+import os
+import asyncio
+import shutil
+import tempfile
+import time
+
+sys.path.append(os.getcwd())
+sys.path.append(os.path.dirname(__file__))
+
+from app.core.config import settings
+from app.services.llm_cache import LLMResponseCache
+from app.services.tailoring_service import TailoringService
+from fake_openai_server import FakeOpenAIServer
+
+def test_llm_cache():
+    print("--- Testing LLM Response Cache ---")
+    original = settings.model_dump()
+    tmp_dir = tempfile.mkdtemp()
+    path = os.path.join(tmp_dir, "llm_cache.sqlite3")
+
+    try:
+        # 1. Answers survive a restart (new instance, same file)
+        print("\n[Test 1] Persistence")
+        key = LLMResponseCache.make_key("gpt", 0.0, "system", "prompt", 500)
+        LLMResponseCache(path, ttl_seconds=60, max_entries=100).set(key, "answer")
+        reopened = LLMResponseCache(path, ttl_seconds=60, max_entries=100)
+        other_key = LLMResponseCache.make_key("gpt", 0.7, "system", "prompt", 500)
+        if reopened.get(key) == "answer" and reopened.get(other_key) is None:
+            print("SUCCESS: Answer read back from disk; other temperature is a different key.")
+        else:
+            print("FAILURE: Persistence or keying broken.")
+
+        # 2. TTL
+        print("\n[Test 2] Expiry")
+        expiring = LLMResponseCache(os.path.join(tmp_dir, "ttl.sqlite3"), ttl_seconds=0.05, max_entries=100)
+        expiring.set("k", "v")
+        time.sleep(0.1)
+        fresh = LLMResponseCache(expiring.path, ttl_seconds=0.05, max_entries=100)  # cold memory tier
+        if expiring.get("k") is None and fresh.get("k") is None:
+            print("SUCCESS: Expired answers are not served.")
+        else:
+            print("FAILURE: Expired answer served.")
+
+        # 3. Size bound keeps the most recently used entries
+        print("\n[Test 3] Size eviction")
+        bounded = LLMResponseCache(os.path.join(tmp_dir, "size.sqlite3"), ttl_seconds=60, max_entries=10)
+        for i in range(200):
+            bounded.set(f"k{i}", f"v{i}")
+        bounded.evict()
+        print(f"Rows kept: {len(bounded)}")
+        if len(bounded) == 10 and LLMResponseCache(bounded.path, 60, 10).get("k199") == "v199":
+            print("SUCCESS: Oldest entries evicted.")
+        else:
+            print("FAILURE: Size bound not applied.")
+
+        # 4. Lookup overhead
+        print("\n[Test 4] Lookup latency")
+        cache = LLMResponseCache(path, ttl_seconds=60, max_entries=100)
+        keys = [LLMResponseCache.make_key("gpt", 0.0, "system", f"prompt {i}", 500) for i in range(50)]
+        for k in keys:
+            cache.set(k, "x" * 2000)
+        cold = LLMResponseCache(path, ttl_seconds=60, max_entries=100)
+        start = time.perf_counter()
+        for k in keys:
+            cold.get(k)  # SQLite
+        disk_ms = (time.perf_counter() - start) * 1000 / len(keys)
+        start = time.perf_counter()
+        for k in keys:
+            cold.get(k)  # memory tier
+        memory_ms = (time.perf_counter() - start) * 1000 / len(keys)
+        print(f"Disk hit: {disk_ms:.3f} ms, memory hit: {memory_ms:.4f} ms")
+        if disk_ms < 1.0 and memory_ms < 0.1:
+            print("SUCCESS: Sub-millisecond lookups.")
+        else:
+            print("FAILURE: Lookups too slow.")
+
+        # 5. Service: repeated prompts are answered from the cache, streaming included
+        print("\n[Test 5] Tailoring service integration")
+        server = FakeOpenAIServer().start()
+        settings.OPENAI_API_KEY = "test-key"
+        settings.OPENAI_BASE_URL = server.base_url
+        settings.LLM_CACHE_ENABLED = True
+        settings.LLM_CACHE_PATH = os.path.join(tmp_dir, "service.sqlite3")
+        settings.LLM_DETERMINISTIC = True
+        service = TailoringService()
+
+        async def run():
+            first, _ = await service.agenerate_suggestions("Python dev", "Flask job", ["Flask"])
+            second, _ = await service.agenerate_suggestions("Python dev", "Flask job", ["Flask"])
+            streamed = [s async for s in service.astream_suggestions("Python dev", "Flask job", ["Flask"])]
+            return first, second, streamed
+
+        first, second, streamed = asyncio.run(run())
+        server.stop()
+        print(f"Requests: {server.requests}, temperature: {server.last_body['temperature']}, stats: {service.cache_stats()}")
+        if server.requests == 1 and first == second == streamed and server.last_body["temperature"] == 0.0:
+            print("SUCCESS: One upstream call served three requests.")
+        else:
+            print("FAILURE: Cache not used by the service.")
+
+        # 6. Sampled answers (default temperature) are never replayed
+        print("\n[Test 6] Non-deterministic mode")
+        server = FakeOpenAIServer().start()
+        settings.OPENAI_BASE_URL = server.base_url
+        settings.LLM_CACHE_PATH = os.path.join(tmp_dir, "sampled.sqlite3")
+        settings.LLM_DETERMINISTIC = False
+        service = TailoringService()
+
+        async def run_sampled():
+            for _ in range(2):
+                await service.agenerate_suggestions("Python dev", "Flask job", ["Flask"])
+
+        asyncio.run(run_sampled())
+        server.stop()
+        print(f"Requests: {server.requests}, temperature: {server.last_body['temperature']}")
+        if server.requests == 2 and service.cache_stats() is None and not os.path.exists(settings.LLM_CACHE_PATH):
+            print("SUCCESS: Each request got a fresh answer; no cache opened.")
+        else:
+            print("FAILURE: Sampled answer cached.")
+    finally:
+        for key, value in original.items():
+            setattr(settings, key, value)
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    test_llm_cache()
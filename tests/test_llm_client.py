@@ -0,0 +1,125 @@
+import sys
+import os
+import asyncio
+import json
+import subprocess
+import time
+
+sys.path.append(os.getcwd())
+sys.path.append(os.path.dirname(__file__))
+
+from app.core.config import settings
+from app.services.tailoring_service import TailoringService
+from fake_openai_server import FakeOpenAIServer
+
+def make_service(server: FakeOpenAIServer, **overrides) -> TailoringService:
+    settings.OPENAI_API_KEY = "test-key"
+    settings.OPENAI_BASE_URL = server.base_url
+    settings.LLM_CACHE_ENABLED = False  # Every call below must reach the server
+    for key, value in overrides.items():
+        setattr(settings, key, value)
+    return TailoringService()
+
+def test_llm_client():
+    print("--- Testing Async LLM Client (fake OpenAI server) ---")
+    original = settings.model_dump()
+    missing_skills = ["Flask", "AWS"]
+
+    try:
+        # 1. Happy path: JSON suggestions come back from the server
+        print("\n[Test 1] Completion parsed")
+        server = FakeOpenAIServer().start()
+        service = make_service(server)
+        suggestions, _ = asyncio.run(service.agenerate_suggestions("Python dev", "Flask job", missing_skills))
+        server.stop()
+        print(f"Suggestions: {suggestions}")
+        if "Flask" in suggestions[0]["suggestion"] and server.requests == 1:
+            print("SUCCESS: Suggestions returned by the server.")
+        else:
+            print("FAILURE: Unexpected suggestions.")
+
+        # 2. Transient 500s are retried within the budget
+        print("\n[Test 2] Bounded retries")
+        server = FakeOpenAIServer(fail_first=2).start()
+        service = make_service(server, LLM_MAX_RETRIES=2, LLM_RETRY_BACKOFF_SECONDS=0.01)
+        suggestions, _ = asyncio.run(service.agenerate_suggestions("Python dev", "Flask job", missing_skills))
+        server.stop()
+        print(f"Requests made: {server.requests}")
+        if server.requests == 3 and suggestions[0]["justification"] != "Demonstrating practical application increases relevance score.":
+            print("SUCCESS: Recovered after retries.")
+        else:
+            print("FAILURE: Retry behaviour unexpected.")
+
+        # 3. Deadline passes -> mock suggestions, quickly
+        print("\n[Test 3] Deadline fallback")
+        server = FakeOpenAIServer(delay=2.0).start()
+        service = make_service(server, LLM_TIMEOUT_SECONDS=0.3)
+        start = time.perf_counter()
+        suggestions, _ = asyncio.run(service.agenerate_suggestions("Python dev", "Flask job", missing_skills))
+        elapsed = time.perf_counter() - start
+        server.stop()
+        print(f"Elapsed: {elapsed:.2f}s")
+        if elapsed < 1.0 and suggestions == service._mock_suggestions(missing_skills):
+            print("SUCCESS: Fell back to mock suggestions before the slow server answered.")
+        else:
+            print("FAILURE: Deadline not enforced.")
+
+        # 4. Semaphore caps in-flight calls
+        print("\n[Test 4] Concurrency cap")
+        server = FakeOpenAIServer(delay=0.2).start()
+        service = make_service(server, LLM_TIMEOUT_SECONDS=10.0, LLM_MAX_CONCURRENCY=2)
+
+        async def burst():
+            await asyncio.gather(*[
+                service.agenerate_suggestions("Python dev", "Flask job", missing_skills) for _ in range(6)
+            ])
+
+        asyncio.run(burst())
+        server.stop()
+        print(f"Max in-flight seen by server: {server.max_in_flight}")
+        if server.max_in_flight <= 2 and server.requests == 6:
+            print("SUCCESS: Concurrent LLM calls capped.")
+        else:
+            print("FAILURE: Concurrency cap not applied.")
+
+        # 5. Streaming: suggestions arrive one by one, before the completion ends
+        print("\n[Test 5] Streamed suggestions")
+        content = json.dumps([
+            {"section": f"Section {i}", "suggestion": "Quantify impact " * 4, "justification": "Clearer value."}
+            for i in range(3)
+        ])
+        server = FakeOpenAIServer(content=content, chunk_size=4, chunk_delay=0.005).start()
+        service = make_service(server, LLM_TIMEOUT_SECONDS=10.0)
+
+        async def consume():
+            started = time.perf_counter()
+            arrivals = []
+            async for suggestion in service.astream_suggestions("Python dev", "Flask job", missing_skills):
+                arrivals.append((time.perf_counter() - started, suggestion["section"]))
+            return arrivals, time.perf_counter() - started
+
+        arrivals, total = asyncio.run(consume())
+        server.stop()
+        print(f"Arrivals: {[(round(t, 3), s) for t, s in arrivals]} of {total:.3f}s")
+        if [s for _, s in arrivals] == ["Section 0", "Section 1", "Section 2"] and arrivals[0][0] < total * 0.6:
+            print("SUCCESS: First suggestion delivered well before the stream ended.")
+        else:
+            print("FAILURE: Suggestions not streamed.")
+
+        # 6. A configured key does not import the client library at startup
+        print("\n[Test 6] Lazy client")
+        probe = ("import sys, app.main; from app.services.tailoring_service import tailoring_service as t; "
+                 "before = 'openai' in sys.modules; t.client; print(before, 'openai' in sys.modules)")
+        result = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True,
+                                env={**os.environ, "OPENAI_API_KEY": "test-key"})
+        print(f"openai imported at startup / after first use: {result.stdout.strip()}")
+        if result.stdout.strip().endswith("False True"):
+            print("SUCCESS: Client built on first use.")
+        else:
+            print(f"FAILURE: {result.stdout.strip() or result.stderr[-300:]}")
+    finally:
+        for key, value in original.items():
+            setattr(settings, key, value)
+
+if __name__ == "__main__":
+    test_llm_client()
@@ -0,0 +1,66 @@
+import sys
+import os
+import json
+
+sys.path.append(os.getcwd())
+sys.path.append(os.path.join(os.getcwd(), "tests"))
+
+import httpx
+from fake_openai_server import REFINE_CONTENT, FakeOpenAIServer
+from benchmarks.load_test import percentile, saturation
+
+def chat(server, prompt):
+    return httpx.post(f"{server.base_url}/chat/completions",
+                      json={"model": "fake", "messages": [{"role": "user", "content": prompt}]})
+
+def test_load_test():
+    print("--- Testing Load Test Harness ---")
+
+    # 1. Fake server injects failures at the configured rate and reports them
+    print("\n[Test 1] Error rate")
+    server = FakeOpenAIServer(error_rate=0.2, fail_status=503, seed=3).start()
+    try:
+        statuses = [chat(server, "hello").status_code for _ in range(200)]
+        stats = httpx.get(server.base_url.replace("/v1", "/stats")).json()
+    finally:
+        server.stop()
+    failures = statuses.count(503)
+    print(f"Failures: {failures}/200, server stats: {stats}")
+    if 20 <= failures <= 60 and stats["failures"] == failures and stats["requests"] == 200:
+        print("SUCCESS: Failures injected and counted.")
+    else:
+        print("FAILURE: Error injection off.")
+
+    # 2. Response shape follows the prompt in auto mode
+    print("\n[Test 2] Response shape")
+    server = FakeOpenAIServer(shape="auto", delay=0.05, jitter=0.02).start()
+    try:
+        refine = chat(server, 'Output JSON with these exact keys: {"summary": "...", "experience": "..."}').json()
+        suggestions = chat(server, "Provide 3 specific suggestions").json()
+    finally:
+        server.stop()
+    refine_text = refine["choices"][0]["message"]["content"]
+    suggestions_text = suggestions["choices"][0]["message"]["content"]
+    if refine_text == REFINE_CONTENT and isinstance(json.loads(suggestions_text), list):
+        print("SUCCESS: Refine and suggestion prompts answered in their shapes.")
+    else:
+        print("FAILURE: Wrong answer shape.")
+
+    # 3. Saturation point: throughput plateau, unhealthy steps ignored
+    print("\n[Test 3] Saturation")
+    steps = [
+        {"concurrency": 1, "throughput_rps": 2.0, "error_rate": 0.0, "p95_ms": 600.0},
+        {"concurrency": 4, "throughput_rps": 7.5, "error_rate": 0.0, "p95_ms": 700.0},
+        {"concurrency": 16, "throughput_rps": 8.0, "error_rate": 0.0, "p95_ms": 2100.0},
+        {"concurrency": 32, "throughput_rps": 12.0, "error_rate": 0.2, "p95_ms": 900.0}
+    ]
+    knee = saturation(steps, max_error_rate=0.01)
+    print(f"Knee: {knee}")
+    if knee == {"ceiling_rps": 8.0, "concurrency": 4, "throughput_rps": 7.5, "p95_ms": 700.0} \
+            and percentile([1, 2, 3, 4, 100], 0.5) == 3 and saturation(steps[3:], 0.01) is None:
+        print("SUCCESS: Saturation found where throughput stops growing.")
+    else:
+        print("FAILURE: Wrong saturation point.")
+
+if __name__ == "__main__":
+    test_load_test()
@@ -0,0 +1,96 @@
+import sys
+import os
+import asyncio
+
+sys.path.append(os.getcwd())
+
+from app.services.match_queue import MatchQueue, QueueFullError
+
+def test_match_queue():
+    print("--- Testing Async Match Job Queue ---")
+
+    async def scenario():
+        queue = MatchQueue(workers=2, max_size=3, result_ttl=60, max_results=100)
+        in_flight = {"now": 0, "max": 0}
+        cleaned = []
+
+        async def pipeline(value):
+            in_flight["now"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["now"])
+            await asyncio.sleep(0.05)
+            in_flight["now"] -= 1
+            if value == "boom":
+                raise ValueError("pipeline failed")
+            return {"value": value}
+
+        def submit(value):
+            return queue.submit(lambda: pipeline(value), cleanup=lambda: cleaned.append(value))
+
+        async def wait(job):
+            while queue.get(job.id).status in ("queued", "running"):
+                await asyncio.sleep(0.01)
+            return queue.get(job.id).to_dict()
+
+        results = {}
+
+        # 1. Submit returns at once; the result is pollable afterwards
+        job = submit("a")
+        results["submitted_status"] = job.status
+        results["done"] = await wait(job)
+
+        # 2. Workers cap concurrency; 3. a full queue refuses new jobs
+        jobs = [submit(f"job{i}") for i in range(2)]  # picked up by the two workers
+        await asyncio.sleep(0.01)
+        jobs += [submit(f"queued{i}") for i in range(3)]  # fills the queue
+        try:
+            submit("overflow")
+            results["rejected"] = None
+        except QueueFullError as e:
+            results["rejected"] = e.retry_after
+        for job in jobs:
+            await wait(job)
+
+        # 4. Failures are reported, not raised
+        results["failed"] = await wait(submit("boom"))
+        results["max_in_flight"] = in_flight["max"]
+        results["cleaned"] = cleaned
+        results["stats"] = queue.stats()
+        await queue.shutdown()
+        return results
+
+    results = asyncio.run(scenario())
+
+    print("\n[Test 1] Submit and poll")
+    print(f"Status at submit: {results['submitted_status']}, final: {results['done']}")
+    if results["submitted_status"] == "queued" and results["done"]["status"] == "done" and results["done"]["result"] == {"value": "a"}:
+        print("SUCCESS: Job id returned immediately, result available when done.")
+    else:
+        print("FAILURE: Submit/poll flow broken.")
+
+    print("\n[Test 2] Bounded workers")
+    print(f"Max in flight: {results['max_in_flight']}")
+    if results["max_in_flight"] == 2:
+        print("SUCCESS: At most two pipelines ran at once.")
+    else:
+        print("FAILURE: Worker bound not applied.")
+
+    print("\n[Test 3] Backpressure")
+    stats = results["stats"]
+    print(f"Retry-After: {results['rejected']}, rejected: {stats['rejected']}")
+    if results["rejected"] and stats["rejected"] == 1 and "overflow" in results["cleaned"]:
+        print("SUCCESS: Full queue refused the job and released its upload.")
+    else:
+        print("FAILURE: Queue accepted more than its capacity.")
+
+    print("\n[Test 4] Failures and metrics")
+    print(f"Failed job: {results['failed']}")
+    print(f"Stats: completed={stats['completed']} failed={stats['failed']} waits={stats['wait_ms']['count']}")
+    if (results["failed"]["status"] == "failed" and results["failed"]["error"] == "pipeline failed"
+            and stats["completed"] == 6 and stats["failed"] == 1 and stats["wait_ms"]["count"] == 7
+            and len(results["cleaned"]) == 8):
+        print("SUCCESS: Failure reported; wait/run times recorded for every job.")
+    else:
+        print("FAILURE: Unexpected metrics.")
+
+if __name__ == "__main__":
+    test_match_queue()
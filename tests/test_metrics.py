@@ -0,0 +1,87 @@
+import sys
+import os
+import time
+
+sys.path.append(os.getcwd())
+
+from fastapi.testclient import TestClient
+from app.core.metrics import MetricsRegistry, stage_seconds, stage_timer, timed
+from app.main import app
+
+def test_metrics():
+    print("--- Testing Prometheus Metrics ---")
+
+    # 1. Histogram exposition: cumulative buckets, sum and count
+    print("\n[Test 1] Histogram format")
+    registry = MetricsRegistry()
+    latency = registry.histogram("demo_seconds", "Demo latency.", (0.1, 1), label="stage")
+    for value in (0.05, 0.5, 5):
+        latency.observe("parse", value)
+    text = registry.render()
+    print(text)
+    expected = ['demo_seconds_bucket{stage="parse",le="0.1"} 1', 'demo_seconds_bucket{stage="parse",le="1"} 2',
+                'demo_seconds_bucket{stage="parse",le="+Inf"} 3', 'demo_seconds_count{stage="parse"} 3',
+                "# TYPE demo_seconds histogram"]
+    if all(line in text for line in expected):
+        print("SUCCESS: Prometheus histogram rendered.")
+    else:
+        print("FAILURE: Unexpected exposition format.")
+
+    # 2. Timers record successful and failing calls
+    print("\n[Test 2] Stage timers")
+
+    @timed("test_stage")
+    def failing():
+        raise ValueError("boom")
+
+    with stage_timer("test_stage"):
+        time.sleep(0.01)
+    try:
+        failing()
+    except ValueError:
+        pass
+    snapshot = stage_seconds.labels("test_stage").snapshot()
+    print(f"Observations: {snapshot['count']}, sum: {snapshot['sum']}")
+    if snapshot["count"] == 2 and snapshot["sum"] >= 0.01:
+        print("SUCCESS: Both blocks timed, exceptions included.")
+    else:
+        print("FAILURE: Stage timings missing.")
+
+    # 3. Overhead on the hot path
+    print("\n[Test 3] Instrumentation overhead")
+
+    def plain():
+        return 1
+
+    instrumented = timed("overhead")(plain)
+    runs = 100_000
+    start = time.perf_counter()
+    for _ in range(runs):
+        plain()
+    baseline = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(runs):
+        instrumented()
+    overhead_us = (time.perf_counter() - start - baseline) / runs * 1e6
+    print(f"Overhead per call: {overhead_us:.2f} us")
+    if overhead_us < 5:
+        print("SUCCESS: Negligible overhead next to millisecond stages.")
+    else:
+        print("FAILURE: Instrumentation too slow.")
+
+    # 4. Endpoint: content type, pipeline families, in-flight gauge
+    print("\n[Test 4] /metrics endpoint")
+    client = TestClient(app)
+    response = client.get("/metrics")
+    body = response.text
+    families = ["resume_ai_stage_seconds", "resume_ai_llm_fallbacks_total", "resume_ai_cache_hits_total",
+                "resume_ai_http_requests_in_flight 1"]
+    print(f"Content-Type: {response.headers['content-type']}")
+    if response.status_code == 200 and response.headers["content-type"].startswith("text/plain; version=0.0.4") \
+            and all(family in body for family in families):
+        print("SUCCESS: Metrics exposed for Prometheus.")
+    else:
+        print("FAILURE: /metrics incomplete.")
+
+if __name__ == "__main__":
+    test_metrics()
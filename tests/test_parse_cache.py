@@ -0,0 +1,44 @@
+import sys
+import os
+import time
+
+sys.path.append(os.getcwd())
+
+from app.services.parse_cache import ParseCache
+
+def test_parse_cache():
+    print("--- Testing Parse Cache ---")
+
+    cache = ParseCache(maxsize=2, ttl=0.2)
+    parsed = {"skills": ["Python"], "experience": [], "raw_text": "Python"}
+    cache.set("abc", "application/pdf", parsed)
+
+    # 1. Hit returns an independent copy
+    print("\n[Test 1] Copy on read")
+    first = cache.get("abc", "application/pdf")
+    first["skills"].append("Mutated")
+    second = cache.get("abc", "application/pdf")
+    if second["skills"] == ["Python"]:
+        print("SUCCESS: Cached entry isolated from callers.")
+    else:
+        print("FAILURE: Caller mutation leaked into the cache.")
+
+    # 2. Content type is part of the key
+    print("\n[Test 2] Key includes content type")
+    if cache.get("abc", "application/vnd.openxmlformats-officedocument.wordprocessingml.document") is None:
+        print("SUCCESS: Different content type misses.")
+    else:
+        print("FAILURE: Content type ignored.")
+
+    # 3. Entries expire
+    print("\n[Test 3] TTL expiry")
+    time.sleep(0.3)
+    if cache.get("abc", "application/pdf") is None:
+        print("SUCCESS: Expired entry dropped.")
+    else:
+        print("FAILURE: Entry outlived its TTL.")
+
+    print(f"Stats: {cache.stats()}")
+
+if __name__ == "__main__":
+    test_parse_cache()
@@ -0,0 +1,94 @@
+import sys
+import os
+import re
+import numpy as np
+
+sys.path.append(os.getcwd())
+
+from app.core.config import settings
+from app.services.embedding_service import embedding_service
+from app.services.prompt_context import count_tokens, prompt_context
+from app.services.tailoring_service import TailoringService
+
+JOB = """Backend Engineer
+
+Requirements:
+- Python and FastAPI
+- PostgreSQL
+- Kubernetes on AWS
+
+Responsibilities:
+- Build REST APIs
+"""
+
+FILLER = "- Organized community events and negotiated catering contracts for the office.\n"
+RELEVANT = "- Built REST APIs in Python with FastAPI and PostgreSQL, deployed on Kubernetes in AWS.\n"
+
+KEYWORDS = ["python", "fastapi", "postgresql", "kubernetes", "aws", "rest", "apis"]
+
+def keyword_encode(texts):
+    """Bag-of-keywords vectors: deterministic ranking without the embedding model."""
+    out = np.zeros((len(texts), len(KEYWORDS)), dtype="float32")
+    for i, text in enumerate(texts):
+        for word in re.findall(r"[a-z]+", text.lower()):
+            if word in KEYWORDS:
+                out[i, KEYWORDS.index(word)] += 1.0
+    return out
+
+def failing_encode(texts):
+    raise RuntimeError("model unavailable")
+
+def test_prompt_context():
+    print("--- Testing Token-Budgeted Prompt Context ---")
+    service = TailoringService()
+    embedding_service.encode = keyword_encode
+    long_resume = "Summary\nEngineer.\n\nExperience\n" + FILLER * 60 + RELEVANT + FILLER * 5
+
+    # 1. Prompts stay inside their budgets
+    print("\n[Test 1] Budgets")
+    suggestions = service._build_prompt(long_resume, JOB, ["AWS"])
+    refine = service._build_refine_prompt(long_resume, JOB)
+    print(f"Suggestions: {count_tokens(suggestions)} / {settings.SUGGESTIONS_PROMPT_TOKENS}, "
+          f"refine: {count_tokens(refine)} / {settings.REFINE_PROMPT_TOKENS}")
+    if count_tokens(suggestions) <= settings.SUGGESTIONS_PROMPT_TOKENS and count_tokens(refine) <= settings.REFINE_PROMPT_TOKENS:
+        print("SUCCESS: Prompts fit their token budgets.")
+    else:
+        print("FAILURE: Budget exceeded.")
+
+    # 2. The job is reduced to its requirements
+    print("\n[Test 2] Job context")
+    job_text, _ = prompt_context.build(long_resume, JOB, 300)
+    print(job_text)
+    if "- PostgreSQL" in job_text and "Responsibilities:" in job_text and "Backend Engineer" not in job_text:
+        print("SUCCESS: Requirements and responsibilities extracted.")
+    else:
+        print("FAILURE: Unexpected job context.")
+
+    # 3. The relevant experience is retrieved even though it sits past the old crop
+    print("\n[Test 3] Retrieval")
+    if RELEVANT.strip() in suggestions and long_resume.find(RELEVANT) > 2000:
+        print("SUCCESS: Relevant chunk selected from deep in the resume.")
+    else:
+        print("FAILURE: Relevant chunk missing from the prompt.")
+
+    # 4. Short resumes are passed through whole
+    print("\n[Test 4] Short resume")
+    _, resume_text = prompt_context.build("Summary\nPython developer.", JOB, 300)
+    if resume_text == "Summary\nPython developer.":
+        print("SUCCESS: Short resume kept as is.")
+    else:
+        print("FAILURE: Short resume altered.")
+
+    # 5. Without an encoder the leading chunks are packed instead
+    print("\n[Test 5] Encoder unavailable")
+    embedding_service.encode = failing_encode
+    fallback = service._build_prompt(long_resume, JOB, ["AWS"])
+    del embedding_service.encode
+    if RELEVANT.strip() not in fallback and FILLER.strip() in fallback \
+            and count_tokens(fallback) <= settings.SUGGESTIONS_PROMPT_TOKENS:
+        print("SUCCESS: Fell back to the opening of the resume within budget.")
+    else:
+        print("FAILURE: Unexpected fallback prompt.")
+
+if __name__ == "__main__":
+    test_prompt_context()
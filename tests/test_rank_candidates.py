@@ -0,0 +1,113 @@
+import sys
+import os
+import io
+import asyncio
+import tempfile
+import zipfile
+
+sys.path.append(os.getcwd())
+sys.path.append(os.path.join(os.getcwd(), "tests"))
+
+from app.api.routes.match import EventStreamResponse
+from app.api.uploads import ResumeUpload, read_zip_resumes
+from test_rank_jobs import make_engine
+
+def test_rank_candidates():
+    print("--- Testing Candidate Ranking ---")
+
+    engine = make_engine()
+    job = {
+        "required_skills": ["Python", "Docker", "REST APIs"],
+        "required_skill_ids": ["python", "docker"],
+        "responsibilities": ["Build REST APIs", "Manage SQL databases"]
+    }
+    resumes = [
+        {"raw_text": "Go developer", "skills": ["Go"], "skill_ids": ["go"],
+         "experience": ["Wrote embedded firmware"]},
+        {"raw_text": "Python and Docker. Built REST APIs.", "skills": ["Python", "Docker"],
+         "skill_ids": ["python", "docker"], "experience": ["Built REST APIs using FastAPI", "Managed SQL databases"]},
+        {"raw_text": "Docker", "skills": ["Docker", "REST APIs"], "skill_ids": [],
+         "experience": ["Managed SQL databases", "Managed SQL databases"]},
+        {"raw_text": "", "skills": [], "experience": []}
+    ]
+
+    # 1. Same numbers as scoring each resume on its own
+    print("\n[Test 1] Agrees with compute_score")
+    ranked = engine.rank_resumes(resumes, job)
+    single = [engine.compute_score(resume, job) for resume in resumes]
+    worst = max(abs(single[r["index"]]["components"][k] - r["components"][k])
+                for r in ranked for k in r["components"])
+    order = [r["index"] for r in ranked]
+    print(f"Largest component difference: {worst}, order: {order}")
+    if worst < 0.011 and order[0] == 1 and order[-1] == 3 \
+            and [r["overall_match"] for r in ranked] == sorted((r["overall_match"] for r in ranked), reverse=True):
+        print("SUCCESS: Every resume scored as compute_score would, best first.")
+    else:
+        print("FAILURE: Batched scores or order differ.")
+
+    # 2. Zip archives: resumes kept, other members reported
+    print("\n[Test 2] Zip upload")
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("pool/a.pdf", b"%PDF-1.4")
+        archive.writestr("pool/b.DOCX", b"docx bytes")
+        archive.writestr("pool/notes.txt", b"not a resume")
+        archive.writestr("__MACOSX/pool/._a.pdf", b"metadata")
+    buffer.seek(0)
+    found, skipped = read_zip_resumes(buffer, max_files=10, max_bytes=1000)
+    names = [name for name, _ in found]
+    print(f"Resumes: {names}, skipped: {skipped}")
+    if names == ["pool/a.pdf", "pool/b.DOCX"] and [name for name, _ in skipped] == ["pool/notes.txt"] \
+            and found[1][1].content_type.endswith("wordprocessingml.document") and found[0][1].data == b"%PDF-1.4":
+        print("SUCCESS: PDF and DOCX members extracted.")
+    else:
+        print("FAILURE: Wrong members.")
+
+    # 3. Limits on file count and total size
+    print("\n[Test 3] Zip limits")
+    errors = []
+    for max_files, max_bytes in [(1, 1000), (10, 10)]:
+        buffer.seek(0)
+        try:
+            read_zip_resumes(buffer, max_files=max_files, max_bytes=max_bytes)
+        except ValueError as e:
+            errors.append(str(e))
+    print(f"Errors: {errors}")
+    if len(errors) == 2:
+        print("SUCCESS: Oversized pools refused.")
+    else:
+        print("FAILURE: Limits not enforced.")
+
+    # 4. Spilled uploads removed even if the client leaves before the first event
+    print("\n[Test 4] Upload cleanup on disconnect")
+    fd, path = tempfile.mkstemp(suffix=".pdf")
+    os.close(fd)
+    started = []
+
+    async def events():
+        started.append(True)
+        yield "event: done\ndata: {}\n\n"
+
+    async def receive():
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        raise OSError("client gone")
+
+    async def respond():
+        response = EventStreamResponse(events(), [ResumeUpload("application/pdf", "sha", path=path)])
+        try:
+            await response({"type": "http", "asgi": {"spec_version": "2.4"}}, receive, send)
+        except Exception:
+            pass
+
+    asyncio.run(respond())
+    print(f"Generator started: {bool(started)}, file left: {os.path.exists(path)}")
+    if not os.path.exists(path):
+        print("SUCCESS: Temp file removed.")
+    else:
+        os.remove(path)
+        print("FAILURE: Temp file leaked.")
+
+if __name__ == "__main__":
+    test_rank_candidates()
@@ -0,0 +1,100 @@
+import sys
+import os
+import hashlib
+import numpy as np
+
+sys.path.append(os.getcwd())
+
+from app.core.config import settings
+from app.services.matching_engine import MatchingEngine
+from app.services.skill_taxonomy import SkillTaxonomy
+
+class WordEncoder:
+    """Bag-of-words vectors: an offline stand-in for the embedding model."""
+    def encode(self, texts):
+        out = np.zeros((len(texts), 64), dtype="float32")
+        for i, text in enumerate(texts):
+            for word in text.lower().split():
+                out[i, int(hashlib.md5(word.encode()).hexdigest(), 16) % 64] += 1.0
+        return out
+
+def make_engine():
+    engine = MatchingEngine()
+    engine.embedder = WordEncoder()
+    taxonomy = SkillTaxonomy(settings.SKILL_TAXONOMY_PATH, settings.SKILL_EMBEDDINGS_PATH)
+    rows = {skill["id"]: row for row, skill in enumerate(taxonomy.skills)}
+    table = np.zeros((len(rows), 4), dtype="float32")
+    table[:, 0] = 1.0
+    table[rows["aws"]] = [0.0, 1.0, 0.0, 0.0]
+    table[rows["docker"]] = [0.0, 0.6, 0.8, 0.0]
+    taxonomy._table = table
+    engine.taxonomy = taxonomy
+    return engine
+
+def test_rank_jobs():
+    print("--- Testing Job Ranking ---")
+
+    engine = make_engine()
+    resume = {
+        "raw_text": "Python developer. Built REST APIs with FastAPI and Docker.",
+        "skills": ["Python", "FastAPI", "Docker"],
+        "skill_ids": ["python", "fastapi", "docker"],
+        "experience": ["Built REST APIs using FastAPI", "Managed SQL databases"]
+    }
+    jobs = [
+        {"required_skills": ["Go", "Rust"], "required_skill_ids": [],
+         "responsibilities": ["Write embedded firmware"]},
+        {"required_skills": ["Python", "FastAPI"], "required_skill_ids": ["python", "fastapi"],
+         "responsibilities": ["Build REST APIs", "Manage SQL databases", "Build REST APIs"]},
+        {"required_skills": ["AWS", "Docker"], "required_skill_ids": ["aws", "docker"],
+         "responsibilities": []},
+        {"required_skills": ["Docker", "REST APIs", "Docker"], "required_skill_ids": [],
+         "responsibilities": ["Manage SQL databases"]},
+        {"required_skills": [], "required_skill_ids": [], "responsibilities": []}
+    ]
+
+    # 1. Same numbers as scoring each job on its own
+    print("\n[Test 1] Agrees with compute_score")
+    ranked = engine.rank_jobs(resume, jobs)
+    single = [engine.compute_score(resume, job) for job in jobs]
+    worst = max(abs(single[r["index"]]["components"][k] - r["components"][k])
+                for r in ranked for k in r["components"])
+    print(f"Largest component difference: {worst}")
+    if worst < 0.011 and sorted(r["index"] for r in ranked) == list(range(len(jobs))):
+        print("SUCCESS: Every job scored as compute_score would.")
+    else:
+        print("FAILURE: Batched scores differ.")
+
+    # 2. Best match first
+    print("\n[Test 2] Ranking order")
+    order = [r["index"] for r in ranked]
+    scores = [r["overall_match"] for r in ranked]
+    print(f"Order: {order}, scores: {scores}")
+    if order[0] == 1 and order[-1] == 4 and scores == sorted(scores, reverse=True):
+        print("SUCCESS: Jobs ranked by overall match.")
+    else:
+        print("FAILURE: Wrong order.")
+
+    # 3. Nothing to compare against
+    print("\n[Test 3] Empty inputs")
+    empty = engine.rank_jobs({"raw_text": "", "skills": [], "experience": []}, jobs[:2])
+    if engine.rank_jobs(resume, []) == [] and all(r["overall_match"] == 0.0 for r in empty):
+        print("SUCCESS: Empty resume and empty catalog handled.")
+    else:
+        print(f"FAILURE: {empty}")
+
+    # 4. Catalog keyword automata do not crowd out the per-job ones
+    print("\n[Test 4] Keyword matcher caches")
+    engine = make_engine()
+    hot = engine.keyword_matcher(jobs[1]["required_skills"])
+    catalog = [{"required_skills": [f"Skill{i}", f"Tool{i}"], "required_skill_ids": [], "responsibilities": []}
+               for i in range(300)]
+    engine.rank_jobs(resume, catalog)
+    print(f"Per-job matchers: {len(engine._keyword_matchers)}, catalog matchers: {len(engine._catalog_matchers)}")
+    if engine.keyword_matcher(jobs[1]["required_skills"]) is hot and len(engine._keyword_matchers) == 1:
+        print("SUCCESS: Ranking a catalog left the per-job matchers alone.")
+    else:
+        print("FAILURE: Per-job matcher evicted.")
+
+if __name__ == "__main__":
+    test_rank_jobs()
@@ -0,0 +1,80 @@
+import sys
+import os
+import random
+import re
+
+sys.path.append(os.getcwd())
+
+from app.services.resume_parser import ResumeParser
+from app.utils.text import normalize_whitespace
+
+def legacy_normalize_whitespace(text):
+    text = text.replace('\xa0', ' ')
+    text = re.sub(r'[ \t]+', ' ', text)
+    text = re.sub(r'\n+', '\n', text)
+    return text.strip()
+
+def legacy_extract_sections(text):
+    """Reference: the four-scan implementation the single-pass tokenizer replaced."""
+    sections = {"skills": [], "experience": [], "education": [], "certifications": []}
+    patterns = {
+        "experience": r"(?im)^[\s]*(experience|employment|work history)[\s:]*$",
+        "education": r"(?im)^[\s]*(education|academic|qualifications)[\s:]*$",
+        "skills": r"(?im)^[\s]*(skills|technologies|technical skills)[\s:]*$",
+        "certifications": r"(?im)^[\s]*(certifications?|licenses?)[\s:]*$"
+    }
+    matches = []
+    for key, pattern in patterns.items():
+        for match in re.finditer(pattern, text):
+            matches.append((match.start(), key))
+    matches.sort()
+    for i in range(len(matches)):
+        start_idx, section_name = matches[i]
+        next_newline = text.find('\n', start_idx)
+        content_start = next_newline + 1 if next_newline != -1 else start_idx + len(section_name)
+        end_idx = matches[i + 1][0] if i < len(matches) - 1 else len(text)
+        content = text[content_start:end_idx].strip()
+        sections[section_name].extend(line.strip() for line in content.split('\n') if line.strip())
+    return sections
+
+HEADERS = ["Experience", "EMPLOYMENT", "Work History", "Education:", "Academic", "Qualifications",
+           "Skills", "Technical Skills", "technologies :", "Certification", "Certifications", "Licenses",
+           "License:", "Skills and tools", "Professional Experience"]
+LINES = ["Python, SQL", "Acme Corp - Engineer", "B.Sc. Computer Science", "AWS Certified", " ", ":",
+         "\t", "", "\xa0", "  - Docker  ", "Led 5 engineers", "Skills matter"]
+
+def random_resume(rng: random.Random) -> str:
+    parts = []
+    for _ in range(rng.randint(0, 30)):
+        if rng.random() < 0.35:
+            parts.append(rng.choice(["", " ", "\t", "\n", " \n "]) + rng.choice(HEADERS) + rng.choice(["", " ", ":", " :\n", "\n\n", "\n:"]))
+        else:
+            parts.append(rng.choice(LINES))
+    return rng.choice(["\n", "\n\n", "\r\n", " \n"]).join(parts)
+
+def test_resume_sections():
+    print("--- Testing Resume Section Tokenizer ---")
+
+    parser = ResumeParser()
+    rng = random.Random(5)
+    corpus = [random_resume(rng) for _ in range(3000)]
+
+    # 1. Normalization matches the regex version
+    print("\n[Test 1] Whitespace normalization")
+    mismatches = [text for text in corpus if normalize_whitespace(text) != legacy_normalize_whitespace(text)]
+    if not mismatches:
+        print(f"SUCCESS: {len(corpus)} texts normalized identically.")
+    else:
+        print(f"FAILURE: {len(mismatches)} texts differ, e.g. {mismatches[0]!r}")
+
+    # 2. Sections match on parser input (normalized) and on raw text
+    print("\n[Test 2] Section extraction equivalence")
+    samples = corpus + [legacy_normalize_whitespace(text) for text in corpus]
+    mismatches = [text for text in samples if parser._extract_sections(text) != legacy_extract_sections(text)]
+    if not mismatches:
+        print(f"SUCCESS: {len(samples)} texts sectioned identically.")
+    else:
+        print(f"FAILURE: {len(mismatches)} texts differ, e.g. {mismatches[0]!r}")
+
+if __name__ == "__main__":
+    test_resume_sections()
@@ -0,0 +1,99 @@
+import sys
+import os
+import contextvars
+import tempfile
+import threading
+import time
+
+sys.path.append(os.getcwd())
+
+from fastapi.testclient import TestClient
+from app.core.config import settings
+from app.core.profiling import SamplingProfiler, active_profile, traced_call
+from app.main import app
+from app.services.job_analyzer import job_analyzer
+
+JOB = """Backend Engineer
+Requirements:
+- 3+ years of Python
+- Experience with PostgreSQL and Docker
+Nice to have:
+- Kubernetes
+"""
+
+def busy_loop(seconds):
+    end = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < end:
+        total += 1
+    return total
+
+def unrelated_loop(seconds):
+    return busy_loop(seconds)
+
+def test_server_timing():
+    print("--- Testing Server-Timing and Sampling Profiler ---")
+    client = TestClient(app)
+
+    # 1. Stages timed in a worker pool thread reach the response header
+    print("\n[Test 1] Server-Timing header")
+    response = client.post("/api/v1/job/analyze", json={"description": JOB})
+    header = response.headers.get("server-timing", "")
+    print(f"Server-Timing: {header}")
+    if response.status_code == 200 and "job_analyze;dur=" in header and "total;dur=" in header:
+        print("SUCCESS: Per-stage breakdown attached.")
+    else:
+        print("FAILURE: Stage missing from Server-Timing.")
+
+    # 2. Instrumentation leaves results untouched
+    print("\n[Test 2] Results unchanged")
+    if response.json() == job_analyzer.analyze(JOB):
+        print("SUCCESS: Same analysis with and without a request context.")
+    else:
+        print("FAILURE: Analysis differs under instrumentation.")
+
+    # 3. Profiler samples only the threads doing the request's work, as folded stacks
+    print("\n[Test 3] Folded stacks")
+    profile = SamplingProfiler(interval=0.001)
+    token = active_profile.set(profile)
+    request_context = contextvars.copy_context()  # what the worker pools run the request's calls in
+    active_profile.reset(token)
+    traced = threading.Thread(target=request_context.run, args=(traced_call, lambda: busy_loop(0.2)), name="compute-test")
+    unrelated = threading.Thread(target=unrelated_loop, args=(0.2,), name="other-request")
+    profile.start()
+    traced.start()
+    unrelated.start()
+    traced.join()
+    unrelated.join()
+    profile.stop()
+    folded = profile.folded()
+    lines = folded.splitlines()
+    print(f"Samples: {profile.samples}, distinct stacks: {len(lines)}")
+    well_formed = bool(lines) and all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+    if well_formed and "compute-test;" in folded and "busy_loop (tests/test_server_timing.py" in folded \
+            and "unrelated_loop" not in folded:
+        print("SUCCESS: Request thread profiled down to the busy function, other threads left out.")
+    else:
+        print("FAILURE: Profile missing the request's work or sampling other threads.")
+
+    # 4. Opt-in per request with X-Profile, written to PROFILING_OUTPUT_DIR
+    print("\n[Test 4] Profiled request")
+    output_dir = tempfile.mkdtemp()
+    saved = (settings.PROFILING_HEADER_ENABLED, settings.PROFILING_OUTPUT_DIR, settings.PROFILING_INTERVAL_MS)
+    settings.PROFILING_HEADER_ENABLED, settings.PROFILING_OUTPUT_DIR, settings.PROFILING_INTERVAL_MS = True, output_dir, 1.0
+    try:
+        plain = client.post("/api/v1/job/analyze", json={"description": JOB})
+        profiled = client.post("/api/v1/job/analyze", json={"description": JOB}, headers={"X-Profile": "1"})
+    finally:
+        settings.PROFILING_HEADER_ENABLED, settings.PROFILING_OUTPUT_DIR, settings.PROFILING_INTERVAL_MS = saved
+    profile_id = profiled.headers.get("x-profile")
+    path = os.path.join(output_dir, f"{profile_id}.folded")
+    print(f"Profile: {path}")
+    if "x-profile" not in plain.headers and profile_id and os.path.exists(path) \
+            and profiled.json() == plain.json():
+        print("SUCCESS: Only the requested call profiled, same response.")
+    else:
+        print("FAILURE: Profiling opt-in not honoured.")
+
+if __name__ == "__main__":
+    test_server_timing()
@@ -0,0 +1,48 @@
+import sys
+import os
+import numpy as np
+
+sys.path.append(os.getcwd())
+
+from app.core.config import settings
+from app.services.skill_taxonomy import SkillTaxonomy
+
+def test_skill_taxonomy():
+    print("--- Testing Skill Taxonomy ---")
+
+    taxonomy = SkillTaxonomy(settings.SKILL_TAXONOMY_PATH, settings.SKILL_EMBEDDINGS_PATH)
+
+    # 1. Aliases map to canonical ids
+    print("\n[Test 1] Synonyms")
+    ids = taxonomy.extract("Ran services on k8s (EKS) and Postgres, deployed with GitHub Actions")
+    print(f"Ids: {ids}")
+    if ids == ["kubernetes", "postgresql", "github_actions"]:
+        print("SUCCESS: Aliases resolved to canonical skills.")
+    else:
+        print("FAILURE: Unexpected skill ids.")
+
+    # 2. Word boundaries and longest alias
+    print("\n[Test 2] Overlapping aliases")
+    ids = taxonomy.extract("JavaScript and React Native")
+    if ids == ["javascript", "react_native"]:
+        print("SUCCESS: No Java inside JavaScript, no React inside React Native.")
+    else:
+        print(f"FAILURE: {ids}")
+
+    # 3. Scoring is a lookup into the table (here a hand-made one)
+    print("\n[Test 3] Table similarity")
+    n = len(taxonomy.skills)
+    table = np.zeros((n, 4), dtype="float32")
+    table[:, 0] = 1.0
+    rows = {skill["id"]: row for row, skill in enumerate(taxonomy.skills)}
+    table[rows["aws"]] = [0.0, 1.0, 0.0, 0.0]
+    taxonomy._table = table
+    exact = taxonomy.similarity(["python", "docker"], ["python"])
+    partial = taxonomy.similarity(["python"], ["python", "aws"])
+    if abs(exact - 1.0) < 1e-6 and abs(partial - 0.5) < 1e-6:
+        print(f"SUCCESS: exact={exact:.2f}, partial={partial:.2f}.")
+    else:
+        print(f"FAILURE: exact={exact}, partial={partial}.")
+
+if __name__ == "__main__":
+    test_skill_taxonomy()
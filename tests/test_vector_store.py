@@ -0,0 +1,51 @@
+import sys
+import os
+import tempfile
+import numpy as np
+
+sys.path.append(os.getcwd())
+
+from app.services.vector_store import VectorStore
+
+def test_vector_store():
+    print("--- Testing Vector Store (cosine, save/load) ---")
+
+    rng = np.random.default_rng(0)
+    dim = 32
+    vectors = rng.normal(size=(500, dim)).astype("float32")
+    metadatas = [{"text": f"doc {i}"} for i in range(len(vectors))]
+    # Query: a scaled copy of doc 42; cosine must ignore the length difference
+    query = vectors[42] * 10.0
+
+    for index_type in ("flat", "hnsw", "ivf"):
+        print(f"\n[{index_type}]")
+        store = VectorStore(dim, index_type=index_type, ivf_nlist=8, ivf_nprobe=8)
+        ids = store.add(vectors, metadatas)
+
+        results = store.search(query, k=3)
+        print(f"Top results: {results}")
+        if results[0][0] == 42 and abs(results[0][1] - 1.0) < 1e-4:
+            print("SUCCESS: Exact match ranked first with cosine 1.0.")
+        else:
+            print("FAILURE: Cosine ranking wrong.")
+
+        path = tempfile.mkdtemp()
+        store.save(path)
+        reloaded = VectorStore(dim, index_type=index_type, ivf_nlist=8, ivf_nprobe=8)
+        reloaded.load(path, mmap=True)
+        again = reloaded.search(query, k=3)
+        if again == results and reloaded.metadata[42]["text"] == "doc 42" and ids[-1] == 499:
+            print("SUCCESS: Memory-mapped reload returns the same results.")
+        else:
+            print("FAILURE: Reloaded index differs.")
+
+        # Adding after an mmap load must work (index is re-read writable)
+        new_ids = reloaded.add(vectors[:1] * -1.0, [{"text": "negated"}])
+        top = reloaded.search(-vectors[0], k=1)
+        if new_ids == [500] and top[0][0] == 500:
+            print("SUCCESS: Appended to a loaded index.")
+        else:
+            print("FAILURE: Append after load failed.")
+
+if __name__ == "__main__":
+    test_vector_store()